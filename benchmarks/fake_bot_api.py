@@ -0,0 +1,227 @@
+"""
+Локальная заглушка Telegram Bot API для нагрузочного тестирования.
+
+Обслуживает методы getMe, deleteWebhook, getUpdates (long polling)
+и sendMessage. Обновления кладутся в очередь генератором нагрузки,
+ответы бота фиксируются для расчета задержек.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+
+BOT_INFO = {
+    'id': 1000000001,
+    'is_bot': True,
+    'first_name': 'LoadTestBot',
+    'username': 'load_test_bot',
+}
+
+
+class FakeBotAPI:
+    """Заглушка Bot API, работающая в отдельном потоке"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        """
+        Инициализация сервера
+
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+        """
+        self._updates: Deque[Dict[str, Any]] = deque()
+        self._updates_cond = threading.Condition()
+        self._next_update_id = 1
+        self._next_message_id = 1
+
+        # Время постановки команды в очередь по каждому чату (FIFO)
+        self._pending: Dict[int, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        self.latencies: List[float] = []
+        self.first_enqueued_at: Optional[float] = None
+        self.last_replied_at: Optional[float] = None
+        self.replies = 0
+        self.on_reply: Optional[Callable[[int], None]] = None
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """URL для Application.builder().base_url()"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self) -> None:
+        """Запуск сервера"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Остановка сервера"""
+        with self._updates_cond:
+            self._updates_cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def push_command(self, user_id: int, command: str) -> None:
+        """
+        Поставить команду пользователя в очередь getUpdates
+
+        Args:
+            user_id: Telegram ID синтетического пользователя
+            command: Текст команды (например, '/start')
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self._pending[user_id].append(now)
+            if self.first_enqueued_at is None:
+                self.first_enqueued_at = now
+
+        with self._updates_cond:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self._updates.append({
+                'update_id': update_id,
+                'message': {
+                    'message_id': update_id,
+                    'date': int(time.time()),
+                    'chat': {'id': user_id, 'type': 'private', 'first_name': f'User{user_id}'},
+                    'from': {
+                        'id': user_id,
+                        'is_bot': False,
+                        'first_name': f'User{user_id}',
+                        'username': f'user{user_id}',
+                    },
+                    'text': command,
+                    'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(command)}],
+                },
+            })
+            self._updates_cond.notify()
+
+    def _get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Выдача обновлений с учетом offset и long polling"""
+        offset = int(params.get('offset') or 0)
+        limit = int(params.get('limit') or 100)
+        timeout = float(params.get('timeout') or 0)
+        deadline = time.monotonic() + timeout
+
+        with self._updates_cond:
+            # Подтвержденные обновления удаляются из очереди
+            while self._updates and self._updates[0]['update_id'] < offset:
+                self._updates.popleft()
+
+            while not self._updates:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._updates_cond.wait(remaining)
+                while self._updates and self._updates[0]['update_id'] < offset:
+                    self._updates.popleft()
+
+            return [self._updates[i] for i in range(min(limit, len(self._updates)))]
+
+    def _send_message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Фиксация ответа бота и расчет задержки"""
+        now = time.perf_counter()
+        chat_id = int(params['chat_id'])
+
+        with self._lock:
+            pending = self._pending.get(chat_id)
+            if pending:
+                self.latencies.append(now - pending.popleft())
+            self.replies += 1
+            self.last_replied_at = now
+            message_id = self._next_message_id
+            self._next_message_id += 1
+
+        if self.on_reply:
+            self.on_reply(chat_id)
+
+        return {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_INFO,
+            'text': params.get('text', ''),
+        }
+
+    def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Маршрутизация метода Bot API"""
+        if method == 'getMe':
+            return BOT_INFO
+        if method in ('deleteWebhook', 'setMyCommands', 'close', 'logOut'):
+            return True
+        if method == 'getUpdates':
+            return self._get_updates(params)
+        if method == 'sendMessage':
+            return self._send_message(params)
+        raise KeyError(method)
+
+    def _make_handler(self) -> type:
+        """Создание класса обработчика HTTP-запросов, привязанного к серверу"""
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self) -> None:
+                method = self.path.rstrip('/').rsplit('/', 1)[-1]
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ''
+                params = _parse_params(body, self.headers.get('Content-Type', ''))
+
+                try:
+                    payload = {'ok': True, 'result': api._dispatch(method, params)}
+                    status = 200
+                except KeyError:
+                    payload = {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+                    status = 404
+
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Логи каждого запроса исказили бы замеры
+                pass
+
+        return Handler
+
+
+def _parse_params(body: str, content_type: str) -> Dict[str, Any]:
+    """
+    Разбор параметров запроса Bot API
+
+    PTB отправляет form-urlencoded, где нестроковые значения закодированы в JSON.
+
+    Args:
+        body: Тело запроса
+        content_type: Заголовок Content-Type
+
+    Returns:
+        Dict[str, Any]: Параметры метода
+    """
+    if not body:
+        return {}
+    if 'application/json' in content_type:
+        return json.loads(body)
+
+    params: Dict[str, Any] = {}
+    for key, values in parse_qs(body, keep_blank_values=True).items():
+        value = values[-1]
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    return params
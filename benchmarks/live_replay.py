@@ -0,0 +1,132 @@
+"""
+Воспроизведение синтетических свечей через потоковый анализ.
+
+Генерирует CSV с часовыми свечами (случайное блуждание) и прогоняет его
+через ReplayCandleSource и LiveIngestor на временной SQLite. Печатает
+пропускную способность приема, количество закрытых баров и запусков
+анализа, задержку анализа после закрытия бара и число сигналов.
+
+Запуск:
+    python -m benchmarks.live_replay --symbols 20 --hours 2000
+    python -m benchmarks.live_replay --csv recorded.csv --speed 3600
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from benchmarks.loadtest import percentile
+
+
+def generate_csv(path: str, symbols: List[str], hours: int, seed: int) -> None:
+    """
+    Запись синтетических часовых свечей
+
+    Args:
+        path: Путь к CSV
+        symbols: Символы
+        hours: Количество свечей на символ
+        seed: Зерно генератора случайных чисел
+    """
+    rng = random.Random(seed)
+    start_ms = 1_700_000_000_000 - 1_700_000_000_000 % 86_400_000
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        for symbol in symbols:
+            price = rng.uniform(20, 500)
+            for hour in range(hours):
+                open_ = price
+                price = max(1.0, price * (1 + rng.gauss(0, 0.01)))
+                high = max(open_, price) * (1 + abs(rng.gauss(0, 0.003)))
+                low = min(open_, price) * (1 - abs(rng.gauss(0, 0.003)))
+                volume = rng.lognormvariate(10, 0.5)
+                writer.writerow([
+                    symbol, start_ms + hour * 3_600_000,
+                    f"{open_:.4f}", f"{high:.4f}", f"{low:.4f}", f"{price:.4f}", f"{volume:.2f}"
+                ])
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Воспроизведение свечей через потоковый анализ")
+    parser.add_argument('--symbols', type=int, default=20, help="Количество синтетических символов")
+    parser.add_argument('--hours', type=int, default=2000, help="Свечей на символ")
+    parser.add_argument('--csv', default='', help="Готовый CSV вместо синтетических данных")
+    parser.add_argument('--speed', type=float, default=0.0, help="Ускорение воспроизведения (0 - без пауз)")
+    parser.add_argument('--buffer', type=int, default=1500, help="Размер кольцевого буфера")
+    parser.add_argument('--threads', type=int, default=4, help="Потоков анализа")
+    parser.add_argument(
+        '--coalesce', action='store_true',
+        help="Схлопывать закрытия баров во время анализа (как в live), а не ждать анализ каждого бара"
+    )
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='live_replay_')
+    symbols = [f"SYN{i}-USD" for i in range(args.symbols)]
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'live.db')}"
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:LIVE')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    # Половина символов - крипто (часовой алгоритм), половина - акции (дневной)
+    os.environ['CRYPTO_SYMBOLS'] = ','.join(symbols[::2])
+
+    path = args.csv
+    if not path:
+        path = os.path.join(workdir, 'candles.csv')
+        generate_csv(path, symbols, args.hours, args.seed)
+
+    from src.data.live import ReplayCandleSource
+    from src.database.repository import init_database
+    from src.scheduler import live
+
+    init_database()
+    source = ReplayCandleSource(path, speed=args.speed)
+    if args.csv:
+        symbols = sorted({candle.symbol for candle in source.load()})
+
+    # Задержка от закрытия бара до окончания анализа
+    latencies: List[float] = []
+    create_handler = live.create_bar_close_handler
+
+    def timed_handler(base_timeframe, executor):
+        handler = create_handler(base_timeframe, executor)
+
+        async def on_bar_close(symbol, candles):
+            started = time.perf_counter()
+            await handler(symbol, candles)
+            latencies.append(time.perf_counter() - started)
+
+        return on_bar_close
+
+    live.create_bar_close_handler = timed_handler
+
+    started = time.perf_counter()
+    stats = asyncio.run(live.run_ingestor(
+        source, symbols, capacity=args.buffer, threads=args.threads, coalesce=args.coalesce
+    ))
+    elapsed = time.perf_counter() - started
+
+    from src.database.repository import signal_repository
+    signals = signal_repository.get_signal_stats()['signals']
+
+    latencies.sort()
+    print(f"Candles ingested:  {stats['candles']} in {elapsed:.2f}s ({stats['candles'] / elapsed:.0f}/s)")
+    print(f"Bars closed:       {stats['bars_closed']}")
+    print(f"Handler runs:      {stats['handled']} (coalesced: {stats['coalesced']})")
+    print(f"Handler latency:   p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 95) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Signals created:   {signals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Синтетический нагрузочный тест бота.
+
+Поднимает локальную заглушку Bot API, направляет на нее Application
+и прогоняет смесь команд /start, /subscribe, /status, /unsubscribe
+от тысяч синтетических пользователей. Печатает p50/p95/p99 задержки,
+пропускную способность и профиль самых горячих путей выполнения.
+
+Запуск:
+    python -m benchmarks.loadtest --users 5000 --requests 20000 \\
+        --mix start=1,subscribe=2,status=4,unsubscribe=1
+"""
+
+import argparse
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import random
+import tempfile
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """
+    Разбор смеси команд вида 'start=1,subscribe=2'
+
+    Args:
+        value: Строка со смесью команд
+
+    Returns:
+        Dict[str, float]: Вес каждой команды
+    """
+    mix: Dict[str, float] = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip().lstrip('/')
+        if not name:
+            continue
+        mix[name] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid command mix: {value}")
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга
+
+    Args:
+        sorted_values: Отсортированные значения
+        pct: Перцентиль (0-100)
+
+    Returns:
+        float: Значение перцентиля
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def build_workload(
+    users: int,
+    requests: int,
+    mix: Dict[str, float],
+    seed: int
+) -> List[Tuple[int, str]]:
+    """
+    Генерация последовательности команд
+
+    Args:
+        users: Количество синтетических пользователей
+        requests: Общее количество команд
+        mix: Веса команд
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        List[Tuple[int, str]]: Пары (telegram_id, команда)
+    """
+    rng = random.Random(seed)
+    commands = [f"/{name}" for name in mix]
+    weights = list(mix.values())
+    user_ids = [10_000_000 + i for i in range(users)]
+    return [
+        (rng.choice(user_ids), rng.choices(commands, weights)[0])
+        for _ in range(requests)
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Нагрузочный тест Telegram бота")
+    parser.add_argument('--users', type=int, default=2000, help="Количество пользователей")
+    parser.add_argument('--requests', type=int, default=10000, help="Количество команд")
+    parser.add_argument(
+        '--mix',
+        type=parse_mix,
+        default=parse_mix('start=1,subscribe=2,status=4,unsubscribe=1'),
+        help="Смесь команд, например start=1,subscribe=2,status=4,unsubscribe=1"
+    )
+    parser.add_argument(
+        '--rate', type=float, default=0.0,
+        help="Целевая интенсивность, команд/с (0 - без ограничения)"
+    )
+    parser.add_argument(
+        '--concurrent-updates', type=int, default=1,
+        help="Число одновременно обрабатываемых обновлений в Application"
+    )
+    parser.add_argument('--database', default='', help="DATABASE_URL (по умолчанию временный SQLite)")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора")
+    parser.add_argument('--timeout', type=float, default=600.0, help="Максимальное время прогона, с")
+    parser.add_argument('--profile', default='', help="Файл для сохранения профиля (pstats)")
+    parser.add_argument('--top', type=int, default=25, help="Сколько горячих функций показать")
+    return parser.parse_args()
+
+
+def prepare_environment(args: argparse.Namespace) -> None:
+    """
+    Настройка окружения до импорта src (Config читает переменные при импорте)
+
+    Args:
+        args: Аргументы командной строки
+    """
+    if not args.database:
+        fd, path = tempfile.mkstemp(prefix='loadtest_', suffix='.db')
+        os.close(fd)
+        args.database = f"sqlite:///{path}"
+    os.environ['DATABASE_URL'] = args.database
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:LOADTEST')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+
+async def run_load(args: argparse.Namespace, workload: List[Tuple[int, str]], profiler: cProfile.Profile):
+    """
+    Прогон нагрузки через Application, направленный на заглушку API
+
+    Args:
+        args: Аргументы командной строки
+        workload: Последовательность команд
+        profiler: Профилировщик цикла событий бота
+
+    Returns:
+        FakeBotAPI: Сервер с собранными замерами
+    """
+    from telegram.ext import Application
+
+    from benchmarks.fake_bot_api import FakeBotAPI
+    from main import register_handlers
+    from src.database.repository import init_database
+    from src.utils.config import Config
+
+    init_database()
+
+    api = FakeBotAPI()
+    api.start()
+
+    application = (
+        Application.builder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .base_url(api.base_url)
+        .concurrent_updates(args.concurrent_updates)
+        .build()
+    )
+    register_handlers(application)
+
+    def produce() -> None:
+        started = time.perf_counter()
+        for i, (user_id, command) in enumerate(workload):
+            if args.rate > 0:
+                delay = started + i / args.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            api.push_command(user_id, command)
+
+    async with application:
+        await application.start()
+        await application.updater.start_polling(poll_interval=0.0, timeout=10)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        profiler.enable()
+        producer.start()
+
+        deadline = time.monotonic() + args.timeout
+        while api.replies < len(workload) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        profiler.disable()
+        await application.updater.stop()
+        await application.stop()
+
+    api.stop()
+    return api
+
+
+def report(args: argparse.Namespace, api, total: int, profiler: cProfile.Profile) -> None:
+    """
+    Печать результатов прогона
+
+    Args:
+        args: Аргументы командной строки
+        api: Сервер с собранными замерами
+        total: Количество отправленных команд
+        profiler: Профилировщик
+    """
+    latencies = sorted(api.latencies)
+    elapsed = (api.last_replied_at or 0.0) - (api.first_enqueued_at or 0.0)
+    throughput = api.replies / elapsed if elapsed > 0 else 0.0
+
+    print()
+    print("=== Load test results ===")
+    print(f"Users:              {args.users}")
+    print(f"Commands sent:      {total}")
+    print(f"Replies received:   {api.replies}")
+    print(f"Concurrent updates: {args.concurrent_updates}")
+    print(f"Elapsed:            {elapsed:.2f} s")
+    print(f"Throughput:         {throughput:.1f} cmd/s")
+    print(f"Latency p50:        {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Latency p95:        {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"Latency p99:        {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Latency max:        {(latencies[-1] if latencies else 0.0) * 1000:.1f} ms")
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.top)
+    print()
+    print("=== Hottest call paths (cumulative) ===")
+    print(stream.getvalue())
+
+    if args.profile:
+        stats.dump_stats(args.profile)
+        print(f"Profile saved to {args.profile} (open with snakeviz or pstats)")
+
+
+def main() -> None:
+    """Точка входа нагрузочного теста"""
+    args = parse_args()
+    prepare_environment(args)
+
+    workload = build_workload(args.users, args.requests, args.mix, args.seed)
+    profiler = cProfile.Profile()
+    api = asyncio.run(run_load(args, workload, profiler))
+    report(args, api, len(workload), profiler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Память и передача свечей в процессы анализа: DataFrame против общей памяти.
+
+Генерирует часовые свечи (случайное блуждание) для N символов и сравнивает:
+- размер данных: DataFrame (memory_usage deep) и OHLCVArray float64/float32;
+- передачу шардов в P процессов: pickle словаря DataFrame (как при
+  передаче аргументов в ProcessPoolExecutor) и дескриптор SharedOHLCVBlock;
+- приватную память каждого процесса после чтения своего шарда
+  (Private_Clean + Private_Dirty из /proc/self/smaps_rollup).
+
+Запуск:
+    python -m benchmarks.ohlcv_memory --symbols 500 --hours 4380 --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Приватная память процесса после инициализации пула
+_baseline = 0
+
+
+def private_memory() -> int:
+    """
+    Приватная память текущего процесса
+
+    Returns:
+        int: Байты (0, если /proc/self/smaps_rollup недоступен)
+    """
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return 0
+    return sum(int(fields[name].split()[0]) * 1024 for name in ('Private_Clean', 'Private_Dirty') if name in fields)
+
+
+def generate_frames(symbols: int, hours: int, seed: int) -> Dict[str, pd.DataFrame]:
+    """
+    Синтетические часовые свечи
+
+    Args:
+        symbols: Количество символов
+        hours: Свечей на символ
+        seed: Зерно генератора
+
+    Returns:
+        Dict[str, pd.DataFrame]: Свечи по символам
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=hours, freq='h', tz='UTC')
+    frames = {}
+    for i in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, hours)))
+        spread = np.abs(rng.normal(0, 0.005, hours)) * close
+        frames[f"SYN{i}-USD"] = pd.DataFrame({
+            'open': np.concatenate([[close[0]], close[:-1]]),
+            'high': close + spread,
+            'low': close - spread,
+            'close': close,
+            'volume': rng.uniform(1e3, 1e6, hours),
+        }, index=index)
+    return frames
+
+
+def _init_worker() -> None:
+    """Инициализация процесса: импорт модулей и замер базовой памяти"""
+    global _baseline
+    import src.data.ohlcv_array  # noqa: F401
+    _baseline = private_memory()
+
+
+def _read_frames(frames: Dict[str, pd.DataFrame]) -> Tuple[int, float]:
+    """Чтение шарда, полученного через pickle"""
+    total = sum(float(frame['close'].sum()) for frame in frames.values())
+    return private_memory() - _baseline, total
+
+
+def _read_shared(handle, symbols: List[str]) -> Tuple[int, float]:
+    """Чтение шарда из общей памяти без копирования"""
+    from src.data.ohlcv_array import SharedOHLCVView
+
+    with SharedOHLCVView(handle) as view:
+        total = sum(float(view.get(symbol)['close'].sum()) for symbol in symbols)
+        memory = private_memory() - _baseline
+    return memory, total
+
+
+def _init_worker_noop(_: int) -> None:
+    """Пустая задача для запуска процессов пула"""
+
+
+def run_pool(processes: int, task, shards: List[tuple]) -> Tuple[float, List[int]]:
+    """
+    Запуск задач по шардам в свежем пуле (spawn, как в AnalysisWorkerPool)
+
+    Returns:
+        Tuple[float, List[int]]: Время и прирост приватной памяти по процессам
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker) as executor:
+        # Прогрев: процессы уже запущены и импортировали модули
+        list(executor.map(_init_worker_noop, range(processes)))
+        started = time.perf_counter()
+        results = [future.result() for future in [executor.submit(task, *shard) for shard in shards]]
+        elapsed = time.perf_counter() - started
+    return elapsed, [memory for memory, _ in results]
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Память DataFrame и общей памяти для свечей")
+    parser.add_argument('--symbols', type=int, default=500, help="Количество символов")
+    parser.add_argument('--hours', type=int, default=4380, help="Свечей на символ")
+    parser.add_argument('--processes', type=int, default=4, help="Процессов анализа")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Точка входа бенчмарка"""
+    args = parse_args()
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:MEMORY')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from src.data.ohlcv_array import OHLCVArray, SharedOHLCVBlock
+
+    mb = 1024 * 1024
+    frames = generate_frames(args.symbols, args.hours, args.seed)
+    symbols = list(frames)
+    shards = [symbols[i::args.processes] for i in range(args.processes)]
+    candles = args.symbols * args.hours
+    print(f"{args.symbols} symbols x {args.hours} candles = {candles} candles, {args.processes} processes")
+
+    frames_bytes = sum(int(frame.memory_usage(deep=True).sum()) for frame in frames.values())
+    arrays = {symbol: OHLCVArray.from_frame(frame) for symbol, frame in frames.items()}
+    arrays32 = {symbol: OHLCVArray.from_frame(frame, float32=True) for symbol, frame in frames.items()}
+    print(f"DataFrame:          {frames_bytes / mb:8.1f} MB ({frames_bytes / candles:.0f} B/candle)")
+    for name, data in (('OHLCVArray f64', arrays), ('OHLCVArray f32', arrays32)):
+        size = sum(array.nbytes for array in data.values())
+        print(f"{name}:     {size / mb:8.1f} MB ({size / candles:.0f} B/candle)")
+
+    started = time.perf_counter()
+    payload = [pickle.dumps({symbol: frames[symbol] for symbol in shard}) for shard in shards]
+    pickled = time.perf_counter() - started
+    print(f"\nPickle shards:      {sum(map(len, payload)) / mb:8.1f} MB in {pickled * 1000:.0f} ms (parent side)")
+    del payload
+
+    elapsed, memory = run_pool(args.processes, _read_frames, [({s: frames[s] for s in shard},) for shard in shards])
+    print(f"Pool (DataFrame):   {elapsed * 1000:8.0f} ms, worker private +{sum(memory) / mb:.1f} MB "
+          f"(max {max(memory) / mb:.1f} MB)")
+
+    for float32, data in ((False, arrays), (True, arrays32)):
+        started = time.perf_counter()
+        with SharedOHLCVBlock(data) as block:
+            published = time.perf_counter() - started
+            handle_size = len(pickle.dumps(block.handle))
+            elapsed, memory = run_pool(args.processes, _read_shared, [(block.handle, shard) for shard in shards])
+            label = 'f32' if float32 else 'f64'
+            print(f"Pool (shared {label}): {elapsed * 1000:8.0f} ms, worker private +{sum(memory) / mb:.1f} MB "
+                  f"(max {max(memory) / mb:.1f} MB); block {block.nbytes / mb:.1f} MB "
+                  f"published in {published * 1000:.0f} ms, handle {handle_size / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
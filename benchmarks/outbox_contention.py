@@ -0,0 +1,140 @@
+"""
+Проверка outbox при нескольких отправителях на одном файле SQLite.
+
+Создает подписчиков и сигналы, ставит их в outbox и запускает несколько
+процессов, которые одновременно разбирают очередь через drain_outbox.
+Опционально один процесс забирает пачку и "падает", не подтвердив ее:
+после истечения аренды задания должны доставить остальные.
+В конце проверяется, что каждое сообщение доставлено ровно один раз.
+
+Запуск:
+    python -m benchmarks.outbox_contention --processes 4 --users 300 --signals 10 --crash
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import List, Tuple
+
+
+class RecordingBot:
+    """Заглушка Bot: запоминает отправленные сообщения"""
+
+    def __init__(self):
+        self.sent: List[Tuple[int, str]] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        # Небольшая задержка, чтобы процессы чередовались
+        await asyncio.sleep(0.001)
+        self.sent.append((chat_id, text.splitlines()[0]))
+
+
+def _sender(owner: str, result_path: str, lease_seconds: int) -> None:
+    """Процесс-отправитель: разбирает очередь, пока в ней есть задания"""
+    from src.bot.broadcast import drain_outbox
+    from src.database.repository import delivery_repository
+
+    bot = RecordingBot()
+
+    async def run() -> None:
+        while delivery_repository.get_pending_count() > 0:
+            await drain_outbox(bot, owner=owner, batch_size=25, lease_seconds=lease_seconds)
+            await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    with open(result_path, 'w') as f:
+        json.dump(bot.sent, f)
+
+
+def _crasher(lease_seconds: int) -> None:
+    """Процесс, который забирает пачку и завершается без подтверждения"""
+    from src.database.repository import delivery_repository
+
+    _, batch = delivery_repository.claim_batch('crasher', 40, lease_seconds)
+    print(f"Crasher claimed {len(batch)} deliveries and died")
+    os._exit(1)
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Проверка outbox с несколькими отправителями")
+    parser.add_argument('--processes', type=int, default=4, help="Количество отправителей")
+    parser.add_argument('--users', type=int, default=300, help="Количество подписчиков")
+    parser.add_argument('--signals', type=int, default=10, help="Количество сигналов")
+    parser.add_argument(
+        '--lease', type=int, default=10,
+        help="Срок аренды, с (должен с запасом превышать время ожидания блокировки SQLite)"
+    )
+    parser.add_argument('--crash', action='store_true', help="Имитировать падение отправителя")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Точка входа проверки"""
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='outbox_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'outbox.db')}"
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:OUTBOX')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from src.bot.broadcast import enqueue_new_signals
+    from src.database.repository import init_database, signal_repository, user_repository
+
+    init_database()
+    for i in range(args.users):
+        telegram_id = 20_000_000 + i
+        user_repository.create_user(telegram_id, f"user{i}", f"User{i}")
+        user_repository.update_subscription_status(telegram_id, True)
+    for i in range(args.signals):
+        signal_repository.create_signal(
+            symbol=f"SYM{i}", asset_type='crypto', signal_type='BUY', price=100.0,
+            confidence=80, indicators_data={'rsi': 30.0}, stop_loss=96.0,
+            take_profit_1=107.0, take_profit_2=112.0, max_hold_days=7
+        )
+
+    queued = enqueue_new_signals()
+    # Повторная постановка не должна создавать дубли
+    queued += enqueue_new_signals()
+    print(f"Queued {queued} deliveries ({args.users} users x {args.signals} signals)")
+
+    context = multiprocessing.get_context('spawn')
+    if args.crash:
+        crasher = context.Process(target=_crasher, args=(args.lease,))
+        crasher.start()
+        crasher.join()
+
+    started = time.perf_counter()
+    result_paths = [os.path.join(workdir, f"sender{i}.json") for i in range(args.processes)]
+    senders = [
+        context.Process(target=_sender, args=(f"sender{i}", path, args.lease))
+        for i, path in enumerate(result_paths)
+    ]
+    for process in senders:
+        process.start()
+    for process in senders:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    sent: List[Tuple[int, str]] = []
+    for i, path in enumerate(result_paths):
+        with open(path) as f:
+            part = [tuple(item) for item in json.load(f)]
+        print(f"sender{i}: {len(part)} messages")
+        sent.extend(part)
+
+    duplicates = [item for item, count in Counter(sent).items() if count > 1]
+    expected = args.users * args.signals
+    print(f"Delivered {len(sent)} / {expected} messages in {elapsed:.2f}s, duplicates: {len(duplicates)}")
+
+    if len(sent) != expected or duplicates:
+        raise SystemExit("FAILED: outbox delivered messages incorrectly")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 """
 Точка входа в приложение.
-Запуск Telegram бота.
+Запуск Telegram бота (python main.py), процесса анализа
+(python main.py worker) или потокового анализа (python main.py live).
 """
 
+import argparse
 import signal
 import sys
 from telegram import Update
@@ -10,14 +12,36 @@ from telegram.ext import Application, CommandHandler
 
 from src.utils.config import Config
 from src.utils.logger import setup_logger
-from src.bot import handlers
+from src.bot import admin, broadcast, handlers
 from src.database.repository import init_database
+from src.scheduler.tasks import create_scheduler
 
 logger = setup_logger(__name__)
 
 
-def main() -> None:
-    """Основная функция запуска бота"""
+def register_handlers(application: Application) -> None:
+    """
+    Регистрация обработчиков команд и ошибок
+
+    Args:
+        application: Приложение python-telegram-bot
+    """
+    application.add_handler(CommandHandler("start", handlers.start_command))
+    application.add_handler(CommandHandler("help", handlers.help_command))
+    application.add_handler(CommandHandler("subscribe", handlers.subscribe_command))
+    application.add_handler(CommandHandler("unsubscribe", handlers.unsubscribe_command))
+    application.add_handler(CommandHandler("status", handlers.status_command))
+
+    # Админские команды
+    application.add_handler(CommandHandler("stats", admin.stats_command))
+    application.add_handler(CommandHandler("users", admin.users_command))
+
+    # Регистрация обработчика ошибок
+    application.add_error_handler(handlers.error_handler)
+
+
+def run_bot() -> None:
+    """Запуск Telegram бота"""
 
     logger.info("Starting Trading Signals Bot...")
 
@@ -30,20 +54,27 @@ def main() -> None:
         application = Application.builder().token(Config.TELEGRAM_BOT_TOKEN).build()
 
         # Регистрация обработчиков команд
-        application.add_handler(CommandHandler("start", handlers.start_command))
-        application.add_handler(CommandHandler("help", handlers.help_command))
-        application.add_handler(CommandHandler("subscribe", handlers.subscribe_command))
-        application.add_handler(CommandHandler("unsubscribe", handlers.unsubscribe_command))
-        application.add_handler(CommandHandler("status", handlers.status_command))
+        register_handlers(application)
 
-        # Регистрация обработчика ошибок
-        application.add_error_handler(handlers.error_handler)
+        # Рассылка сигналов из outbox
+        application.job_queue.run_repeating(
+            broadcast.broadcast_job,
+            interval=Config.BROADCAST_INTERVAL_SECONDS,
+            first=10,
+            name='broadcast'
+        )
 
         logger.info("Bot handlers registered successfully")
 
+        # Запуск фоновых задач
+        scheduler = create_scheduler()
+        scheduler.start()
+        logger.info("Scheduler started")
+
         # Graceful shutdown handler
         def shutdown_handler(sig, frame):
             logger.info("Shutting down gracefully...")
+            scheduler.shutdown(wait=False)
             sys.exit(0)
 
         signal.signal(signal.SIGINT, shutdown_handler)
@@ -58,5 +89,80 @@ def main() -> None:
         sys.exit(1)
 
 
+def run_analysis_worker(processes: int, once: bool, candles: str = '', float32: bool = False) -> None:
+    """
+    Запуск процесса анализа рынка
+
+    Args:
+        processes: Количество процессов анализа (0 - по умолчанию)
+        once: Выполнить один цикл и завершиться
+        candles: CSV с записанными свечами: один цикл по ним вместо загрузки
+        float32: Хранить записанные свечи в float32
+    """
+    from src.scheduler.worker import run_recorded, run_worker
+
+    logger.info("Starting analysis worker...")
+
+    try:
+        init_database()
+        if candles:
+            run_recorded(candles, processes=processes, float32=float32)
+        else:
+            run_worker(processes=processes, once=once)
+    except Exception as e:
+        logger.error(f"Fatal error occurred: {e}", exc_info=True)
+        sys.exit(1)
+
+
+def run_live_analysis(replay: str, speed: float) -> None:
+    """
+    Запуск потокового анализа по закрытию баров
+
+    Args:
+        replay: Путь к CSV для воспроизведения (пусто - биржа LIVE_EXCHANGE)
+        speed: Ускорение воспроизведения
+    """
+    from src.scheduler.live import run_live
+
+    logger.info("Starting live analysis...")
+
+    try:
+        init_database()
+        run_live(replay=replay or None, speed=speed)
+    except Exception as e:
+        logger.error(f"Fatal error occurred: {e}", exc_info=True)
+        sys.exit(1)
+
+
+def main() -> None:
+    """Разбор аргументов и запуск выбранного режима"""
+    parser = argparse.ArgumentParser(description="Trading Signals Bot")
+    parser.add_argument(
+        'mode', nargs='?', default='bot', choices=['bot', 'worker', 'live'],
+        help="bot - Telegram бот, worker - анализ рынка в пуле процессов, "
+             "live - анализ по закрытию баров из потока свечей"
+    )
+    parser.add_argument(
+        '--processes', type=int, default=0,
+        help="Количество процессов анализа (по умолчанию ANALYSIS_WORKERS или число ядер)"
+    )
+    parser.add_argument('--once', action='store_true', help="Выполнить один цикл анализа и выйти")
+    parser.add_argument(
+        '--candles', default='',
+        help="worker: один цикл по записанным свечам из CSV (общая память вместо загрузки)"
+    )
+    parser.add_argument('--float32', action='store_true', help="worker --candles: хранить свечи в float32")
+    parser.add_argument('--replay', default='', help="live: CSV со свечами вместо биржи")
+    parser.add_argument('--speed', type=float, default=0.0, help="live: ускорение воспроизведения (0 - без пауз)")
+    args = parser.parse_args()
+
+    if args.mode == 'worker':
+        run_analysis_worker(args.processes, args.once, args.candles, args.float32)
+    elif args.mode == 'live':
+        run_live_analysis(args.replay, args.speed)
+    else:
+        run_bot()
+
+
 if __name__ == "__main__":
     main()
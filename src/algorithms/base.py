@@ -0,0 +1,251 @@
+"""
+Базовый класс алгоритма генерации сигналов.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.config import Config
+
+
+class Algorithm:
+    """
+    Базовый алгоритм: набор условий BUY/SELL, расчет уверенности и целей.
+
+    Условия записываются выражениями над индикаторами через &, | и
+    сравнения, поэтому одинаково вычисляются и для одного символа
+    (значения float), и для пакета символов (pandas.Series).
+    Пакетный путь (evaluate_batch/generate_signals) считает условия всех
+    символов одним проходом: матрица условий, взвешенная сумма и маска
+    MIN_CONFIDENCE вместо цикла по символам.
+    """
+
+    asset_type: str = ''
+    # Таймфрейм свечей, на котором работает алгоритм
+    timeframe: str = '1h'
+    # Глубина истории для расчета индикаторов, дни
+    history_days: int = 60
+
+    stop_loss_pct: float = 4.0
+    take_profit_1_pct: float = 7.0
+    take_profit_2_pct: Optional[float] = None
+    max_hold_days: int = 7
+    # Веса условий в уверенности (условия без веса - 1.0). Неизменяемый
+    # словарь: подклассы задают свои веса присваиванием, а не изменением общего
+    condition_weights: Mapping[str, float] = MappingProxyType({})
+
+    def buy_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Условия для сигнала BUY
+
+        Args:
+            f: Индикаторы (src.indicators.features)
+
+        Returns:
+            Dict[str, Any]: Название условия -> выполнено ли
+        """
+        raise NotImplementedError
+
+    def sell_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Условия для сигнала SELL
+
+        Args:
+            f: Индикаторы (src.indicators.features)
+
+        Returns:
+            Dict[str, Any]: Название условия -> выполнено ли
+        """
+        raise NotImplementedError
+
+    def calculate_confidence(self, conditions: Mapping[str, Any]) -> int:
+        """
+        Уверенность как взвешенная доля выполненных условий
+
+        Args:
+            conditions: Результаты условий
+
+        Returns:
+            int: Уверенность в % (0-100)
+        """
+        if not conditions:
+            return 0
+        weights = self._weights(list(conditions))
+        fired = sum(weight for weight, value in zip(weights, conditions.values()) if bool(value))
+        return int(np.rint(fired * 100 / weights.sum()))
+
+    def _weights(self, names: List[str]) -> np.ndarray:
+        """Веса условий в порядке names"""
+        return np.array([self.condition_weights.get(name, 1.0) for name in names], dtype=np.float64)
+
+    def _score_batch(self, conditions: Mapping[str, Any], count: int) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Матрица условий и уверенность для пакета символов
+
+        Args:
+            conditions: Результаты условий (pandas.Series по символам)
+            count: Количество символов
+
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: Названия условий,
+                матрица выполненных условий (символы x условия) и уверенность в %
+        """
+        names = list(conditions)
+        fired = np.empty((count, len(names)), dtype=bool)
+        for column, value in enumerate(conditions.values()):
+            fired[:, column] = np.broadcast_to(np.asarray(value, dtype=bool), (count,))
+        if not names:
+            return names, fired, np.zeros(count, dtype=np.int64)
+        weights = self._weights(names)
+        confidence = np.rint(fired @ weights * 100 / weights.sum()).astype(np.int64)
+        return names, fired, confidence
+
+    def evaluate_batch(self, features: pd.DataFrame) -> pd.DataFrame:
+        """
+        Пакетный анализ индикаторов многих символов
+
+        Выбор направления и порог совпадают с analyze(): берется более
+        уверенное направление (BUY при равенстве), строки ниже
+        MIN_CONFIDENCE отбрасываются.
+
+        Args:
+            features: Индикаторы на последней свече (строка на символ)
+
+        Returns:
+            pd.DataFrame: signal_type, confidence и conditions (сработавшие
+                условия через запятую) для символов с сигналом
+        """
+        count = len(features)
+        buy_names, buy_fired, buy_confidence = self._score_batch(self.buy_conditions(features), count)
+        sell_names, sell_fired, sell_confidence = self._score_batch(self.sell_conditions(features), count)
+
+        sell = sell_confidence > buy_confidence
+        confidence = np.where(sell, sell_confidence, buy_confidence)
+        rows = np.nonzero(confidence >= Config.MIN_CONFIDENCE)[0]
+
+        buy_names, sell_names = np.array(buy_names, dtype=object), np.array(sell_names, dtype=object)
+        conditions = [
+            ','.join(sell_names[sell_fired[row]] if sell[row] else buy_names[buy_fired[row]])
+            for row in rows
+        ]
+        return pd.DataFrame({
+            'signal_type': np.where(sell[rows], 'SELL', 'BUY'),
+            'confidence': confidence[rows],
+            'conditions': conditions,
+        }, index=features.index[rows])
+
+    def calculate_targets(self, price: float, signal_type: str) -> Dict[str, Optional[float]]:
+        """
+        Стоп-лосс и цели по цене входа
+
+        Args:
+            price: Цена входа
+            signal_type: 'BUY' или 'SELL'
+
+        Returns:
+            Dict[str, Optional[float]]: stop_loss, take_profit_1, take_profit_2
+        """
+        direction = 1 if signal_type == 'BUY' else -1
+        take_profit_2 = None
+        if self.take_profit_2_pct is not None:
+            take_profit_2 = price * (1 + direction * self.take_profit_2_pct / 100)
+
+        return {
+            'stop_loss': price * (1 - direction * self.stop_loss_pct / 100),
+            'take_profit_1': price * (1 + direction * self.take_profit_1_pct / 100),
+            'take_profit_2': take_profit_2,
+        }
+
+    def analyze(self, features: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Анализ индикаторов символа
+
+        Args:
+            features: Индикаторы на последней свече
+
+        Returns:
+            Optional[Dict[str, Any]]: signal_type, confidence и сработавшие условия
+                для более уверенного направления или None, если оба ниже MIN_CONFIDENCE
+        """
+        best = None
+        for signal_type, conditions in (
+            ('BUY', self.buy_conditions(features)),
+            ('SELL', self.sell_conditions(features)),
+        ):
+            confidence = self.calculate_confidence(conditions)
+            if confidence < Config.MIN_CONFIDENCE:
+                continue
+            if best is None or confidence > best['confidence']:
+                best = {
+                    'signal_type': signal_type,
+                    'confidence': confidence,
+                    'conditions': [name for name, value in conditions.items() if bool(value)],
+                }
+        return best
+
+    def generate_signal(self, symbol: str, features: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Генерация параметров сигнала для SignalRepository.create_signal
+
+        Args:
+            symbol: Символ актива
+            features: Индикаторы на последней свече
+
+        Returns:
+            Optional[Dict[str, Any]]: Аргументы create_signal или None
+        """
+        result = self.analyze(features)
+        if result is None:
+            return None
+
+        price = float(features['close'])
+        return {
+            'symbol': symbol,
+            'asset_type': self.asset_type,
+            'signal_type': result['signal_type'],
+            'price': price,
+            'confidence': result['confidence'],
+            'indicators_data': dict(features),
+            'max_hold_days': self.max_hold_days,
+            'fired_conditions': ','.join(result['conditions']),
+            **self.calculate_targets(price, result['signal_type']),
+        }
+
+    def generate_signals(self, features: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Пакетная генерация параметров сигналов для SignalRepository.create_signals
+
+        Args:
+            features: Индикаторы на последней свече (индекс - символы)
+
+        Returns:
+            List[Dict[str, Any]]: Аргументы сигналов для символов, прошедших MIN_CONFIDENCE
+        """
+        if features.empty:
+            return []
+        result = self.evaluate_batch(features)
+        selected = features.loc[result.index]
+        columns = list(selected.columns)
+        values = selected.to_numpy(dtype=np.float64).tolist()
+        prices = selected['close'].to_numpy(dtype=np.float64).tolist()
+
+        signals = []
+        for symbol, signal_type, confidence, conditions, price, row in zip(
+            result.index, result['signal_type'].tolist(), result['confidence'].tolist(),
+            result['conditions'].tolist(), prices, values
+        ):
+            signals.append({
+                'symbol': symbol,
+                'asset_type': self.asset_type,
+                'signal_type': signal_type,
+                'price': price,
+                'confidence': confidence,
+                'indicators_data': dict(zip(columns, row)),
+                'max_hold_days': self.max_hold_days,
+                'fired_conditions': conditions,
+                **self.calculate_targets(price, signal_type),
+            })
+        return signals
@@ -0,0 +1,38 @@
+"""
+Алгоритм сигналов для криптовалют (часовые свечи).
+"""
+
+from typing import Any, Dict, Mapping
+
+from src.algorithms.base import Algorithm
+
+
+class CryptoAlgorithm(Algorithm):
+    """Алгоритм для криптовалют: RSI, EMA/SMA, MACD, OBV, VROC"""
+
+    asset_type = 'crypto'
+    timeframe = '1h'
+    history_days = 60
+
+    stop_loss_pct = 4.0
+    take_profit_1_pct = 7.0
+    take_profit_2_pct = 12.0
+    max_hold_days = 7
+
+    def buy_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'rsi_oversold': f['rsi'] < 35,
+            'ema12_above_sma50': f['ema_12'] > f['sma_50'],
+            'macd_hist_rising': (f['macd_hist'] > 0) & (f['macd_hist'] > f['macd_hist_prev']),
+            'obv_above_ema': f['obv'] > f['obv_ema'],
+            'volume_surge_up': (f['vroc'] > 10) & (f['close'] > f['close_prev']),
+        }
+
+    def sell_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'rsi_overbought': f['rsi'] > 65,
+            'ema12_below_sma50': f['ema_12'] < f['sma_50'],
+            'macd_hist_falling': (f['macd_hist'] < 0) & (f['macd_hist'] < f['macd_hist_prev']),
+            'obv_below_ema': f['obv'] < f['obv_ema'],
+            'volume_surge_down': (f['vroc'] < -10) & (f['close'] < f['close_prev']),
+        }
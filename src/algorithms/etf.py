@@ -0,0 +1,38 @@
+"""
+Алгоритм сигналов для ETF (дневные свечи).
+"""
+
+from typing import Any, Dict, Mapping
+
+from src.algorithms.base import Algorithm
+
+
+class ETFAlgorithm(Algorithm):
+    """Алгоритм для ETF: тренд SMA(50/100/200), отскок RSI, MACD, OBV, цена к SMA(50)"""
+
+    asset_type = 'etf'
+    timeframe = '1d'
+    history_days = 400
+
+    stop_loss_pct = 3.0
+    take_profit_1_pct = 9.0
+    take_profit_2_pct = None
+    max_hold_days = 20
+
+    def buy_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'sma_uptrend': (f['sma_50'] > f['sma_100']) & (f['sma_100'] > f['sma_200']),
+            'rsi_rebound': (f['rsi_prev'] < 35) & (f['rsi'] > f['rsi_prev']),
+            'macd_positive_rising': (f['macd'] > 0) & (f['macd'] > f['macd_prev']),
+            'obv_accumulation': f['obv'] > f['obv_ema'],
+            'price_above_sma50': f['close'] > f['sma_50'],
+        }
+
+    def sell_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'sma_downtrend': (f['sma_50'] < f['sma_100']) & (f['sma_100'] < f['sma_200']),
+            'rsi_rollover': (f['rsi_prev'] > 65) & (f['rsi'] < f['rsi_prev']),
+            'macd_negative_falling': (f['macd'] < 0) & (f['macd'] < f['macd_prev']),
+            'obv_distribution': f['obv'] < f['obv_ema'],
+            'price_below_sma50': f['close'] < f['sma_50'],
+        }
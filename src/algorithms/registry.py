@@ -0,0 +1,29 @@
+"""
+Реестр алгоритмов по типу актива.
+"""
+
+from typing import Dict
+
+from src.algorithms.base import Algorithm
+from src.algorithms.crypto import CryptoAlgorithm
+from src.algorithms.etf import ETFAlgorithm
+from src.algorithms.stocks import StockAlgorithm
+
+ALGORITHMS: Dict[str, Algorithm] = {
+    'crypto': CryptoAlgorithm(),
+    'stock': StockAlgorithm(),
+    'etf': ETFAlgorithm(),
+}
+
+
+def get_algorithm(asset_type: str) -> Algorithm:
+    """
+    Алгоритм для типа актива
+
+    Args:
+        asset_type: 'crypto', 'stock' или 'etf'
+
+    Returns:
+        Algorithm: Экземпляр алгоритма
+    """
+    return ALGORITHMS[asset_type]
@@ -0,0 +1,38 @@
+"""
+Алгоритм сигналов для акций (дневные свечи).
+"""
+
+from typing import Any, Dict, Mapping
+
+from src.algorithms.base import Algorithm
+
+
+class StockAlgorithm(Algorithm):
+    """Алгоритм для акций: тренд SMA(20/50/200), RSI, пересечение MACD, OBV, объем"""
+
+    asset_type = 'stock'
+    timeframe = '1d'
+    history_days = 400
+
+    stop_loss_pct = 3.0
+    take_profit_1_pct = 8.0
+    take_profit_2_pct = None
+    max_hold_days = 10
+
+    def buy_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'sma_uptrend': (f['sma_20'] > f['sma_50']) & (f['sma_50'] > f['sma_200']),
+            'rsi_oversold': f['rsi'] < 30,
+            'macd_cross_up': (f['macd'] > f['macd_signal']) & (f['macd_prev'] <= f['macd_signal_prev']),
+            'obv_above_ema': f['obv'] > f['obv_ema'],
+            'high_volume': f['volume'] > f['volume_sma_20'] * 1.5,
+        }
+
+    def sell_conditions(self, f: Mapping[str, Any]) -> Dict[str, Any]:
+        return {
+            'sma_downtrend': (f['sma_20'] < f['sma_50']) & (f['sma_50'] < f['sma_200']),
+            'rsi_overbought': f['rsi'] > 70,
+            'macd_cross_down': (f['macd'] < f['macd_signal']) & (f['macd_prev'] >= f['macd_signal_prev']),
+            'obv_below_ema': f['obv'] < f['obv_ema'],
+            'high_volume_drop': (f['volume'] > f['volume_sma_20'] * 1.5) & (f['close'] < f['close_prev']),
+        }
@@ -0,0 +1,82 @@
+"""
+Админские команды Telegram бота.
+"""
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.bot.messages import Messages
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+from src.database.repository import user_repository, signal_repository
+
+logger = setup_logger(__name__)
+
+
+def is_admin(telegram_id: int) -> bool:
+    """
+    Проверка прав администратора
+
+    Args:
+        telegram_id: Telegram ID пользователя
+
+    Returns:
+        bool: True если пользователь указан в ADMIN_IDS
+    """
+    return telegram_id in Config.ADMIN_IDS
+
+
+async def users_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обработчик команды /users
+    Количество пользователей и подписчиков
+
+    Args:
+        update: Объект обновления от Telegram
+        context: Контекст выполнения
+    """
+    user = update.effective_user
+    if not is_admin(user.id):
+        logger.warning(f"User {user.id} ({user.username}) tried to access /users")
+        await update.message.reply_text(Messages.ADMIN_ONLY)
+        return
+
+    try:
+        message = Messages.ADMIN_USERS.format(
+            total=user_repository.get_users_count(),
+            subscribed=user_repository.get_subscribed_users_count()
+        )
+        await update.message.reply_text(message)
+        logger.info(f"Admin {user.id} requested users count")
+
+    except Exception as e:
+        logger.error(f"Error in users_command: {e}", exc_info=True)
+        await update.message.reply_text(Messages.ERROR)
+
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Обработчик команды /stats
+    Статистика по сигналам из агрегатной таблицы
+
+    Args:
+        update: Объект обновления от Telegram
+        context: Контекст выполнения
+    """
+    user = update.effective_user
+    if not is_admin(user.id):
+        logger.warning(f"User {user.id} ({user.username}) tried to access /stats")
+        await update.message.reply_text(Messages.ADMIN_ONLY)
+        return
+
+    try:
+        message = Messages.format_admin_stats(
+            total=signal_repository.get_signal_stats(),
+            week=signal_repository.get_signal_stats(days=7),
+            by_symbol=signal_repository.get_signal_stats_by_symbol()
+        )
+        await update.message.reply_text(message)
+        logger.info(f"Admin {user.id} requested signal stats")
+
+    except Exception as e:
+        logger.error(f"Error in stats_command: {e}", exc_info=True)
+        await update.message.reply_text(Messages.ERROR)
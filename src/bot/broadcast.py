@@ -0,0 +1,340 @@
+"""
+Рассылка сигналов подписчикам через outbox (signal_deliveries).
+
+Каждый экземпляр бота забирает пачки заданий в аренду, отправляет
+сообщения и подтверждает доставку. Задания упавшего экземпляра
+возвращаются в очередь по истечении аренды.
+"""
+
+import asyncio
+import math
+import os
+import socket
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+from telegram import Bot
+from telegram.error import Forbidden, RetryAfter, TelegramError
+from telegram.ext import ContextTypes
+
+from src.bot.messages import Messages
+from src.database.models import Signal
+from src.database.repository import correlation_repository, delivery_repository, signal_repository
+from src.indicators.correlation import group_leaders
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Идентификатор экземпляра для lease_owner
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SendRateLimiter:
+    """
+    Равномерный темп отправки: не больше rate сообщений в секунду
+
+    Слот резервируется до ожидания, поэтому параллельные корутины
+    одного цикла событий получают разные слоты.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Инициализация ограничителя
+
+        Args:
+            rate: Сообщений в секунду (0 - без ограничения)
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Ожидание слота для следующего сообщения"""
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Лимит отправки экземпляра (Telegram: около 30 сообщений в секунду на бота)
+send_limiter = SendRateLimiter(Config.DELIVERY_RATE_PER_SECOND)
+
+
+def _percent(value: float, base: float) -> float:
+    """Изменение value относительно base в %"""
+    return round((value - base) / base * 100, 1) if base else 0.0
+
+
+def format_signal_message(signal: Signal, followers: Optional[List[Signal]] = None) -> str:
+    """
+    Текст сообщения для сигнала
+
+    Args:
+        signal: Сигнал из БД
+        followers: Коррелированные сигналы группы, если сигнал - лидер
+
+    Returns:
+        str: Отформатированное сообщение
+    """
+    message = _format_single_signal(signal)
+    if not followers:
+        return message
+
+    correlations = correlation_repository.get_correlations(
+        [signal.symbol] + [follower.symbol for follower in followers]
+    )
+    return Messages.format_signal_group(message, [
+        {
+            'symbol': follower.symbol,
+            'signal_type': follower.signal_type,
+            'confidence': follower.confidence,
+            'correlation': correlations.get((signal.symbol, follower.symbol)),
+        }
+        for follower in followers
+    ])
+
+
+# Индикаторы в тексте сигнала: ключ снимка -> (подпись, формат значения)
+DISPLAY_INDICATORS = (
+    ('rsi', 'RSI', '{:.1f}'),
+    ('macd', 'MACD', '{:.4g}'),
+    ('macd_hist', 'MACD гистограмма', '{:.4g}'),
+    ('ema_12', 'EMA12', '{:,.2f}'),
+    ('sma_50', 'SMA50', '{:,.2f}'),
+    ('sma_200', 'SMA200', '{:,.2f}'),
+)
+
+
+def display_indicators(data: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    """
+    Короткий набор округленных индикаторов для сообщения
+
+    Args:
+        data: Снимок индикаторов сигнала
+
+    Returns:
+        Dict[str, str]: Подпись -> отформатированное значение (без отсутствующих и NaN)
+    """
+    data = data or {}
+
+    def finite(key: str) -> Optional[float]:
+        value = data.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            return float(value)
+        return None
+
+    result: Dict[str, str] = {}
+    for key, label, template in DISPLAY_INDICATORS:
+        value = finite(key)
+        if value is not None:
+            result[label] = template.format(value)
+
+    volume, average = finite('volume'), finite('volume_sma_20')
+    if volume is not None and average:
+        result['Объем к среднему'] = f"{volume / average:.1f}x"
+    return result
+
+
+def _format_single_signal(signal: Signal) -> str:
+    """Текст сообщения для одного сигнала"""
+    conditions = signal.fired_conditions.split(',') if signal.fired_conditions else []
+    indicators = display_indicators(signal.indicators_data)
+    if signal.signal_type == 'SELL':
+        return Messages.format_signal_sell(
+            symbol=signal.symbol,
+            price=signal.price,
+            confidence=signal.confidence,
+            indicators=indicators,
+            conditions=conditions
+        )
+
+    targets: Dict[str, Any] = {
+        'tp1': signal.take_profit_1,
+        'tp1_pct': _percent(signal.take_profit_1, signal.price),
+        'tp2': signal.take_profit_2 or 0,
+        'tp2_pct': _percent(signal.take_profit_2, signal.price) if signal.take_profit_2 else 0,
+        'sl': signal.stop_loss,
+        'sl_pct': _percent(signal.stop_loss, signal.price),
+        'max_hold_days': signal.max_hold_days,
+    }
+    return Messages.format_signal_buy(
+        symbol=signal.symbol,
+        price=signal.price,
+        confidence=signal.confidence,
+        indicators=indicators,
+        targets=targets,
+        conditions=conditions
+    )
+
+
+def group_correlated_signals(signals: List[Signal], threshold: float) -> Dict[int, List[int]]:
+    """
+    Группировка сигналов по корреляции символов
+
+    Args:
+        signals: Неотправленные сигналы
+        threshold: Порог корреляции
+
+    Returns:
+        Dict[int, List[int]]: ID лидера -> ID последователей (для каждого сигнала-лидера)
+    """
+    if len(signals) < 2:
+        return {signal.id: [] for signal in signals}
+
+    symbols = [signal.symbol for signal in signals]
+    correlations = correlation_repository.get_correlations(sorted(set(symbols)))
+    matrix = np.array([
+        [1.0 if a == b else correlations.get((a, b), np.nan) for b in symbols]
+        for a in symbols
+    ])
+    leaders = group_leaders(
+        np.array([signal.confidence for signal in signals]),
+        np.array([signal.signal_type for signal in signals]),
+        matrix,
+        threshold
+    )
+
+    groups: Dict[int, List[int]] = {}
+    for position, leader in enumerate(leaders):
+        if leader == position:
+            groups.setdefault(signals[position].id, [])
+        else:
+            groups.setdefault(signals[leader].id, []).append(signals[position].id)
+    return groups
+
+
+def enqueue_new_signals() -> int:
+    """
+    Создание заданий доставки для новых сигналов
+
+    Коррелированные сигналы (SPY/QQQ/VTI, BTC/ETH) схлопываются: рассылается
+    только сигнал с наибольшей уверенностью, остальные входят в его сообщение.
+
+    Returns:
+        int: Количество созданных заданий
+    """
+    signals = signal_repository.get_unsent_signals()
+    if Config.SIGNAL_GROUPING_ENABLED:
+        groups = group_correlated_signals(signals, Config.CORRELATION_THRESHOLD)
+    else:
+        groups = {signal.id: [] for signal in signals}
+
+    queued = 0
+    for leader_id, follower_ids in groups.items():
+        queued += delivery_repository.enqueue_signal(leader_id, follower_ids)
+    return queued
+
+
+async def drain_outbox(
+    bot: Bot,
+    owner: str = INSTANCE_ID,
+    batch_size: int = 0,
+    lease_seconds: int = 0
+) -> int:
+    """
+    Отправка ожидающих заданий, пока очередь не опустеет
+
+    Args:
+        bot: Экземпляр бота (или объект с корутиной send_message)
+        owner: Идентификатор отправителя
+        batch_size: Размер пачки (0 - DELIVERY_BATCH_SIZE)
+        lease_seconds: Срок аренды (0 - DELIVERY_LEASE_SECONDS)
+
+    Returns:
+        int: Количество подтвержденных отправок
+    """
+    batch_size = batch_size or Config.DELIVERY_BATCH_SIZE
+    lease_seconds = lease_seconds or Config.DELIVERY_LEASE_SECONDS
+    sent = 0
+
+    while True:
+        # Срок аренды в БД отсчитывается от момента запроса, поэтому и
+        # локальный дедлайн считаем от него (с учетом ожидания блокировки)
+        requested_at = time.monotonic()
+        token, batch = await asyncio.to_thread(delivery_repository.claim_batch, owner, batch_size, lease_seconds)
+        if not batch:
+            break
+
+        deadline = requested_at + lease_seconds
+        followers = await asyncio.to_thread(
+            signal_repository.get_group_followers, list({signal.id for _, signal in batch})
+        )
+        messages: Dict[int, str] = {}
+        unacked: List[int] = []
+        flood_wait = 0.0
+
+        for position, (delivery, signal) in enumerate(batch):
+            await send_limiter.wait()
+
+            # На середине аренды подтверждаем отправленное и продлеваем остальное
+            if deadline - time.monotonic() < lease_seconds / 2:
+                checkpoint_at = time.monotonic()
+                acked, renewed = await asyncio.to_thread(delivery_repository.checkpoint, unacked, token, lease_seconds)
+                sent += acked
+                unacked = []
+                if renewed == 0:
+                    logger.warning(f"Lease {token} lost, leaving {len(batch) - position} deliveries")
+                    break
+                deadline = checkpoint_at + lease_seconds
+
+            # Аренда могла истечь во время ожидания блокировки: задание уже
+            # может отправлять другой экземпляр, поэтому не отправляем
+            if time.monotonic() >= deadline:
+                logger.warning(f"Lease {token} expired, leaving {len(batch) - position} deliveries")
+                break
+
+            if signal.id not in messages:
+                messages[signal.id] = await asyncio.to_thread(
+                    format_signal_message, signal, followers.get(signal.id)
+                )
+
+            try:
+                await bot.send_message(chat_id=delivery.telegram_id, text=messages[signal.id])
+            except RetryAfter as e:
+                # Flood control: остаток пачки возвращается в очередь без расхода попыток
+                flood_wait = float(e.retry_after)
+                logger.warning(f"Telegram flood control: pausing delivery for {flood_wait:.0f}s")
+                break
+            except Forbidden as e:
+                logger.warning(f"User {delivery.telegram_id} blocked the bot: {e}")
+                await asyncio.to_thread(delivery_repository.mark_failed, delivery.id, token, str(e), permanent=True)
+                continue
+            except TelegramError as e:
+                logger.error(f"Error sending signal {signal.id} to {delivery.telegram_id}: {e}")
+                await asyncio.to_thread(delivery_repository.mark_failed, delivery.id, token, str(e))
+                continue
+
+            unacked.append(delivery.id)
+
+        if unacked:
+            acked = await asyncio.to_thread(delivery_repository.mark_sent, unacked, token)
+            sent += acked
+            if acked < len(unacked):
+                logger.warning(f"Lease {token} lost before {len(unacked) - acked} deliveries were confirmed")
+
+        if flood_wait:
+            await asyncio.to_thread(delivery_repository.postpone, token, flood_wait)
+            await asyncio.sleep(flood_wait)
+
+    if sent:
+        logger.info(f"Delivered {sent} signal messages")
+    return sent
+
+
+async def broadcast_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Периодическая задача JobQueue: постановка новых сигналов в outbox и рассылка
+
+    Args:
+        context: Контекст выполнения
+    """
+    try:
+        # Запросы к БД блокируют: выполняем их вне цикла событий бота
+        await asyncio.to_thread(enqueue_new_signals)
+        await drain_outbox(context.bot)
+    except Exception as e:
+        logger.error(f"Broadcast job failed: {e}", exc_info=True)
@@ -6,7 +6,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from src.bot.messages import Messages
 from src.utils.logger import setup_logger
-from src.database.repository import user_repository
+from src.database.repository import delivery_repository, user_repository
 
 logger = setup_logger(__name__)
 
@@ -137,8 +137,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         # Формируем сообщение со статусом
         subscription_date = db_user.created_at.strftime('%d.%m.%Y')
-        # TODO: В будущем добавить подсчет полученных сигналов
-        signals_count = 0
+        signals_count = delivery_repository.get_delivered_count(user.id)
 
         status_message = Messages.STATUS_SUBSCRIBED.format(
             subscription_date=subscription_date,
@@ -7,6 +7,34 @@
 class Messages:
     """Класс с шаблонами сообщений"""
 
+    # Названия условий алгоритмов (src.algorithms) для текста сигнала
+    CONDITION_LABELS = {
+        'rsi_oversold': "RSI в зоне перепроданности",
+        'rsi_overbought': "RSI в зоне перекупленности",
+        'rsi_rebound': "RSI разворачивается вверх из перепроданности",
+        'rsi_rollover': "RSI разворачивается вниз из перекупленности",
+        'ema12_above_sma50': "EMA12 выше SMA50",
+        'ema12_below_sma50': "EMA12 ниже SMA50",
+        'sma_uptrend': "Восходящий тренд скользящих средних",
+        'sma_downtrend': "Нисходящий тренд скользящих средних",
+        'price_above_sma50': "Цена выше SMA50",
+        'price_below_sma50': "Цена ниже SMA50",
+        'macd_hist_rising': "Гистограмма MACD растет",
+        'macd_hist_falling': "Гистограмма MACD падает",
+        'macd_cross_up': "MACD пересек сигнальную линию снизу вверх",
+        'macd_cross_down': "MACD пересек сигнальную линию сверху вниз",
+        'macd_positive_rising': "MACD выше нуля и растет",
+        'macd_negative_falling': "MACD ниже нуля и падает",
+        'obv_above_ema': "OBV выше своей EMA",
+        'obv_below_ema': "OBV ниже своей EMA",
+        'obv_accumulation': "OBV: накопление",
+        'obv_distribution': "OBV: распределение",
+        'volume_surge_up': "Рост объема на росте цены",
+        'volume_surge_down': "Рост объема на падении цены",
+        'high_volume': "Объем выше среднего в 1.5 раза",
+        'high_volume_drop': "Высокий объем на падении цены",
+    }
+
     # Команда /start
     START = """👋 Добро пожаловать в Trading Signals Bot!
 
@@ -83,9 +111,91 @@ class Messages:
 
 Пожалуйста, попробуйте позже или обратитесь к администратору."""
 
+    # Админские команды - нет доступа
+    ADMIN_ONLY = """⛔ Команда доступна только администратору."""
+
+    # Команда /users
+    ADMIN_USERS = """👥 Пользователи:
+
+Всего: {total}
+Подписаны: {subscribed}"""
+
+    # Команда /stats
+    ADMIN_STATS_HEADER = """📈 Статистика сигналов
+
+Всего сигналов: {signals}
+За 7 дней: {signals_week}
+Закрыто: {closed}
+Win rate: {win_rate}
+Средняя уверенность: {avg_confidence}"""
+
+    @staticmethod
+    def format_percent(value) -> str:
+        """
+        Форматирование доли в проценты
+
+        Args:
+            value: Доля (0-1) или None
+
+        Returns:
+            str: Строка вида '57.1%' или '—'
+        """
+        return f"{value * 100:.1f}%" if value is not None else "—"
+
+    @staticmethod
+    def format_admin_stats(total: dict, week: dict, by_symbol: list) -> str:
+        """
+        Форматирование статистики для команды /stats
+
+        Args:
+            total: Сводная статистика за все время
+            week: Сводная статистика за 7 дней
+            by_symbol: Статистика по символам
+
+        Returns:
+            str: Отформатированное сообщение
+        """
+        avg_confidence = total.get('avg_confidence')
+        message = Messages.ADMIN_STATS_HEADER.format(
+            signals=total.get('signals', 0),
+            signals_week=week.get('signals', 0),
+            closed=total.get('closed', 0),
+            win_rate=Messages.format_percent(total.get('win_rate')),
+            avg_confidence=f"{avg_confidence:.1f}%" if avg_confidence is not None else "—"
+        )
+
+        if by_symbol:
+            message += "\n\n📊 По символам:"
+            for row in by_symbol:
+                message += (
+                    f"\n{row['symbol']}: {row['signals']} сигн., "
+                    f"win rate {Messages.format_percent(row['win_rate'])}"
+                )
+
+        return message
+
+    @staticmethod
+    def format_conditions(conditions: list) -> str:
+        """
+        Блок сработавших условий алгоритма
+
+        Args:
+            conditions: Названия условий
+
+        Returns:
+            str: Текст блока (пустая строка без условий)
+        """
+        if not conditions:
+            return ""
+
+        message = "\n\n📋 Сработавшие условия:"
+        for name in conditions:
+            message += f"\n✅ {Messages.CONDITION_LABELS.get(name, name)}"
+        return message
+
     @staticmethod
     def format_signal_buy(symbol: str, price: float, confidence: int,
-                          indicators: dict, targets: dict) -> str:
+                          indicators: dict, targets: dict, conditions: list = None) -> str:
         """
         Форматирование сигнала на покупку
 
@@ -95,6 +205,7 @@ class Messages:
             confidence: Уверенность в %
             indicators: Словарь с данными индикаторов
             targets: Словарь с целями (tp1, tp2, sl)
+            conditions: Сработавшие условия алгоритма
 
         Returns:
             str: Отформатированное сообщение
@@ -113,6 +224,8 @@ class Messages:
         for key, value in indicators.items():
             message += f"\n✅ {key}: {value}"
 
+        message += Messages.format_conditions(conditions)
+
         # Добавление целей
         message += f"""
 
@@ -127,7 +240,7 @@ Stop-Loss: ${targets.get('sl', 0):,.2f} ({targets.get('sl_pct', 0)}%)
 
     @staticmethod
     def format_signal_sell(symbol: str, price: float, confidence: int,
-                           indicators: dict) -> str:
+                           indicators: dict, conditions: list = None) -> str:
         """
         Форматирование сигнала на продажу
 
@@ -136,6 +249,7 @@ Stop-Loss: ${targets.get('sl', 0):,.2f} ({targets.get('sl_pct', 0)}%)
             price: Текущая цена
             confidence: Уверенность в %
             indicators: Словарь с данными индикаторов
+            conditions: Сработавшие условия алгоритма
 
         Returns:
             str: Отформатированное сообщение
@@ -154,6 +268,33 @@ Stop-Loss: ${targets.get('sl', 0):,.2f} ({targets.get('sl_pct', 0)}%)
         for key, value in indicators.items():
             message += f"\n✅ {key}: {value}"
 
+        message += Messages.format_conditions(conditions)
+
         message += f"\n\n⚠️ Действие: Закрыть LONG позиции в {symbol}"
 
         return message
+
+    @staticmethod
+    def format_signal_group(message: str, related: list) -> str:
+        """
+        Добавление коррелированных сигналов группы к сообщению лидера
+
+        Args:
+            message: Сообщение сигнала-лидера
+            related: Сигналы группы (symbol, signal_type, confidence, correlation)
+
+        Returns:
+            str: Отформатированное сообщение
+        """
+        if not related:
+            return message
+
+        message += "\n\n🔗 Коррелированные активы с тем же сигналом:"
+        for item in related:
+            correlation = item.get('correlation')
+            message += (
+                f"\n• {item['symbol']}: {item['signal_type']} {item['confidence']}%"
+                + (f" (ρ {correlation:.2f})" if correlation is not None else "")
+            )
+
+        return message
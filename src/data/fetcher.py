@@ -0,0 +1,81 @@
+"""
+Получение исторических свечей (yfinance).
+
+Базовый таймфрейм - 1h. Старшие таймфреймы строятся ресемплером
+(src.data.resampler) без дополнительных запросов к API.
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from src.data.resampler import OHLCV_COLUMNS, resampler
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+BASE_INTERVAL = '1h'
+# Период догрузки, когда по символу уже есть свечи в ресемплере
+INCREMENTAL_PERIOD_DAYS = 5
+# Ограничение yfinance для часовых свечей
+MAX_HOURLY_PERIOD_DAYS = 729
+
+
+def fetch_ohlcv(symbol: str, period_days: int, interval: str = BASE_INTERVAL) -> Optional[pd.DataFrame]:
+    """
+    Загрузка свечей из yfinance
+
+    Args:
+        symbol: Символ актива (формат yfinance: BTC-USD, AAPL, SPY)
+        period_days: Глубина истории в днях
+        interval: Интервал свечей
+
+    Returns:
+        Optional[pd.DataFrame]: Свечи open/high/low/close/volume с индексом в UTC
+            или None при ошибке
+    """
+    import yfinance as yf
+
+    try:
+        history = yf.Ticker(symbol).history(period=f"{period_days}d", interval=interval)
+    except Exception as e:
+        logger.error(f"Error fetching {symbol} from yfinance: {e}")
+        return None
+
+    if history is None or history.empty:
+        logger.warning(f"No data returned for {symbol}")
+        return None
+
+    candles = history.rename(columns=str.lower)[OHLCV_COLUMNS]
+    if candles.index.tz is None:
+        candles.index = candles.index.tz_localize('UTC')
+    else:
+        candles.index = candles.index.tz_convert('UTC')
+    return candles.astype('float64')
+
+
+def get_candles(symbol: str, timeframe: str, history_days: int) -> Optional[pd.DataFrame]:
+    """
+    Закрытые свечи символа на нужном таймфрейме
+
+    Первый вызов загружает всю историю базового таймфрейма, последующие
+    догружают только последние дни; старшие таймфреймы берутся из ресемплера.
+
+    Args:
+        symbol: Символ актива
+        timeframe: Таймфрейм ('1h', '4h', '1d', '1w')
+        history_days: Необходимая глубина истории в днях
+
+    Returns:
+        Optional[pd.DataFrame]: Свечи или None, если данных нет
+    """
+    known = resampler.get(symbol, BASE_INTERVAL)
+    period_days = INCREMENTAL_PERIOD_DAYS if known is not None else history_days
+    candles = fetch_ohlcv(symbol, min(period_days, MAX_HOURLY_PERIOD_DAYS))
+
+    if candles is not None:
+        resampler.update(symbol, candles)
+    elif known is None:
+        return None
+
+    return resampler.get(symbol, timeframe, closed_only=True)
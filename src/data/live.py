@@ -0,0 +1,421 @@
+"""
+Потоковая загрузка свечей и запуск анализа по закрытию бара.
+
+Источник (CandleSource) отдает обновления свечей, LiveIngestor складывает
+их в кольцевые буферы (src.data.ring_buffer) и, как только бар символа
+закрылся, вызывает обработчик только для этого символа. Источники:
+    - CcxtCandleSource - биржа через ccxt (опрос REST или websocket ccxt.pro)
+    - ReplayCandleSource - записанные свечи из CSV с ускорением (тесты, бенчмарки)
+"""
+
+import asyncio
+import csv
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Set
+
+import pandas as pd
+
+from src.data.resampler import TIMEFRAMES
+from src.data.ring_buffer import NO_TIMESTAMP, CandleBufferStore
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Обработчик закрытия бара: символ и свечи буфера, последняя - только что закрытая
+BarCloseHandler = Callable[[str, pd.DataFrame], Awaitable[None]]
+
+# Свечей в одном запросе истории (ограничение большинства бирж)
+WARMUP_PAGE_LIMIT = 1000
+
+
+class Candle(NamedTuple):
+    """Обновление свечи из источника"""
+
+    symbol: str
+    # Время открытия свечи, нс с эпохи (UTC)
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    # Источник знает, что свеча окончательная
+    closed: bool = False
+
+
+class CandleSource:
+    """Базовый источник свечей"""
+
+    timeframe: str = '1h'
+
+    async def warmup(self, symbol: str, limit: int) -> List[Candle]:
+        """
+        История для заполнения буфера перед стартом потока
+
+        Args:
+            symbol: Символ актива
+            limit: Количество свечей
+
+        Returns:
+            List[Candle]: Закрытые свечи в хронологическом порядке
+        """
+        return []
+
+    def stream(self, symbols: List[str]) -> AsyncIterator[Candle]:
+        """
+        Поток обновлений свечей
+
+        Args:
+            symbols: Символы
+
+        Returns:
+            AsyncIterator[Candle]: Обновления (одна свеча может приходить многократно)
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Освобождение ресурсов источника"""
+
+
+class CcxtCandleSource(CandleSource):
+    """Свечи с биржи через ccxt"""
+
+    def __init__(
+        self,
+        exchange_id: str = 'binance',
+        timeframe: str = '1h',
+        poll_seconds: float = 30.0,
+        quote: str = 'USDT',
+        use_websocket: bool = False,
+        api_key: str = '',
+        api_secret: str = ''
+    ):
+        """
+        Инициализация источника
+
+        Args:
+            exchange_id: Идентификатор биржи ccxt
+            timeframe: Таймфрейм свечей
+            poll_seconds: Интервал опроса REST
+            quote: Котируемая валюта для символов вида BTC-USD
+            use_websocket: Использовать watch_ohlcv (ccxt.pro) вместо опроса
+            api_key: API ключ (опционально)
+            api_secret: API секрет (опционально)
+        """
+        if use_websocket:
+            import ccxt.pro as ccxt_module
+        else:
+            import ccxt.async_support as ccxt_module
+
+        self.timeframe = timeframe
+        self.poll_seconds = poll_seconds
+        self.quote = quote
+        self.use_websocket = use_websocket
+        self._exchange = getattr(ccxt_module, exchange_id)({
+            'apiKey': api_key,
+            'secret': api_secret,
+            'enableRateLimit': True,
+        })
+
+    def to_exchange_symbol(self, symbol: str) -> str:
+        """
+        Символ приложения (формат yfinance) в символ биржи
+
+        Args:
+            symbol: Символ вида BTC-USD
+
+        Returns:
+            str: Символ вида BTC/USDT
+        """
+        base, _, quote = symbol.partition('-')
+        if not quote or quote == 'USD':
+            quote = self.quote
+        return f"{base}/{quote}"
+
+    def _to_candles(self, symbol: str, rows: List[List[float]], closed: bool) -> List[Candle]:
+        """Строки ccxt [ms, o, h, l, c, v] в Candle"""
+        return [
+            Candle(symbol, int(row[0]) * 1_000_000, float(row[1]), float(row[2]),
+                   float(row[3]), float(row[4]), float(row[5] or 0.0), closed)
+            for row in rows
+        ]
+
+    async def warmup(self, symbol: str, limit: int) -> List[Candle]:
+        # Биржи отдают не больше WARMUP_PAGE_LIMIT свечей за запрос: история
+        # дневных алгоритмов в часовых свечах загружается страницами от since
+        exchange_symbol = self.to_exchange_symbol(symbol)
+        step = self._exchange.parse_timeframe(self.timeframe) * 1000
+        since = self._exchange.milliseconds() - (limit + 1) * step
+        rows: List[List[float]] = []
+        try:
+            while True:
+                page = await self._exchange.fetch_ohlcv(
+                    exchange_symbol, self.timeframe, since=since, limit=WARMUP_PAGE_LIMIT
+                )
+                page = [row for row in page if not rows or row[0] > rows[-1][0]]
+                if not page:
+                    break
+                rows.extend(page)
+                # Дошли до формирующейся свечи
+                if rows[-1][0] + step > self._exchange.milliseconds():
+                    break
+                since = int(rows[-1][0]) + step
+        except Exception as e:
+            logger.error(f"Error fetching history for {symbol} from {self._exchange.id}: {e}")
+            return []
+        # Последняя свеча еще формируется
+        return self._to_candles(symbol, rows[:-1][-limit:], closed=True)
+
+    async def stream(self, symbols: List[str]) -> AsyncIterator[Candle]:
+        if self.use_websocket:
+            async for candle in self._watch(symbols):
+                yield candle
+            return
+
+        while True:
+            started = time.monotonic()
+            for symbol in symbols:
+                try:
+                    # Две последние свечи: закрытая и текущая
+                    rows = await self._exchange.fetch_ohlcv(
+                        self.to_exchange_symbol(symbol), self.timeframe, limit=2
+                    )
+                except Exception as e:
+                    logger.error(f"Error polling {symbol} from {self._exchange.id}: {e}")
+                    continue
+                for candle in self._to_candles(symbol, rows[:-1], closed=True):
+                    yield candle
+                for candle in self._to_candles(symbol, rows[-1:], closed=False):
+                    yield candle
+            await asyncio.sleep(max(0.0, self.poll_seconds - (time.monotonic() - started)))
+
+    async def _watch(self, symbols: List[str]) -> AsyncIterator[Candle]:
+        """Поток через watch_ohlcv: закрытие бара определяет LiveIngestor по смене свечи"""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def watch_symbol(symbol: str) -> None:
+            exchange_symbol = self.to_exchange_symbol(symbol)
+            while True:
+                try:
+                    rows = await self._exchange.watch_ohlcv(exchange_symbol, self.timeframe)
+                except Exception as e:
+                    logger.error(f"Error watching {symbol} on {self._exchange.id}: {e}")
+                    await asyncio.sleep(self.poll_seconds)
+                    continue
+                for candle in self._to_candles(symbol, rows, closed=False):
+                    await queue.put(candle)
+
+        tasks = [asyncio.create_task(watch_symbol(symbol)) for symbol in symbols]
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def close(self) -> None:
+        await self._exchange.close()
+
+
+def _parse_timestamp(value: str) -> int:
+    """Метка времени из CSV (мс с эпохи или ISO-8601) в нс с эпохи (UTC)"""
+    if value.isdigit():
+        return int(value) * 1_000_000
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp.value
+
+
+class ReplayCandleSource(CandleSource):
+    """
+    Воспроизведение записанных свечей
+
+    CSV с колонками symbol,timestamp,open,high,low,close,volume (timestamp -
+    ISO-8601 или миллисекунды с эпохи). Свечи отдаются закрытыми в порядке
+    времени; пауза между барами - реальный интервал, деленный на speed.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0, timeframe: str = '1h'):
+        """
+        Инициализация источника
+
+        Args:
+            path: Путь к CSV
+            speed: Ускорение относительно реального времени (0 - без пауз)
+            timeframe: Таймфрейм записанных свечей
+        """
+        self.path = path
+        self.speed = speed
+        self.timeframe = timeframe
+
+    def load(self, symbols: Optional[List[str]] = None) -> List[Candle]:
+        """
+        Чтение свечей из файла
+
+        Args:
+            symbols: Оставить только эти символы (None - все)
+
+        Returns:
+            List[Candle]: Свечи, отсортированные по времени
+        """
+        wanted: Optional[Set[str]] = set(symbols) if symbols else None
+        candles = []
+        with open(self.path, newline='') as f:
+            for row in csv.DictReader(f):
+                if wanted is not None and row['symbol'] not in wanted:
+                    continue
+                candles.append(Candle(
+                    row['symbol'], _parse_timestamp(row['timestamp']), float(row['open']), float(row['high']),
+                    float(row['low']), float(row['close']), float(row['volume']), True
+                ))
+        candles.sort(key=lambda candle: candle.timestamp)
+        return candles
+
+    async def stream(self, symbols: List[str]) -> AsyncIterator[Candle]:
+        previous = None
+        for candle in self.load(symbols):
+            if self.speed > 0 and previous is not None and candle.timestamp > previous:
+                await asyncio.sleep((candle.timestamp - previous) / 1e9 / self.speed)
+            elif previous is not None and candle.timestamp > previous:
+                # Отдаем управление, чтобы обработчики успевали выполняться
+                await asyncio.sleep(0)
+            previous = candle.timestamp
+            yield candle
+
+
+class LiveIngestor:
+    """Прием потока свечей в кольцевые буферы с событиями закрытия бара"""
+
+    def __init__(
+        self,
+        source: CandleSource,
+        on_bar_close: BarCloseHandler,
+        capacity: int = 2000,
+        max_concurrent: int = 4,
+        coalesce: bool = True
+    ):
+        """
+        Инициализация приемника
+
+        Args:
+            source: Источник свечей
+            on_bar_close: Обработчик закрытия бара
+            capacity: Размер буфера каждого символа
+            max_concurrent: Сколько обработчиков может выполняться одновременно
+            coalesce: Закрытия баров во время работы обработчика символа
+                схлопываются в один повторный запуск по последнему бару;
+                False - поток ждет обработчик и каждый бар обрабатывается
+                (воспроизведение, бенчмарки)
+        """
+        self.source = source
+        self.on_bar_close = on_bar_close
+        self.buffers = CandleBufferStore(capacity)
+        self._bar_ns = int(TIMEFRAMES[source.timeframe].value)
+        # Время открытия последнего бара, по которому уже был вызван обработчик
+        self._last_closed: Dict[str, int] = {}
+        self.coalesce = coalesce
+        # Выполняющиеся обработчики по символам
+        self._running: Dict[str, asyncio.Task] = {}
+        # Символы, бар которых закрылся во время работы обработчика
+        self._pending: Set[str] = set()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.stats = {'candles': 0, 'bars_closed': 0, 'handled': 0, 'coalesced': 0}
+
+    async def warmup(self, symbols: List[str]) -> None:
+        """
+        Заполнение буферов историей источника
+
+        Args:
+            symbols: Символы
+        """
+        for symbol in symbols:
+            candles = await self.source.warmup(symbol, self.buffers.capacity)
+            buffer = self.buffers.get_or_create(symbol)
+            for candle in candles:
+                buffer.push(candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume)
+            if candles:
+                self._last_closed[symbol] = candles[-1].timestamp
+            logger.info(f"Warmed up {symbol}: {len(buffer)} candles")
+
+    def ingest(self, candle: Candle) -> Optional[int]:
+        """
+        Добавление обновления свечи
+
+        Args:
+            candle: Обновление
+
+        Returns:
+            Optional[int]: Время открытия бара, который закрылся этим обновлением, или None
+        """
+        self.stats['candles'] += 1
+        buffer = self.buffers.get_or_create(candle.symbol)
+        previous = buffer.last_timestamp
+        if not buffer.push(candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume):
+            return None
+
+        last_closed = self._last_closed.get(candle.symbol, NO_TIMESTAMP)
+        if candle.closed:
+            closed = candle.timestamp
+        elif candle.timestamp > previous != NO_TIMESTAMP:
+            # Пришла свеча следующего бара - предыдущий окончателен
+            closed = previous
+        else:
+            return None
+
+        if closed <= last_closed:
+            return None
+        self._last_closed[candle.symbol] = closed
+        self.stats['bars_closed'] += 1
+        return closed
+
+    async def run(self, symbols: List[str]) -> None:
+        """
+        Прием потока до его окончания (или отмены задачи)
+
+        Args:
+            symbols: Символы
+        """
+        await self.warmup(symbols)
+        try:
+            async for candle in self.source.stream(symbols):
+                if self.ingest(candle) is None:
+                    continue
+                running = self._running.get(candle.symbol)
+                if running is not None and not self.coalesce:
+                    await asyncio.wait([running])
+                self._dispatch(candle.symbol)
+            while self._running:
+                await asyncio.wait(list(self._running.values()))
+        finally:
+            for task in self._running.values():
+                task.cancel()
+            await self.source.close()
+
+    def _dispatch(self, symbol: str) -> None:
+        """Запуск обработчика для символа или отметка о повторном запуске"""
+        if symbol in self._running:
+            self._pending.add(symbol)
+            self.stats['coalesced'] += 1
+            return
+        self._running[symbol] = asyncio.create_task(self._handle(symbol))
+
+    async def _handle(self, symbol: str) -> None:
+        """Вызов обработчика, пока по символу есть необработанные закрытия"""
+        try:
+            while True:
+                self._pending.discard(symbol)
+                try:
+                    async with self._semaphore:
+                        # Снимок берется при запуске: последний бар - закрытый
+                        candles = self.buffers.get(symbol).to_frame()
+                        if candles.index[-1].value > self._last_closed[symbol]:
+                            candles = candles.iloc[:-1]
+                        await self.on_bar_close(symbol, candles)
+                        self.stats['handled'] += 1
+                except Exception as e:
+                    logger.error(f"Bar close handler failed for {symbol}: {e}", exc_info=True)
+                if symbol not in self._pending:
+                    break
+        finally:
+            self._running.pop(symbol, None)
@@ -0,0 +1,292 @@
+"""
+Компактное представление свечей на структурированных массивах NumPy.
+
+Свеча - одна запись (timestamp int64 нс UTC, open/high/low/close/volume
+float64 или float32) без объектного индекса DataFrame. Свечи многих
+символов публикуются одним блоком multiprocessing.shared_memory: процессы
+анализа получают только небольшой дескриптор (SharedOHLCVHandle) и читают
+те же страницы памяти без копирования и pickle.
+"""
+
+import os
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.resampler import OHLCV_COLUMNS
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def ohlcv_dtype(float32: bool = False) -> np.dtype:
+    """
+    Тип записи свечи
+
+    Args:
+        float32: Хранить цены и объем в float32 (вдвое меньше памяти,
+            ~7 значащих цифр - достаточно для цен, но не для сумм объемов)
+
+    Returns:
+        np.dtype: Структурированный тип (timestamp, open, high, low, close, volume)
+    """
+    value = np.float32 if float32 else np.float64
+    return np.dtype([('timestamp', np.int64)] + [(name, value) for name in OHLCV_COLUMNS])
+
+
+class OHLCVArray:
+    """Свечи одного символа в структурированном массиве"""
+
+    def __init__(self, data: np.ndarray):
+        """
+        Инициализация
+
+        Args:
+            data: Структурированный массив с типом ohlcv_dtype()
+        """
+        if data.dtype.names != ('timestamp', *OHLCV_COLUMNS):
+            raise ValueError(f"Unexpected OHLCV dtype: {data.dtype}")
+        self.data = data
+
+    @classmethod
+    def from_frame(cls, candles: pd.DataFrame, float32: bool = False) -> 'OHLCVArray':
+        """
+        Создание из DataFrame
+
+        Args:
+            candles: Свечи с колонками open/high/low/close/volume и DatetimeIndex
+            float32: Хранить значения в float32
+
+        Returns:
+            OHLCVArray: Свечи
+        """
+        data = np.empty(len(candles), dtype=ohlcv_dtype(float32))
+        index = pd.DatetimeIndex(candles.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        data['timestamp'] = index.as_unit('ns').asi8
+        for name in OHLCV_COLUMNS:
+            data[name] = candles[name].to_numpy()
+        return cls(data)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Свечи в виде DataFrame (float64, индекс в UTC) для расчета индикаторов
+
+        Returns:
+            pd.DataFrame: Копия данных
+        """
+        index = pd.DatetimeIndex(self.data['timestamp'].astype('datetime64[ns]'), tz='UTC')
+        return pd.DataFrame(
+            {name: self.data[name].astype(np.float64) for name in OHLCV_COLUMNS},
+            index=index
+        )
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        """Колонка как представление массива (без копирования)"""
+        return self.data[field]
+
+    @property
+    def nbytes(self) -> int:
+        """Размер данных в байтах"""
+        return self.data.nbytes
+
+    @property
+    def float32(self) -> bool:
+        """Значения хранятся в float32"""
+        return self.data.dtype['close'] == np.float32
+
+
+class SharedOHLCVHandle(NamedTuple):
+    """Дескриптор опубликованных свечей (передается в дочерние процессы)"""
+
+    # Имя блока shared_memory
+    name: str
+    float32: bool
+    # Символ -> (первая запись, количество записей)
+    index: Dict[str, Tuple[int, int]]
+
+
+class SharedOHLCVBlock:
+    """
+    Свечи многих символов в одном блоке shared_memory (сторона владельца).
+    Владелец отвечает за unlink() после завершения читателей.
+    """
+
+    def __init__(self, arrays: Dict[str, OHLCVArray], float32: Optional[bool] = None):
+        """
+        Публикация свечей
+
+        Args:
+            arrays: Свечи по символам
+            float32: Тип значений блока (None - float32, только если все массивы в float32)
+        """
+        if float32 is None:
+            float32 = bool(arrays) and all(array.float32 for array in arrays.values())
+        dtype = ohlcv_dtype(float32)
+
+        index: Dict[str, Tuple[int, int]] = {}
+        total = 0
+        for symbol, array in arrays.items():
+            index[symbol] = (total, len(array))
+            total += len(array)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, total * dtype.itemsize))
+        records = np.ndarray((total,), dtype=dtype, buffer=self._shm.buf)
+        for symbol, array in arrays.items():
+            start, length = index[symbol]
+            records[start:start + length] = array.data.astype(dtype, copy=False)
+        del records
+
+        self.handle = SharedOHLCVHandle(self._shm.name, float32, index)
+        self.nbytes = total * dtype.itemsize
+        logger.info(f"Published {len(index)} symbols ({total} candles, {self.nbytes / 1e6:.1f} MB) to {self._shm.name}")
+
+    def close(self) -> None:
+        """Освобождение блока: отключение и удаление"""
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'SharedOHLCVBlock':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Процесс, в котором _attach сам запустил resource_tracker (до Python 3.13)
+_own_tracker_pid: Optional[int] = None
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Подключение к блоку без передачи его resource_tracker читателя (блоком владеет издатель)
+
+    На 3.13+ регистрацию отключает track=False. До 3.13 SharedMemory
+    регистрирует блок и у читателя:
+        - процессы пула анализа (spawn или fork) используют трекер
+          издателя: повторная регистрация там ничего не меняет, а
+          unregister снял бы регистрацию самого издателя;
+        - процесс, у которого трекера еще не было, не запущен издателем:
+          подключение запускает собственный трекер, который при выходе
+          удалил бы чужой блок, поэтому регистрация в нем снимается.
+    Независимый читатель, запустивший трекер раньше по другой причине,
+    до 3.13 не распознается и при выходе удалит блок.
+    """
+    global _own_tracker_pid
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    with _attach_lock:
+        if getattr(resource_tracker._resource_tracker, '_fd', None) is None:
+            _own_tracker_pid = os.getpid()
+        shm = shared_memory.SharedMemory(name=name)
+        # После fork pid другой: трекер унаследован от родителя
+        if _own_tracker_pid == os.getpid():
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class SharedOHLCVView:
+    """Чтение опубликованных свечей без копирования (сторона читателя)"""
+
+    def __init__(self, handle: SharedOHLCVHandle):
+        """
+        Подключение к блоку
+
+        Args:
+            handle: Дескриптор от SharedOHLCVBlock
+        """
+        self.handle = handle
+        self._shm = _attach(handle.name)
+        records = np.ndarray(
+            (sum(length for _, length in handle.index.values()),),
+            dtype=ohlcv_dtype(handle.float32),
+            buffer=self._shm.buf
+        )
+        records.flags.writeable = False
+        self._records: Optional[np.ndarray] = records
+
+    def get(self, symbol: str) -> Optional[OHLCVArray]:
+        """
+        Свечи символа (представление памяти блока, только чтение)
+
+        Args:
+            symbol: Символ актива
+
+        Returns:
+            Optional[OHLCVArray]: Свечи или None, если символ не опубликован
+        """
+        position = self.handle.index.get(symbol)
+        if position is None or self._records is None:
+            return None
+        start, length = position
+        return OHLCVArray(self._records[start:start + length])
+
+    def symbols(self) -> List[str]:
+        """
+        Опубликованные символы
+
+        Returns:
+            List[str]: Список символов
+        """
+        return list(self.handle.index)
+
+    def __iter__(self) -> Iterator[Tuple[str, OHLCVArray]]:
+        for symbol in self.handle.index:
+            yield symbol, self.get(symbol)
+
+    def close(self) -> None:
+        """
+        Отключение от блока
+
+        Представления, полученные через get(), после этого использовать нельзя.
+        """
+        self._records = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # Остались живые представления: память освободится вместе с ними
+            logger.warning(f"Shared OHLCV block {self.handle.name} still has exported views")
+
+    def __enter__(self) -> 'SharedOHLCVView':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_candles_csv(path: str, float32: bool = False) -> Dict[str, OHLCVArray]:
+    """
+    Чтение записанных свечей (формат ReplayCandleSource) по символам
+
+    Args:
+        path: CSV с колонками symbol,timestamp,open,high,low,close,volume
+        float32: Хранить значения в float32
+
+    Returns:
+        Dict[str, OHLCVArray]: Свечи по символам, отсортированные по времени
+    """
+    frame = pd.read_csv(path)
+    if pd.api.types.is_numeric_dtype(frame['timestamp']):
+        timestamps = pd.to_datetime(frame['timestamp'], unit='ms', utc=True)
+    else:
+        timestamps = pd.to_datetime(frame['timestamp'], utc=True)
+    frame = frame.drop(columns='timestamp').set_index(pd.DatetimeIndex(timestamps))
+
+    arrays = {}
+    for symbol, candles in frame.groupby('symbol', sort=False):
+        candles = candles.sort_index()
+        arrays[str(symbol)] = OHLCVArray.from_frame(candles[OHLCV_COLUMNS], float32=float32)
+    return arrays
@@ -0,0 +1,251 @@
+"""
+Построение старших таймфреймов (4h/1d/1w) из базового потока свечей.
+
+Свечи базового таймфрейма хранятся по каждому символу, а производные
+таймфреймы кэшируются по ключу (symbol, timeframe). При поступлении новых
+базовых свечей пересчитываются только затронутые бакеты - обычно это
+последний незакрытый бакет. Индексы свечей ожидаются в UTC.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+TIMEFRAMES: Dict[str, pd.Timedelta] = {
+    '1h': pd.Timedelta(hours=1),
+    '4h': pd.Timedelta(hours=4),
+    '1d': pd.Timedelta(days=1),
+    '1w': pd.Timedelta(weeks=1),
+}
+
+
+def bucket_start(index: pd.DatetimeIndex, timeframe: str) -> pd.DatetimeIndex:
+    """
+    Начало бакета таймфрейма для каждой метки времени
+
+    Недельные бакеты начинаются в понедельник 00:00, остальные
+    выравниваются по эпохе (4h: 00:00, 04:00, ...).
+
+    Args:
+        index: Метки времени свечей
+        timeframe: Таймфрейм ('1h', '4h', '1d', '1w')
+
+    Returns:
+        pd.DatetimeIndex: Начала бакетов
+    """
+    if timeframe == '1w':
+        days = index.normalize()
+        return days - pd.to_timedelta(days.dayofweek, unit='D')
+    return index.floor(TIMEFRAMES[timeframe])
+
+
+def resample_ohlcv(candles: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Агрегация свечей в старший таймфрейм
+
+    Args:
+        candles: Свечи с колонками open/high/low/close/volume
+        timeframe: Целевой таймфрейм
+
+    Returns:
+        pd.DataFrame: Свечи таймфрейма, индекс - начало бакета
+    """
+    if candles.empty:
+        return candles[OHLCV_COLUMNS].copy()
+
+    grouped = candles.groupby(bucket_start(candles.index, timeframe), sort=True)
+    result = grouped.agg({
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum',
+    })
+    result.index.name = candles.index.name
+    return result[OHLCV_COLUMNS]
+
+
+def resample_closed(candles: pd.DataFrame, timeframe: str, base_timeframe: str = '1h') -> pd.DataFrame:
+    """
+    Закрытые свечи старшего таймфрейма по завершенному ряду базовых свечей
+
+    Последний бакет отбрасывается, если базовые свечи не покрывают его
+    целиком (например, день, в котором есть свечи только до 15:00).
+
+    Args:
+        candles: Закрытые свечи базового таймфрейма
+        timeframe: Целевой таймфрейм
+        base_timeframe: Таймфрейм candles
+
+    Returns:
+        pd.DataFrame: Свечи таймфрейма
+    """
+    if timeframe == base_timeframe or candles.empty:
+        return candles
+    result = resample_ohlcv(candles, timeframe)
+    covered_until = candles.index[-1] + TIMEFRAMES[base_timeframe]
+    if result.index[-1] + TIMEFRAMES[timeframe] > covered_until:
+        result = result.iloc[:-1]
+    return result
+
+
+class TimeframeResampler:
+    """Инкрементальный ресемплер с кэшем по (symbol, timeframe)"""
+
+    def __init__(self, base_timeframe: str = '1h', max_candles: int = 5000):
+        """
+        Инициализация ресемплера
+
+        Args:
+            base_timeframe: Таймфрейм входящих свечей
+            max_candles: Сколько последних свечей хранить на каждом таймфрейме
+        """
+        if base_timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unsupported base timeframe: {base_timeframe}")
+
+        self.base_timeframe = base_timeframe
+        self.max_candles = max_candles
+        self._base: Dict[str, pd.DataFrame] = {}
+        self._cache: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, candles: pd.DataFrame) -> None:
+        """
+        Добавление новых (или обновленных) свечей базового таймфрейма
+
+        Свечи с уже известными метками времени заменяют сохраненные,
+        так что повторная загрузка незакрытой свечи безопасна.
+
+        Args:
+            symbol: Символ актива
+            candles: Свечи базового таймфрейма
+        """
+        if candles.empty:
+            return
+
+        candles = candles[OHLCV_COLUMNS].sort_index()
+        first_changed = candles.index[0]
+
+        with self._lock:
+            base = self._base.get(symbol)
+            if base is None or base.empty:
+                merged = candles
+            elif first_changed > base.index[-1]:
+                merged = pd.concat([base, candles])
+            else:
+                merged = pd.concat([base, candles])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+            merged = merged.iloc[-self.max_candles:]
+            self._base[symbol] = merged
+
+            for (cached_symbol, timeframe), cached in list(self._cache.items()):
+                if cached_symbol != symbol:
+                    continue
+                self._cache[(symbol, timeframe)] = self._refresh(merged, cached, timeframe, first_changed)
+
+    def get(
+        self,
+        symbol: str,
+        timeframe: str,
+        closed_only: bool = False,
+        now: Optional[pd.Timestamp] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Свечи символа на заданном таймфрейме без обращения к источнику данных
+
+        Args:
+            symbol: Символ актива
+            timeframe: Таймфрейм ('1h', '4h', '1d', '1w')
+            closed_only: Отбросить последний незакрытый бакет
+            now: Текущее время для проверки закрытия бакета
+                (по умолчанию - системное время в UTC; задается при реплее)
+
+        Returns:
+            Optional[pd.DataFrame]: Свечи или None, если по символу нет данных
+        """
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+        if TIMEFRAMES[timeframe] < TIMEFRAMES[self.base_timeframe]:
+            raise ValueError(f"Timeframe {timeframe} is lower than base {self.base_timeframe}")
+
+        with self._lock:
+            base = self._base.get(symbol)
+            if base is None:
+                return None
+
+            if timeframe == self.base_timeframe:
+                result = base
+            else:
+                result = self._cache.get((symbol, timeframe))
+                if result is None:
+                    result = resample_ohlcv(base, timeframe).iloc[-self.max_candles:]
+                    self._cache[(symbol, timeframe)] = result
+
+            if closed_only and not result.empty and not self._is_closed(result.index[-1], timeframe, now):
+                result = result.iloc[:-1]
+
+        return result
+
+    def symbols(self) -> List[str]:
+        """
+        Символы, по которым есть базовые свечи
+
+        Returns:
+            List[str]: Список символов
+        """
+        with self._lock:
+            return list(self._base)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """
+        Очистка данных символа (или всех символов)
+
+        Args:
+            symbol: Символ актива (None - все)
+        """
+        with self._lock:
+            if symbol is None:
+                self._base.clear()
+                self._cache.clear()
+                return
+            self._base.pop(symbol, None)
+            for key in [key for key in self._cache if key[0] == symbol]:
+                del self._cache[key]
+
+    def _refresh(
+        self,
+        base: pd.DataFrame,
+        cached: pd.DataFrame,
+        timeframe: str,
+        first_changed: pd.Timestamp
+    ) -> pd.DataFrame:
+        """Пересчет бакетов, начиная с бакета первой измененной свечи"""
+        first_bucket = bucket_start(pd.DatetimeIndex([first_changed]), timeframe)[0]
+        if first_bucket < base.index[0]:
+            # Бакет частично вытеснен из базового окна - оставляем сохраненный
+            first_bucket = cached.index[-1] if not cached.empty else base.index[0]
+
+        unchanged = cached[cached.index < first_bucket]
+        recomputed = resample_ohlcv(base[base.index >= first_bucket], timeframe)
+        return pd.concat([unchanged, recomputed]).iloc[-self.max_candles:]
+
+    @staticmethod
+    def _is_closed(bucket: pd.Timestamp, timeframe: str, now: Optional[pd.Timestamp]) -> bool:
+        """Бакет закрыт, если его интервал полностью в прошлом"""
+        if now is None:
+            now = pd.Timestamp.now(tz='UTC')
+            if bucket.tz is None:
+                now = now.tz_localize(None)
+        return bucket + TIMEFRAMES[timeframe] <= now
+
+
+# Глобальный ресемплер для использования в приложении
+resampler = TimeframeResampler()
@@ -0,0 +1,161 @@
+"""
+Кольцевые буферы свечей фиксированного размера на NumPy.
+
+Каждый символ хранит последние N свечей в заранее выделенных массивах:
+добавление свечи - запись в одну позицию без копирования истории,
+поэтому поток обновлений не создает новых DataFrame на каждый тик.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.resampler import OHLCV_COLUMNS
+
+# Метка "свечей еще не было"
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+
+class CandleRingBuffer:
+    """Последние N свечей одного символа"""
+
+    def __init__(self, capacity: int):
+        """
+        Инициализация буфера
+
+        Args:
+            capacity: Максимальное количество хранимых свечей
+        """
+        if capacity < 2:
+            raise ValueError("Ring buffer capacity must be at least 2")
+
+        self.capacity = capacity
+        # Время открытия свечи, нс с эпохи (UTC)
+        self._timestamps = np.full(capacity, NO_TIMESTAMP, dtype=np.int64)
+        # open, high, low, close, volume
+        self._values = np.zeros((capacity, len(OHLCV_COLUMNS)), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> int:
+        """Время открытия последней свечи (NO_TIMESTAMP для пустого буфера)"""
+        if self._size == 0:
+            return NO_TIMESTAMP
+        return int(self._timestamps[(self._head - 1) % self.capacity])
+
+    def push(self, timestamp: int, open_: float, high: float, low: float, close: float, volume: float) -> bool:
+        """
+        Добавление новой или обновление последней свечи
+
+        Args:
+            timestamp: Время открытия свечи, нс с эпохи (UTC)
+            open_: Цена открытия
+            high: Максимум
+            low: Минимум
+            close: Цена закрытия
+            volume: Объем
+
+        Returns:
+            bool: True, если свеча принята (новая или обновление последней);
+                False для свечи старше последней
+        """
+        last = self.last_timestamp
+        if timestamp < last:
+            return False
+
+        if timestamp == last:
+            position = (self._head - 1) % self.capacity
+        else:
+            position = self._head
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+        self._timestamps[position] = timestamp
+        self._values[position] = (open_, high, low, close, volume)
+        return True
+
+    def extend(self, candles: pd.DataFrame) -> None:
+        """
+        Загрузка истории (например, при прогреве)
+
+        Args:
+            candles: Свечи с колонками open/high/low/close/volume и индексом в UTC
+        """
+        if candles.empty:
+            return
+        index = candles.index
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        timestamps = index.as_unit('ns').asi8
+        values = candles[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        for timestamp, row in zip(timestamps, values):
+            self.push(int(timestamp), *row)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Свечи буфера в хронологическом порядке
+
+        Returns:
+            pd.DataFrame: Свечи с индексом в UTC
+        """
+        order = (np.arange(self._head - self._size, self._head)) % self.capacity
+        index = pd.DatetimeIndex(self._timestamps[order].astype('datetime64[ns]'), tz='UTC')
+        return pd.DataFrame(self._values[order], index=index, columns=OHLCV_COLUMNS)
+
+
+class CandleBufferStore:
+    """Кольцевые буферы по символам"""
+
+    def __init__(self, capacity: int):
+        """
+        Инициализация хранилища
+
+        Args:
+            capacity: Размер буфера каждого символа
+        """
+        self.capacity = capacity
+        self._buffers: Dict[str, CandleRingBuffer] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[CandleRingBuffer]:
+        """
+        Буфер символа
+
+        Args:
+            symbol: Символ актива
+
+        Returns:
+            Optional[CandleRingBuffer]: Буфер или None, если свечей не было
+        """
+        return self._buffers.get(symbol)
+
+    def get_or_create(self, symbol: str) -> CandleRingBuffer:
+        """
+        Буфер символа (создается при первом обращении)
+
+        Args:
+            symbol: Символ актива
+
+        Returns:
+            CandleRingBuffer: Буфер
+        """
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.setdefault(symbol, CandleRingBuffer(self.capacity))
+        return buffer
+
+    def symbols(self) -> List[str]:
+        """
+        Символы, по которым есть буферы
+
+        Returns:
+            List[str]: Список символов
+        """
+        return list(self._buffers)
@@ -0,0 +1,139 @@
+"""
+Универсум отслеживаемых символов с метаданными.
+
+Источник правды - таблица universe_symbols. Ее заполняют из файла
+(UNIVERSE_FILE, CSV или JSON) или, если файл не задан, из списков
+CRYPTO_SYMBOLS/STOCK_SYMBOLS/ETF_SYMBOLS.
+
+CSV: заголовок с колонками symbol,asset_type и опционально name,exchange,sector,enabled.
+JSON: список объектов с теми же ключами.
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ASSET_TYPES = ('crypto', 'stock', 'etf')
+
+
+def _normalize_entry(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Проверка и приведение записи файла универсума"""
+    symbol = str(raw.get('symbol') or '').strip()
+    if not symbol:
+        return None
+
+    asset_type = str(raw.get('asset_type') or '').strip().lower() or Config.get_asset_type(symbol)
+    if asset_type not in ASSET_TYPES:
+        logger.warning(f"Unknown asset type {asset_type!r} for {symbol}, skipping")
+        return None
+
+    enabled = str(raw.get('enabled', 'true')).strip().lower() not in ('0', 'false', 'no')
+    if not enabled:
+        return None
+
+    return {
+        'symbol': symbol,
+        'asset_type': asset_type,
+        'name': (raw.get('name') or None),
+        'exchange': (raw.get('exchange') or None),
+        'sector': (raw.get('sector') or None),
+    }
+
+
+def load_universe_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Чтение универсума из файла
+
+    Args:
+        path: Путь к CSV или JSON
+
+    Returns:
+        List[Dict[str, Any]]: Включенные символы с метаданными (без дублей)
+    """
+    with open(path, newline='') as f:
+        if os.path.splitext(path)[1].lower() == '.json':
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for raw in rows:
+        entry = _normalize_entry(raw)
+        if entry is not None:
+            entries[entry['symbol']] = entry
+    return list(entries.values())
+
+
+def default_universe() -> List[Dict[str, Any]]:
+    """
+    Универсум из списков символов в Config
+
+    Returns:
+        List[Dict[str, Any]]: Символы с типом актива
+    """
+    entries = []
+    for asset_type, symbols in (
+        ('crypto', Config.CRYPTO_SYMBOLS),
+        ('stock', Config.STOCK_SYMBOLS),
+        ('etf', Config.ETF_SYMBOLS),
+    ):
+        entries.extend(
+            {'symbol': symbol.strip(), 'asset_type': asset_type}
+            for symbol in symbols if symbol.strip()
+        )
+    return entries
+
+
+def sync_universe(path: Optional[str] = None) -> int:
+    """
+    Заполнение universe_symbols из файла (или списков Config)
+
+    Args:
+        path: Путь к файлу (по умолчанию UNIVERSE_FILE)
+
+    Returns:
+        int: Количество символов в универсуме
+    """
+    from src.database.repository import universe_repository
+
+    path = path or Config.UNIVERSE_FILE
+    entries = load_universe_file(path) if path else default_universe()
+    universe_repository.sync_symbols(entries)
+    _asset_types.clear()
+    return len(entries)
+
+
+# Кэш типов активов процесса (символ -> тип)
+_asset_types: Dict[str, str] = {}
+_asset_types_lock = threading.Lock()
+
+
+def get_asset_type(symbol: str) -> str:
+    """
+    Тип актива символа по метаданным универсума
+
+    Args:
+        symbol: Символ актива
+
+    Returns:
+        str: 'crypto', 'stock' или 'etf' (для неизвестных символов - по спискам Config)
+    """
+    asset_type = _asset_types.get(symbol)
+    if asset_type is not None:
+        return asset_type
+
+    from src.database.repository import universe_repository
+
+    with _asset_types_lock:
+        if symbol not in _asset_types:
+            # Символ мог появиться после загрузки кэша - перечитываем таблицу
+            _asset_types.update(universe_repository.get_asset_types())
+        asset_type = _asset_types.setdefault(symbol, Config.get_asset_type(symbol))
+    return asset_type
@@ -0,0 +1,294 @@
+"""
+Легковесные миграции схемы БД.
+
+create_all() создает только отсутствующие таблицы, поэтому новые колонки
+существующих таблиц добавляются здесь через ALTER TABLE, а разовые
+переносы данных выполняются идемпотентными функциями.
+"""
+
+import json
+from typing import Optional
+
+from sqlalchemy import Engine, MetaData, case, func, inspect, insert, select, text
+from sqlalchemy.schema import Column, CreateTable
+from src.database.models import Base, Signal, SignalArchive, SignalDailyStats, SignalSymbolStats
+from src.database.snapshot import SNAPSHOT_MAGIC, encode_snapshot
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _add_column(engine: Engine, table_name: str, column: Column) -> None:
+    """
+    Добавление колонки в существующую таблицу
+
+    Args:
+        engine: Движок SQLAlchemy
+        table_name: Имя таблицы
+        column: Описание колонки из модели
+    """
+    column_type = column.type.compile(dialect=engine.dialect)
+    ddl = f'ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}'
+    with engine.begin() as connection:
+        connection.exec_driver_sql(ddl)
+    logger.info(f"Added column {table_name}.{column.name}")
+
+
+def add_missing_columns(engine: Engine) -> None:
+    """
+    Добавление nullable-колонок, появившихся в моделях после создания таблиц
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable:
+                logger.warning(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} automatically"
+                )
+                continue
+            _add_column(engine, table.name, column)
+
+
+def rebuild_signals_autoincrement(engine: Engine) -> None:
+    """
+    Пересоздание signals с AUTOINCREMENT в SQLite
+
+    sqlite_autoincrement действует только при создании таблицы. Без него
+    SQLite выдает max(rowid) + 1 и после переноса последних сигналов в
+    архив повторно использует их id, которые уже есть в signals_archive.
+    Счетчик sqlite_sequence выставляется не ниже максимального id обеих таблиц.
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    # pysqlite сам начинает транзакцию только перед DML, а DDL выполняет
+    # в autocommit: без явного BEGIN сбой копирования оставил бы
+    # signals_rebuilt в базе. Драйвер переводится в autocommit, а
+    # транзакцией управляют BEGIN/COMMIT.
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+        connection.exec_driver_sql("BEGIN")
+        try:
+            ddl = connection.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'signals'"
+            ).scalar()
+            if ddl is None:
+                connection.exec_driver_sql("ROLLBACK")
+                return
+
+            if 'AUTOINCREMENT' not in ddl.upper():
+                existing = {column['name'] for column in inspect(connection).get_columns('signals')}
+                columns = ', '.join(column.name for column in Signal.__table__.columns if column.name in existing)
+
+                rebuilt = Signal.__table__.to_metadata(MetaData(), name='signals_rebuilt')
+                # Остаток прерванного обновления
+                connection.exec_driver_sql("DROP TABLE IF EXISTS signals_rebuilt")
+                connection.execute(CreateTable(rebuilt))
+                connection.exec_driver_sql(
+                    f"INSERT INTO signals_rebuilt ({columns}) SELECT {columns} FROM signals"
+                )
+                # Индексы удаляются вместе со старой таблицей и создаются заново в ensure_indexes
+                connection.exec_driver_sql("DROP TABLE signals")
+                connection.exec_driver_sql("ALTER TABLE signals_rebuilt RENAME TO signals")
+                logger.info("Rebuilt signals table with AUTOINCREMENT")
+
+            last_id = connection.exec_driver_sql(
+                "SELECT max(coalesce((SELECT max(id) FROM signals), 0), "
+                "coalesce((SELECT max(id) FROM signals_archive), 0))"
+            ).scalar() if 'signals_archive' in inspect(connection).get_table_names() else None
+            if last_id:
+                connection.exec_driver_sql(
+                    "UPDATE sqlite_sequence SET seq = :last_id WHERE name = 'signals' AND seq < :last_id",
+                    {'last_id': last_id}
+                )
+                connection.exec_driver_sql(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT 'signals', :last_id "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'signals')",
+                    {'last_id': last_id}
+                )
+        except Exception:
+            connection.exec_driver_sql("ROLLBACK")
+            raise
+        connection.exec_driver_sql("COMMIT")
+
+
+def ensure_indexes(engine: Engine) -> None:
+    """
+    Создание индексов, объявленных в моделях, на существующих таблицах
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    # Одиночный индекс по symbol заменен составным (symbol, created_at, id)
+    inspector = inspect(engine)
+    if 'signals' in inspector.get_table_names() and any(
+        index['name'] == 'ix_signals_symbol' for index in inspector.get_indexes('signals')
+    ):
+        # MySQL требует имя таблицы в DROP INDEX
+        on_table = ' ON signals' if engine.dialect.name in ('mysql', 'mariadb') else ''
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'DROP INDEX ix_signals_symbol{on_table}')
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def backfill_signal_daily_stats(engine: Engine) -> None:
+    """
+    Заполнение signal_daily_stats по уже существующим сигналам.
+    Выполняется один раз, пока агрегатная таблица пуста.
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    with engine.begin() as connection:
+        has_stats = connection.execute(select(SignalDailyStats.id).limit(1)).first()
+        has_signals = connection.execute(select(Signal.id).limit(1)).first()
+        if has_stats or not has_signals:
+            return
+
+        day = func.date(Signal.created_at)
+        closed = Signal.closed_at.isnot(None)
+        source = select(
+            Signal.symbol,
+            day,
+            func.count(),
+            func.sum(Signal.confidence),
+            func.sum(case((closed, 1), else_=0)),
+            func.sum(case((Signal.outcome == 'win', 1), else_=0)),
+        ).group_by(Signal.symbol, day)
+
+        connection.execute(
+            insert(SignalDailyStats).from_select(
+                ['symbol', 'day', 'signals_count', 'confidence_sum', 'closed_count', 'wins_count'],
+                source
+            )
+        )
+    logger.info("Backfilled signal_daily_stats from existing signals")
+
+
+def backfill_signal_symbol_stats(engine: Engine) -> None:
+    """
+    Заполнение накопительных итогов signal_symbol_stats по signal_daily_stats.
+    Выполняется один раз, пока таблица итогов пуста.
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    with engine.begin() as connection:
+        has_totals = connection.execute(select(SignalSymbolStats.id).limit(1)).first()
+        has_daily = connection.execute(select(SignalDailyStats.id).limit(1)).first()
+        if has_totals or not has_daily:
+            return
+
+        counters = ['signals_count', 'confidence_sum', 'closed_count', 'wins_count']
+        source = select(
+            SignalDailyStats.symbol,
+            *[func.sum(SignalDailyStats.__table__.c[name]) for name in counters]
+        ).group_by(SignalDailyStats.symbol)
+        connection.execute(insert(SignalSymbolStats).from_select(['symbol'] + counters, source))
+    logger.info("Backfilled signal_symbol_stats from signal_daily_stats")
+
+
+def _legacy_indicators_filter(engine: Engine) -> Optional[str]:
+    """
+    SQL-условие для строк, где indicators_data еще хранится как JSON
+
+    Args:
+        engine: Движок SQLAlchemy
+
+    Returns:
+        Optional[str]: Условие WHERE или None, если для СУБД оно не задано
+    """
+    if engine.dialect.name == 'sqlite':
+        return "typeof(indicators_data) = 'text'"
+    if engine.dialect.name == 'postgresql':
+        return f"get_byte(indicators_data, 0) <> {SNAPSHOT_MAGIC}"
+    return None
+
+
+def migrate_indicators_to_snapshots(engine: Engine, batch_size: int = 500) -> None:
+    """
+    Перевод indicators_data из JSON в бинарный снимок (src.database.snapshot)
+
+    Args:
+        engine: Движок SQLAlchemy
+        batch_size: Размер пачки
+    """
+    condition = _legacy_indicators_filter(engine)
+    if condition is None:
+        # Строки JSON-формата по-прежнему читаются (IndicatorSnapshotType), только не сжимаются
+        logger.warning(
+            f"Converting indicators_data to snapshots is not supported for {engine.dialect.name}, skipping"
+        )
+        return
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in (Signal.__table__, SignalArchive.__table__):
+        if table.name not in existing_tables:
+            continue
+
+        if engine.dialect.name == 'postgresql':
+            column = next(c for c in inspector.get_columns(table.name) if c['name'] == 'indicators_data')
+            if column['type'].__class__.__name__ in ('JSON', 'JSONB'):
+                with engine.begin() as connection:
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ALTER COLUMN indicators_data TYPE bytea "
+                        f"USING convert_to(indicators_data::text, 'UTF8')"
+                    )
+
+        select_legacy = text(
+            f"SELECT id, indicators_data FROM {table.name} WHERE {condition} ORDER BY id LIMIT :limit"
+        )
+        update_row = text(f"UPDATE {table.name} SET indicators_data = :data WHERE id = :id")
+
+        migrated = 0
+        while True:
+            with engine.begin() as connection:
+                rows = connection.execute(select_legacy, {'limit': batch_size}).all()
+                if not rows:
+                    break
+
+                params = []
+                for row_id, raw in rows:
+                    if isinstance(raw, (bytes, bytearray, memoryview)):
+                        raw = bytes(raw).decode('utf-8')
+                    params.append({'id': row_id, 'data': encode_snapshot(json.loads(raw))})
+                connection.execute(update_row, params)
+                migrated += len(rows)
+
+        if migrated:
+            logger.info(f"Converted indicators_data to snapshots in {table.name}: {migrated} rows")
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Применение всех миграций
+
+    Args:
+        engine: Движок SQLAlchemy
+    """
+    rebuild_signals_autoincrement(engine)
+    add_missing_columns(engine)
+    ensure_indexes(engine)
+    migrate_indicators_to_snapshots(engine)
+    backfill_signal_daily_stats(engine)
+    backfill_signal_symbol_stats(engine)
+    logger.info("Database migrations applied successfully")
@@ -2,10 +2,13 @@
 Модели базы данных SQLAlchemy.
 """
 
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import BigInteger, Boolean, String, Integer, Float, DateTime, JSON, Text
+from datetime import date, datetime
+from typing import Any, Mapping, Optional
+from sqlalchemy import (
+    BigInteger, Boolean, String, Integer, Float, Date, DateTime, Index, Text, UniqueConstraint
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from src.database.snapshot import IndicatorSnapshotType
 
 
 class Base(DeclarativeBase):
@@ -36,18 +39,16 @@ class User(Base):
         return f"<User(id={self.id}, telegram_id={self.telegram_id}, username={self.username})>"
 
 
-class Signal(Base):
-    """Модель торгового сигнала"""
-
-    __tablename__ = 'signals'
+class SignalFieldsMixin:
+    """Общие колонки сигнала для рабочей и архивной таблиц"""
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
     asset_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'crypto', 'stock', 'etf'
     signal_type: Mapped[str] = mapped_column(String(10), nullable=False)  # 'BUY' or 'SELL'
     price: Mapped[float] = mapped_column(Float, nullable=False)
     confidence: Mapped[int] = mapped_column(Integer, nullable=False)  # 60-100
-    indicators_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    indicators_data: Mapped[Mapping[str, Any]] = mapped_column(IndicatorSnapshotType, nullable=False)
     stop_loss: Mapped[float] = mapped_column(Float, nullable=False)
     take_profit_1: Mapped[float] = mapped_column(Float, nullable=False)
     take_profit_2: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -55,11 +56,198 @@ class Signal(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     sent_to_users: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    exit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    outcome: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # 'win', 'loss'
+    # Лидер группы коррелированных сигналов: сигнал не рассылается отдельно,
+    # а показывается в сообщении лидера
+    group_leader_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Сработавшие условия алгоритма через запятую (для текста сообщения)
+    fired_conditions: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+
+class Signal(SignalFieldsMixin, Base):
+    """Модель торгового сигнала"""
+
+    __tablename__ = 'signals'
+    # Без AUTOINCREMENT SQLite может повторно выдать id, уже ушедший в архив
+    __table_args__ = {'sqlite_autoincrement': True}
 
     def __repr__(self) -> str:
         return f"<Signal(id={self.id}, symbol={self.symbol}, type={self.signal_type}, confidence={self.confidence})>"
 
 
+# Неотправленные активные сигналы: частичный индекс остается маленьким
+# независимо от размера истории
+_unsent_filter = (Signal.sent_to_users == False) & (Signal.is_active == True)
+Index(
+    'ix_signals_unsent',
+    Signal.created_at,
+    Signal.id,
+    sqlite_where=_unsent_filter,
+    postgresql_where=_unsent_filter
+)
+# Keyset-пагинация истории
+Index('ix_signals_created_at_id', Signal.created_at, Signal.id)
+Index('ix_signals_symbol_created_at_id', Signal.symbol, Signal.created_at, Signal.id)
+# Выборка для архивации по времени закрытия
+Index('ix_signals_closed_at_id', Signal.closed_at, Signal.id)
+
+
+class SignalArchive(SignalFieldsMixin, Base):
+    """Архив закрытых сигналов, перенесенных из signals по сроку хранения"""
+
+    __tablename__ = 'signals_archive'
+    __table_args__ = (
+        Index('ix_signals_archive_created_at_id', 'created_at', 'id'),
+        Index('ix_signals_archive_symbol_created_at_id', 'symbol', 'created_at', 'id'),
+    )
+
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SignalArchive(id={self.id}, symbol={self.symbol}, type={self.signal_type})>"
+
+
+class SignalDailyStats(Base):
+    """
+    Агрегированная статистика сигналов по символу за день.
+    Обновляется инкрементально при создании и закрытии сигналов.
+    """
+
+    __tablename__ = 'signal_daily_stats'
+    __table_args__ = (
+        UniqueConstraint('symbol', 'day', name='uq_signal_daily_stats_symbol_day'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    signals_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    confidence_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    closed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    wins_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    @property
+    def avg_confidence(self) -> Optional[float]:
+        """Средняя уверенность сигналов за день"""
+        return self.confidence_sum / self.signals_count if self.signals_count else None
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        """Доля прибыльных сигналов среди закрытых"""
+        return self.wins_count / self.closed_count if self.closed_count else None
+
+    def __repr__(self) -> str:
+        return f"<SignalDailyStats(symbol={self.symbol}, day={self.day}, signals={self.signals_count})>"
+
+
+class SignalSymbolStats(Base):
+    """
+    Накопительная статистика сигналов по символу за все время.
+    Обновляется вместе с signal_daily_stats, поэтому сводка за все время
+    читается без суммирования дневной истории.
+    """
+
+    __tablename__ = 'signal_symbol_stats'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
+    signals_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    confidence_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    closed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    wins_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SignalSymbolStats(symbol={self.symbol}, signals={self.signals_count})>"
+
+
+class UniverseSymbol(Base):
+    """
+    Символ отслеживаемого универсума с метаданными и состоянием сканирования.
+    Уровень (tier) определяет частоту анализа: 0 - самые активные символы.
+    """
+
+    __tablename__ = 'universe_symbols'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
+    asset_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'crypto', 'stock', 'etf'
+    name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    exchange: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    sector: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    tier: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Метрики активности по последнему сканированию
+    volatility: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    volume_ratio: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    last_scanned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UniverseSymbol(symbol={self.symbol}, asset_type={self.asset_type}, tier={self.tier})>"
+
+
+class SymbolCorrelation(Base):
+    """
+    Корреляция доходностей пары символов за скользящее окно.
+    Хранятся только пары с заметной корреляцией, symbol < other_symbol.
+    """
+
+    __tablename__ = 'symbol_correlations'
+    __table_args__ = (
+        UniqueConstraint('symbol', 'other_symbol', name='uq_symbol_correlations_pair'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    other_symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    correlation: Mapped[float] = mapped_column(Float, nullable=False)
+    observations: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SymbolCorrelation({self.symbol}/{self.other_symbol}={self.correlation:.2f})>"
+
+
+class SignalDelivery(Base):
+    """
+    Задание доставки сигнала одному получателю (outbox).
+    Отправители забирают задания пачками с арендой (lease) и
+    подтверждают отправку тем же lease_token.
+    """
+
+    __tablename__ = 'signal_deliveries'
+    __table_args__ = (
+        UniqueConstraint('signal_id', 'telegram_id', name='uq_signal_deliveries_signal_recipient'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    signal_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(10), default='pending', nullable=False)  # 'pending', 'sent', 'failed'
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_token: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<SignalDelivery(id={self.id}, signal_id={self.signal_id}, telegram_id={self.telegram_id}, status={self.status})>"
+
+
+# Очередь на отправку: частичный индекс только по ожидающим заданиям
+_pending_filter = SignalDelivery.status == 'pending'
+Index(
+    'ix_signal_deliveries_pending',
+    SignalDelivery.id,
+    sqlite_where=_pending_filter,
+    postgresql_where=_pending_filter
+)
+
+
 class Position(Base):
     """
     Модель позиции пользователя (опционально, для будущего использования)
@@ -3,11 +3,18 @@
 Реализует паттерн Repository для абстракции работы с БД.
 """
 
-from typing import List, Optional
-from datetime import datetime
-from sqlalchemy import create_engine, select
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
+from sqlalchemy import (
+    and_, bindparam, create_engine, delete, func, insert, literal, or_, select, tuple_, union_all, update
+)
 from sqlalchemy.orm import sessionmaker, Session
-from src.database.models import Base, User, Signal
+from src.database.migrations import run_migrations
+from src.database.models import (
+    Base, User, Signal, SignalArchive, SignalDailyStats, SignalDelivery, SignalSymbolStats, SymbolCorrelation,
+    UniverseSymbol
+)
 from src.utils.config import Config
 from src.utils.logger import setup_logger
 
@@ -24,13 +31,19 @@ class Database:
         Args:
             database_url: URL подключения к базе данных
         """
-        self.engine = create_engine(database_url, echo=False)
+        connect_args = {}
+        if database_url.startswith('sqlite'):
+            # Несколько процессов (бот, worker, отправители) пишут в один файл:
+            # ждем освобождения блокировки вместо немедленной ошибки
+            connect_args['timeout'] = 30
+        self.engine = create_engine(database_url, echo=False, connect_args=connect_args)
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
         logger.info(f"Database connection initialized: {database_url.split('@')[0]}")
 
     def create_tables(self) -> None:
         """Создание всех таблиц в БД"""
         Base.metadata.create_all(self.engine)
+        run_migrations(self.engine)
         logger.info("Database tables created successfully")
 
     def get_session(self) -> Session:
@@ -201,15 +214,83 @@ class UserRepository:
         """
         session = self.db.get_session()
         try:
-            stmt = select(User).where(User.subscribed == True)
-            result = session.execute(stmt).scalars().all()
-            return len(list(result))
+            stmt = select(func.count()).select_from(User).where(User.subscribed == True)
+            return session.execute(stmt).scalar_one()
         except Exception as e:
             logger.error(f"Error getting subscribed users count: {e}")
             raise
         finally:
             session.close()
 
+    def get_users_count(self) -> int:
+        """
+        Получение общего количества пользователей
+
+        Returns:
+            int: Количество пользователей
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(func.count()).select_from(User)
+            return session.execute(stmt).scalar_one()
+        except Exception as e:
+            logger.error(f"Error getting users count: {e}")
+            raise
+        finally:
+            session.close()
+
+
+def _upsert_counters(session: Session, model: type, keys: Dict[str, Any], increments: Dict[str, int]) -> None:
+    """
+    Атомарное увеличение счетчиков строки агрегатной таблицы (upsert)
+
+    Args:
+        session: Сессия SQLAlchemy (изменения фиксирует вызывающий код)
+        model: Модель агрегатной таблицы
+        keys: Значения уникального ключа строки
+        increments: Приращения счетчиков
+    """
+    dialect = session.get_bind().dialect.name
+    table = model.__table__
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).values(**keys, **increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in keys],
+            set_={name: table.c[name] + value for name, value in increments.items()}
+        )
+        session.execute(stmt)
+        return
+
+    # Прочие СУБД: select + update в рамках текущей транзакции
+    stmt = select(model).filter_by(**keys).with_for_update()
+    row = session.execute(stmt).scalar_one_or_none()
+    if row is None:
+        row = model(**keys, signals_count=0, confidence_sum=0, closed_count=0, wins_count=0)
+        session.add(row)
+    for name, value in increments.items():
+        setattr(row, name, getattr(row, name) + value)
+
+
+def _increment_daily_stats(session: Session, symbol: str, day: date, **increments: int) -> None:
+    """
+    Атомарное увеличение счетчиков в signal_daily_stats и накопительных
+    итогов символа в signal_symbol_stats (в одной транзакции)
+
+    Args:
+        session: Сессия SQLAlchemy (изменения фиксирует вызывающий код)
+        symbol: Символ актива
+        day: День создания сигнала
+        **increments: Приращения счетчиков (signals_count=1, ...)
+    """
+    _upsert_counters(session, SignalDailyStats, {'symbol': symbol, 'day': day}, increments)
+    _upsert_counters(session, SignalSymbolStats, {'symbol': symbol}, increments)
+
 
 class SignalRepository:
     """Репозиторий для работы с сигналами"""
@@ -234,7 +315,8 @@ class SignalRepository:
         stop_loss: float,
         take_profit_1: float,
         take_profit_2: Optional[float],
-        max_hold_days: int
+        max_hold_days: int,
+        fired_conditions: Optional[str] = None
     ) -> Signal:
         """
         Создание нового сигнала
@@ -250,6 +332,7 @@ class SignalRepository:
             take_profit_1: Первая цель
             take_profit_2: Вторая цель
             max_hold_days: Максимальное время удержания
+            fired_conditions: Сработавшие условия через запятую
 
         Returns:
             Signal: Созданный сигнал
@@ -266,9 +349,18 @@ class SignalRepository:
                 stop_loss=stop_loss,
                 take_profit_1=take_profit_1,
                 take_profit_2=take_profit_2,
-                max_hold_days=max_hold_days
+                max_hold_days=max_hold_days,
+                fired_conditions=fired_conditions
             )
             session.add(signal)
+            session.flush()
+            _increment_daily_stats(
+                session,
+                symbol,
+                signal.created_at.date(),
+                signals_count=1,
+                confidence_sum=confidence
+            )
             session.commit()
             session.refresh(signal)
             logger.info(f"Created new signal: {symbol} {signal_type} at ${price}")
@@ -280,6 +372,46 @@ class SignalRepository:
         finally:
             session.close()
 
+    def create_signals(self, signals: List[Dict[str, Any]]) -> List[Signal]:
+        """
+        Создание пакета сигналов одной транзакцией
+
+        Счетчики signal_daily_stats увеличиваются одним upsert на пару
+        (символ, день), а не на каждый сигнал.
+
+        Args:
+            signals: Аргументы сигналов (как у create_signal)
+
+        Returns:
+            List[Signal]: Созданные сигналы
+        """
+        if not signals:
+            return []
+
+        session = self.db.get_session()
+        try:
+            created = [Signal(**params) for params in signals]
+            session.add_all(created)
+            session.flush()
+
+            increments: Dict[Tuple[str, date], List[int]] = {}
+            for signal in created:
+                totals = increments.setdefault((signal.symbol, signal.created_at.date()), [0, 0])
+                totals[0] += 1
+                totals[1] += signal.confidence
+            for (symbol, day), (count, confidence_sum) in increments.items():
+                _increment_daily_stats(session, symbol, day, signals_count=count, confidence_sum=confidence_sum)
+
+            session.commit()
+            logger.info(f"Created {len(created)} new signals")
+            return created
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error creating signals: {e}")
+            raise
+        finally:
+            session.close()
+
     def get_unsent_signals(self) -> List[Signal]:
         """
         Получение неотправленных сигналов
@@ -292,7 +424,7 @@ class SignalRepository:
             stmt = select(Signal).where(
                 Signal.sent_to_users == False,
                 Signal.is_active == True
-            )
+            ).order_by(Signal.created_at, Signal.id)
             result = session.execute(stmt).scalars().all()
             return list(result)
         except Exception as e:
@@ -301,6 +433,57 @@ class SignalRepository:
         finally:
             session.close()
 
+    def has_active_signal(self, symbol: str, signal_type: str) -> bool:
+        """
+        Проверка наличия активного сигнала по символу и направлению
+
+        Args:
+            symbol: Символ актива
+            signal_type: Тип сигнала ('BUY', 'SELL')
+
+        Returns:
+            bool: True если активный сигнал уже есть
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(Signal.id).where(
+                Signal.symbol == symbol,
+                Signal.signal_type == signal_type,
+                Signal.is_active == True
+            ).limit(1)
+            return session.execute(stmt).first() is not None
+        except Exception as e:
+            logger.error(f"Error checking active signal: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_active_signal_keys(self, symbols: List[str]) -> Set[Tuple[str, str]]:
+        """
+        Активные сигналы по набору символов одним запросом
+
+        Args:
+            symbols: Символы активов
+
+        Returns:
+            Set[Tuple[str, str]]: Пары (символ, тип сигнала) с активным сигналом
+        """
+        if not symbols:
+            return set()
+
+        session = self.db.get_session()
+        try:
+            stmt = select(Signal.symbol, Signal.signal_type).where(
+                Signal.symbol.in_(set(symbols)),
+                Signal.is_active == True
+            ).distinct()
+            return {(symbol, signal_type) for symbol, signal_type in session.execute(stmt)}
+        except Exception as e:
+            logger.error(f"Error getting active signals: {e}")
+            raise
+        finally:
+            session.close()
+
     def mark_signal_as_sent(self, signal_id: int) -> None:
         """
         Пометить сигнал как отправленный
@@ -324,11 +507,879 @@ class SignalRepository:
         finally:
             session.close()
 
+    def get_group_followers(self, leader_ids: List[int]) -> Dict[int, List[Signal]]:
+        """
+        Последователи групп по ID лидеров
+
+        Args:
+            leader_ids: ID сигналов-лидеров
+
+        Returns:
+            Dict[int, List[Signal]]: ID лидера -> последователи по убыванию уверенности
+        """
+        if not leader_ids:
+            return {}
+
+        session = self.db.get_session()
+        try:
+            stmt = select(Signal).where(
+                Signal.group_leader_id.in_(leader_ids)
+            ).order_by(Signal.confidence.desc(), Signal.id)
+            followers: Dict[int, List[Signal]] = {}
+            for signal in session.execute(stmt).scalars().all():
+                followers.setdefault(signal.group_leader_id, []).append(signal)
+            return followers
+        except Exception as e:
+            logger.error(f"Error getting group followers: {e}")
+            raise
+        finally:
+            session.close()
+
+    def close_signal(self, signal_id: int, exit_price: float) -> Optional[Signal]:
+        """
+        Закрытие сигнала с фиксацией результата
+
+        Args:
+            signal_id: ID сигнала
+            exit_price: Цена выхода
+
+        Returns:
+            Optional[Signal]: Закрытый сигнал или None
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(Signal).where(Signal.id == signal_id)
+            signal = session.execute(stmt).scalar_one_or_none()
+
+            if not signal or signal.closed_at is not None:
+                return signal
+
+            if signal.signal_type == 'SELL':
+                is_win = exit_price < signal.price
+            else:
+                is_win = exit_price > signal.price
+
+            signal.is_active = False
+            signal.closed_at = datetime.utcnow()
+            signal.exit_price = exit_price
+            signal.outcome = 'win' if is_win else 'loss'
+
+            _increment_daily_stats(
+                session,
+                signal.symbol,
+                signal.created_at.date(),
+                closed_count=1,
+                wins_count=1 if is_win else 0
+            )
+            session.commit()
+            session.refresh(signal)
+            logger.info(f"Signal {signal_id} closed at ${exit_price}: {signal.outcome}")
+            return signal
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error closing signal: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_signal_stats(self, days: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Сводная статистика сигналов по агрегатной таблице
+
+        Args:
+            days: Ограничение периода в днях (None - за все время)
+
+        Returns:
+            Dict[str, Any]: signals, closed, wins, win_rate, avg_confidence
+        """
+        return self._query_stats(days=days)[0]
+
+    def get_signal_stats_by_symbol(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Статистика сигналов в разбивке по символам
+
+        Args:
+            days: Ограничение периода в днях (None - за все время)
+
+        Returns:
+            List[Dict[str, Any]]: Статистика по каждому символу, по убыванию числа сигналов
+        """
+        return self._query_stats(days=days, by_symbol=True)
+
+    def _query_stats(self, days: Optional[int] = None, by_symbol: bool = False) -> List[Dict[str, Any]]:
+        """
+        Суммирование агрегатов: за все время - накопительные итоги символов
+        (signal_symbol_stats, объем не зависит от истории), за период -
+        дневные строки signal_daily_stats
+
+        Args:
+            days: Ограничение периода в днях
+            by_symbol: Группировать по символу
+
+        Returns:
+            List[Dict[str, Any]]: Строки статистики
+        """
+        session = self.db.get_session()
+        try:
+            model = SignalSymbolStats if days is None else SignalDailyStats
+            columns = [
+                func.coalesce(func.sum(model.signals_count), 0),
+                func.coalesce(func.sum(model.confidence_sum), 0),
+                func.coalesce(func.sum(model.closed_count), 0),
+                func.coalesce(func.sum(model.wins_count), 0),
+            ]
+            if by_symbol:
+                columns.insert(0, model.symbol)
+
+            stmt = select(*columns)
+            if days is not None:
+                since = datetime.utcnow().date() - timedelta(days=days - 1)
+                stmt = stmt.where(SignalDailyStats.day >= since)
+            if by_symbol:
+                stmt = stmt.group_by(model.symbol).order_by(columns[1].desc())
+
+            rows = []
+            for row in session.execute(stmt).all():
+                symbol = row[0] if by_symbol else None
+                signals, confidence_sum, closed, wins = row[-4:]
+                stats: Dict[str, Any] = {
+                    'signals': signals,
+                    'closed': closed,
+                    'wins': wins,
+                    'win_rate': wins / closed if closed else None,
+                    'avg_confidence': confidence_sum / signals if signals else None,
+                }
+                if by_symbol:
+                    stats = {'symbol': symbol, **stats}
+                rows.append(stats)
+            return rows
+        except Exception as e:
+            logger.error(f"Error getting signal stats: {e}")
+            raise
+        finally:
+            session.close()
+
+    def archive_closed_signals(self, older_than_days: int, batch_size: int = 1000) -> int:
+        """
+        Перенос сигналов, закрытых раньше заданного срока, в signals_archive
+
+        Срок отсчитывается от closed_at; у старых строк без closed_at -
+        от created_at. Перенос идет пачками: каждая пачка копируется и
+        удаляется в одной транзакции, чтобы не держать длинных блокировок.
+
+        Args:
+            older_than_days: Сколько дней назад закрыт сигнал
+            batch_size: Размер пачки
+
+        Returns:
+            int: Количество перенесенных сигналов
+        """
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        closed_before_cutoff = or_(
+            Signal.closed_at < cutoff,
+            and_(Signal.closed_at.is_(None), Signal.created_at < cutoff)
+        )
+        columns = [column.name for column in Signal.__table__.columns]
+        archived = 0
+
+        while True:
+            session = self.db.get_session()
+            try:
+                ids_stmt = select(Signal.id).where(
+                    closed_before_cutoff,
+                    Signal.is_active == False
+                ).order_by(func.coalesce(Signal.closed_at, Signal.created_at), Signal.id).limit(batch_size)
+                ids = list(session.execute(ids_stmt).scalars().all())
+                if not ids:
+                    break
+
+                source = select(
+                    *[Signal.__table__.c[name] for name in columns],
+                    literal(datetime.utcnow()).label('archived_at')
+                ).where(Signal.id.in_(ids))
+                session.execute(
+                    insert(SignalArchive).from_select(columns + ['archived_at'], source)
+                )
+                session.execute(delete(Signal).where(Signal.id.in_(ids)))
+                session.commit()
+                archived += len(ids)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error archiving signals: {e}")
+                raise
+            finally:
+                session.close()
+
+        if archived:
+            logger.info(f"Archived {archived} signals closed more than {older_than_days} days ago")
+        return archived
+
+    def get_signal_history(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+        symbol: Optional[str] = None,
+        include_archive: bool = True,
+        with_indicators: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        """
+        Страница истории сигналов с keyset-пагинацией по (created_at, id)
+
+        Args:
+            limit: Размер страницы
+            after: Курсор последней строки предыдущей страницы
+            symbol: Фильтр по символу
+            include_archive: Учитывать архивные сигналы
+            with_indicators: Возвращать indicators_data
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+                Строки страницы и курсор следующей страницы (None, если страница последняя)
+        """
+        tables = [Signal.__table__]
+        if include_archive:
+            tables.append(SignalArchive.__table__)
+
+        selects = []
+        for table in tables:
+            columns = [
+                column for column in Signal.__table__.columns
+                if with_indicators or column.name != 'indicators_data'
+            ]
+            stmt = select(*[table.c[column.name] for column in columns])
+            if symbol is not None:
+                stmt = stmt.where(table.c.symbol == symbol)
+            if after is not None:
+                stmt = stmt.where(tuple_(table.c.created_at, table.c.id) > tuple_(*after))
+            # Каждая ветка ограничивается отдельно и читает свой индекс по порядку
+            stmt = stmt.order_by(table.c.created_at, table.c.id).limit(limit)
+            selects.append(stmt)
+
+        if len(selects) == 1:
+            query = selects[0]
+        else:
+            union = union_all(*[stmt.subquery().select() for stmt in selects]).subquery()
+            query = select(union).order_by(union.c.created_at, union.c.id).limit(limit)
+
+        session = self.db.get_session()
+        try:
+            rows = [dict(row) for row in session.execute(query).mappings().all()]
+            next_cursor = None
+            if len(rows) == limit:
+                next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+            return rows, next_cursor
+        except Exception as e:
+            logger.error(f"Error getting signal history: {e}")
+            raise
+        finally:
+            session.close()
+
+
+class UniverseRepository:
+    """Репозиторий универсума символов (universe_symbols)"""
+
+    # Колонки метаданных, которые приходят из файла универсума
+    METADATA_FIELDS = ('asset_type', 'name', 'exchange', 'sector')
+
+    def __init__(self, db: Database):
+        """
+        Инициализация репозитория
+
+        Args:
+            db: Объект Database
+        """
+        self.db = db
+
+    def sync_symbols(self, entries: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Синхронизация универсума со списком символов
+
+        Новые символы добавляются, метаданные существующих обновляются,
+        символы вне списка отключаются (состояние сканирования сохраняется).
+
+        Args:
+            entries: Символы с метаданными (symbol, asset_type, name, exchange, sector)
+
+        Returns:
+            Tuple[int, int]: Количество добавленных и отключенных символов
+        """
+        session = self.db.get_session()
+        try:
+            now = datetime.utcnow()
+            existing = set(session.execute(select(UniverseSymbol.symbol)).scalars().all())
+            wanted = {entry['symbol'] for entry in entries}
+
+            new_rows = [
+                {
+                    'symbol': entry['symbol'],
+                    **{field: entry.get(field) for field in self.METADATA_FIELDS},
+                    'enabled': True,
+                    'updated_at': now,
+                }
+                for entry in entries if entry['symbol'] not in existing
+            ]
+            if new_rows:
+                session.execute(insert(UniverseSymbol), new_rows)
+
+            changed_rows = [
+                {
+                    'b_symbol': entry['symbol'],
+                    **{field: entry.get(field) for field in self.METADATA_FIELDS},
+                    'enabled': True,
+                    'updated_at': now,
+                }
+                for entry in entries if entry['symbol'] in existing
+            ]
+            if changed_rows:
+                stmt = update(UniverseSymbol.__table__).where(
+                    UniverseSymbol.__table__.c.symbol == bindparam('b_symbol')
+                ).values({
+                    name: bindparam(name) for name in (*self.METADATA_FIELDS, 'enabled', 'updated_at')
+                })
+                session.connection().execute(stmt, changed_rows)
+
+            disabled = session.execute(
+                update(UniverseSymbol)
+                .where(UniverseSymbol.symbol.not_in(wanted), UniverseSymbol.enabled == True)
+                .values(enabled=False, updated_at=now)
+            ).rowcount
+
+            session.commit()
+            logger.info(f"Universe synced: {len(entries)} symbols, {len(new_rows)} added, {disabled} disabled")
+            return len(new_rows), disabled
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error syncing universe: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_symbols(self, enabled_only: bool = True) -> List[UniverseSymbol]:
+        """
+        Символы универсума
+
+        Args:
+            enabled_only: Только включенные
+
+        Returns:
+            List[UniverseSymbol]: Символы в порядке добавления
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(UniverseSymbol).order_by(UniverseSymbol.id)
+            if enabled_only:
+                stmt = stmt.where(UniverseSymbol.enabled == True)
+            return list(session.execute(stmt).scalars().all())
+        except Exception as e:
+            logger.error(f"Error getting universe: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_asset_types(self) -> Dict[str, str]:
+        """
+        Типы активов всех символов универсума
+
+        Returns:
+            Dict[str, str]: Символ -> тип актива
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(UniverseSymbol.symbol, UniverseSymbol.asset_type)
+            return {symbol: asset_type for symbol, asset_type in session.execute(stmt).all()}
+        except Exception as e:
+            logger.error(f"Error getting asset types: {e}")
+            raise
+        finally:
+            session.close()
+
+    def record_scans(self, metrics: Dict[str, Dict[str, Optional[float]]], scanned_at: datetime) -> None:
+        """
+        Сохранение времени сканирования и метрик активности
+
+        Args:
+            metrics: Символ -> {'volatility': ..., 'volume_ratio': ...}
+            scanned_at: Время сканирования
+        """
+        if not metrics:
+            return
+
+        session = self.db.get_session()
+        try:
+            stmt = update(UniverseSymbol.__table__).where(
+                UniverseSymbol.__table__.c.symbol == bindparam('b_symbol')
+            ).values(
+                # Без новых свечей сохраняются прежние метрики
+                volatility=func.coalesce(bindparam('volatility'), UniverseSymbol.__table__.c.volatility),
+                volume_ratio=func.coalesce(bindparam('volume_ratio'), UniverseSymbol.__table__.c.volume_ratio),
+                last_scanned_at=bindparam('last_scanned_at')
+            )
+            session.connection().execute(stmt, [
+                {
+                    'b_symbol': symbol,
+                    'volatility': values.get('volatility'),
+                    'volume_ratio': values.get('volume_ratio'),
+                    'last_scanned_at': scanned_at,
+                }
+                for symbol, values in metrics.items()
+            ])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording scans: {e}")
+            raise
+        finally:
+            session.close()
+
+    def update_tiers(self, tiers: Dict[str, int]) -> None:
+        """
+        Сохранение уровней сканирования
+
+        Args:
+            tiers: Символ -> уровень
+        """
+        if not tiers:
+            return
+
+        session = self.db.get_session()
+        try:
+            stmt = update(UniverseSymbol.__table__).where(
+                UniverseSymbol.__table__.c.symbol == bindparam('b_symbol')
+            ).values(tier=bindparam('tier'))
+            session.connection().execute(stmt, [
+                {'b_symbol': symbol, 'tier': tier} for symbol, tier in tiers.items()
+            ])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating tiers: {e}")
+            raise
+        finally:
+            session.close()
+
+
+class CorrelationRepository:
+    """Репозиторий корреляций символов (symbol_correlations)"""
+
+    def __init__(self, db: Database):
+        """
+        Инициализация репозитория
+
+        Args:
+            db: Объект Database
+        """
+        self.db = db
+
+    def replace_correlations(self, pairs: List[Tuple[str, str, float, int]]) -> None:
+        """
+        Замена сохраненных корреляций текущим срезом матрицы
+
+        Args:
+            pairs: (symbol, other_symbol, корреляция, наблюдений), symbol < other_symbol
+        """
+        session = self.db.get_session()
+        try:
+            now = datetime.utcnow()
+            session.execute(delete(SymbolCorrelation))
+            if pairs:
+                session.execute(insert(SymbolCorrelation), [
+                    {
+                        'symbol': symbol,
+                        'other_symbol': other_symbol,
+                        'correlation': correlation,
+                        'observations': observations,
+                        'updated_at': now,
+                    }
+                    for symbol, other_symbol, correlation, observations in pairs
+                ])
+            session.commit()
+            logger.info(f"Stored {len(pairs)} correlated symbol pairs")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error storing correlations: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_correlations(self, symbols: List[str]) -> Dict[Tuple[str, str], float]:
+        """
+        Корреляции между заданными символами
+
+        Args:
+            symbols: Символы
+
+        Returns:
+            Dict[Tuple[str, str], float]: Корреляция для обоих порядков пары
+        """
+        if len(symbols) < 2:
+            return {}
+
+        session = self.db.get_session()
+        try:
+            stmt = select(
+                SymbolCorrelation.symbol,
+                SymbolCorrelation.other_symbol,
+                SymbolCorrelation.correlation
+            ).where(
+                SymbolCorrelation.symbol.in_(symbols),
+                SymbolCorrelation.other_symbol.in_(symbols)
+            )
+            correlations: Dict[Tuple[str, str], float] = {}
+            for symbol, other_symbol, correlation in session.execute(stmt).all():
+                correlations[(symbol, other_symbol)] = correlation
+                correlations[(other_symbol, symbol)] = correlation
+            return correlations
+        except Exception as e:
+            logger.error(f"Error getting correlations: {e}")
+            raise
+        finally:
+            session.close()
+
+
+class DeliveryRepository:
+    """
+    Outbox доставки сигналов: задания на каждого получателя с арендой.
+    Несколько экземпляров бота разбирают очередь параллельно без дублей.
+    """
+
+    def __init__(self, db: Database):
+        """
+        Инициализация репозитория
+
+        Args:
+            db: Объект Database
+        """
+        self.db = db
+
+    def enqueue_signal(self, signal_id: int, follower_ids: Optional[List[int]] = None) -> int:
+        """
+        Создание заданий доставки сигнала всем подписчикам
+
+        Сигнал помечается отправленным в той же транзакции условным UPDATE,
+        поэтому при одновременном вызове из нескольких экземпляров задания
+        создаст только один из них. Коррелированные сигналы группы
+        привязываются к лидеру в этой же транзакции: они попадают к
+        подписчикам только в его сообщении и не могут остаться
+        сгруппированными без заданий доставки лидера.
+
+        Args:
+            signal_id: ID сигнала (лидера группы)
+            follower_ids: ID сигналов-последователей
+
+        Returns:
+            int: Количество созданных заданий
+        """
+        session = self.db.get_session()
+        try:
+            claimed = session.execute(
+                update(Signal)
+                .where(Signal.id == signal_id, Signal.sent_to_users == False)
+                .values(sent_to_users=True)
+            )
+            if claimed.rowcount != 1:
+                session.rollback()
+                return 0
+
+            grouped = 0
+            if follower_ids:
+                # Условие sent_to_users == False не дает сгруппировать сигнал,
+                # который другой экземпляр уже поставил в очередь
+                grouped = session.execute(
+                    update(Signal)
+                    .where(Signal.id.in_(follower_ids), Signal.sent_to_users == False)
+                    .values(group_leader_id=signal_id, sent_to_users=True)
+                ).rowcount
+
+            source = select(
+                literal(signal_id),
+                User.telegram_id,
+                literal('pending'),
+                literal(0),
+                literal(datetime.utcnow())
+            ).where(User.subscribed == True)
+            result = session.execute(
+                insert(SignalDelivery).from_select(
+                    ['signal_id', 'telegram_id', 'status', 'attempts', 'created_at'],
+                    source
+                )
+            )
+            session.commit()
+            if grouped:
+                logger.info(f"Grouped {grouped} correlated signals under signal {signal_id}")
+            logger.info(f"Signal {signal_id} queued for {result.rowcount} recipients")
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error enqueuing signal deliveries: {e}")
+            raise
+        finally:
+            session.close()
+
+    def claim_batch(
+        self,
+        owner: str,
+        limit: int,
+        lease_seconds: int
+    ) -> Tuple[str, List[Tuple[SignalDelivery, Signal]]]:
+        """
+        Захват пачки ожидающих заданий в аренду
+
+        На PostgreSQL строки выбираются с FOR UPDATE SKIP LOCKED, на SQLite
+        атомарность обеспечивает единственный писатель: UPDATE с подзапросом
+        выполняется целиком под блокировкой записи.
+
+        Args:
+            owner: Идентификатор отправителя
+            limit: Максимальный размер пачки
+            lease_seconds: Срок аренды в секундах
+
+        Returns:
+            Tuple[str, List[Tuple[SignalDelivery, Signal]]]: Токен аренды и задания с сигналами
+        """
+        token = str(uuid.uuid4())
+        now = datetime.utcnow()
+
+        candidates = select(SignalDelivery.id).where(
+            SignalDelivery.status == 'pending',
+            or_(SignalDelivery.lease_expires_at.is_(None), SignalDelivery.lease_expires_at < now)
+        ).order_by(SignalDelivery.id).limit(limit)
+        if self.db.engine.dialect.name == 'postgresql':
+            candidates = candidates.with_for_update(skip_locked=True)
+
+        session = self.db.get_session()
+        try:
+            session.execute(
+                update(SignalDelivery)
+                .where(SignalDelivery.id.in_(candidates.scalar_subquery()))
+                .values(
+                    lease_owner=owner,
+                    lease_token=token,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    attempts=SignalDelivery.attempts + 1
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+
+            stmt = select(SignalDelivery, Signal).join(
+                Signal, Signal.id == SignalDelivery.signal_id
+            ).where(SignalDelivery.lease_token == token).order_by(SignalDelivery.id)
+            rows = [(delivery, signal) for delivery, signal in session.execute(stmt).all()]
+            return token, rows
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error claiming deliveries: {e}")
+            raise
+        finally:
+            session.close()
+
+    def renew_lease(self, token: str, lease_seconds: int) -> int:
+        """
+        Продление аренды еще не завершенных заданий пачки
+
+        Args:
+            token: Токен аренды
+            lease_seconds: Новый срок аренды в секундах
+
+        Returns:
+            int: Количество продленных заданий (0 - аренда потеряна или пачка завершена)
+        """
+        return self.checkpoint([], token, lease_seconds)[1]
+
+    def mark_sent(self, delivery_ids: List[int], token: str) -> int:
+        """
+        Подтверждение отправки заданий пачки
+
+        Args:
+            delivery_ids: ID отправленных заданий
+            token: Токен аренды
+
+        Returns:
+            int: Количество подтвержденных заданий (меньше переданных,
+                если часть аренды потеряна и задания забрал другой отправитель)
+        """
+        return self.checkpoint(delivery_ids, token, None)[0]
+
+    def checkpoint(
+        self,
+        delivery_ids: List[int],
+        token: str,
+        lease_seconds: Optional[int]
+    ) -> Tuple[int, int]:
+        """
+        Подтверждение отправленных заданий и продление аренды остальных
+        одной транзакцией (одна запись в БД вместо записи на каждое сообщение)
+
+        Args:
+            delivery_ids: ID отправленных заданий
+            token: Токен аренды
+            lease_seconds: Новый срок аренды (None - не продлевать)
+
+        Returns:
+            Tuple[int, int]: (подтверждено, продлено)
+        """
+        session = self.db.get_session()
+        try:
+            acked = 0
+            renewed = 0
+            if delivery_ids:
+                result = session.execute(
+                    update(SignalDelivery)
+                    .where(
+                        SignalDelivery.id.in_(delivery_ids),
+                        SignalDelivery.lease_token == token,
+                        SignalDelivery.status == 'pending'
+                    )
+                    .values(
+                        status='sent',
+                        sent_at=datetime.utcnow(),
+                        lease_owner=None,
+                        lease_token=None,
+                        lease_expires_at=None
+                    )
+                )
+                acked = result.rowcount
+            if lease_seconds is not None:
+                result = session.execute(
+                    update(SignalDelivery)
+                    .where(SignalDelivery.lease_token == token, SignalDelivery.status == 'pending')
+                    .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+                )
+                renewed = result.rowcount
+            session.commit()
+            return acked, renewed
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating delivery lease: {e}")
+            raise
+        finally:
+            session.close()
+
+    def postpone(self, token: str, delay_seconds: float) -> int:
+        """
+        Возврат неотправленных заданий аренды в очередь без расхода попытки
+
+        Используется при flood control Telegram (RetryAfter): задания не
+        виноваты в ошибке, поэтому attempts, увеличенный при захвате, возвращается.
+
+        Args:
+            token: Токен аренды
+            delay_seconds: Задания доступны для захвата не раньше, чем через это время
+
+        Returns:
+            int: Количество возвращенных заданий
+        """
+        session = self.db.get_session()
+        try:
+            result = session.execute(
+                update(SignalDelivery)
+                .where(SignalDelivery.lease_token == token, SignalDelivery.status == 'pending')
+                .values(
+                    # claim_batch увеличил attempts при захвате
+                    attempts=SignalDelivery.attempts - 1,
+                    lease_owner=None,
+                    lease_token=None,
+                    lease_expires_at=datetime.utcnow() + timedelta(seconds=delay_seconds)
+                )
+            )
+            session.commit()
+            return result.rowcount
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error postponing deliveries: {e}")
+            raise
+        finally:
+            session.close()
+
+    def mark_failed(self, delivery_id: int, token: str, error: str, permanent: bool = False) -> None:
+        """
+        Фиксация ошибки отправки
+
+        Задание возвращается в очередь с задержкой, пока не исчерпаны
+        DELIVERY_MAX_ATTEMPTS (или сразу помечается failed при permanent=True).
+
+        Args:
+            delivery_id: ID задания
+            token: Токен аренды
+            error: Текст ошибки
+            permanent: Повторять бессмысленно (например, пользователь заблокировал бота)
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(SignalDelivery).where(
+                SignalDelivery.id == delivery_id,
+                SignalDelivery.lease_token == token,
+                SignalDelivery.status == 'pending'
+            )
+            delivery = session.execute(stmt).scalar_one_or_none()
+            if delivery is None:
+                return
+
+            if permanent or delivery.attempts >= Config.DELIVERY_MAX_ATTEMPTS:
+                delivery.status = 'failed'
+            delivery.last_error = error[:1000]
+            delivery.lease_owner = None
+            delivery.lease_token = None
+            # Повтор не раньше, чем через 30 с на каждую попытку
+            delivery.lease_expires_at = datetime.utcnow() + timedelta(seconds=30 * delivery.attempts)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error marking delivery as failed: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_pending_count(self) -> int:
+        """
+        Количество заданий, ожидающих отправки
+
+        Returns:
+            int: Количество заданий в статусе pending
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(func.count()).select_from(SignalDelivery).where(
+                SignalDelivery.status == 'pending'
+            )
+            return session.execute(stmt).scalar_one()
+        except Exception as e:
+            logger.error(f"Error getting pending deliveries count: {e}")
+            raise
+        finally:
+            session.close()
+
+    def get_delivered_count(self, telegram_id: int) -> int:
+        """
+        Количество сигналов, доставленных пользователю
+
+        Args:
+            telegram_id: Telegram ID пользователя
+
+        Returns:
+            int: Количество доставленных сигналов
+        """
+        session = self.db.get_session()
+        try:
+            stmt = select(func.count()).select_from(SignalDelivery).where(
+                SignalDelivery.telegram_id == telegram_id,
+                SignalDelivery.status == 'sent'
+            )
+            return session.execute(stmt).scalar_one()
+        except Exception as e:
+            logger.error(f"Error getting delivered count: {e}")
+            raise
+        finally:
+            session.close()
+
 
 # Глобальные объекты для использования в приложении
 db = Database(Config.DATABASE_URL)
 user_repository = UserRepository(db)
 signal_repository = SignalRepository(db)
+delivery_repository = DeliveryRepository(db)
+correlation_repository = CorrelationRepository(db)
+universe_repository = UniverseRepository(db)
 
 
 def init_database() -> None:
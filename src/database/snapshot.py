@@ -0,0 +1,301 @@
+"""
+Компактный бинарный формат снимка индикаторов сигнала.
+
+Формат (little-endian):
+    magic (uint8) | version (uint8) | flags (uint8) | mask (uint32) | float64 * N | [extras]
+
+mask - битовая маска присутствующих полей схемы версии, значения идут
+подряд в порядке схемы. Ключи вне схемы (например, текстовые пояснения)
+сохраняются в хвосте extras как компактный JSON, если установлен
+флаг FLAG_EXTRAS. Имена ключей в строке не хранятся.
+"""
+
+import json
+import struct
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+SNAPSHOT_MAGIC = 0xB7
+FLAG_EXTRAS = 0x01
+
+# Схемы полей по версиям. Новые поля добавляются только в новую версию.
+SNAPSHOT_SCHEMAS: Dict[int, Tuple[str, ...]] = {
+    1: (
+        'close',
+        'volume',
+        'rsi',
+        'ema_12',
+        'sma_20',
+        'sma_50',
+        'sma_100',
+        'sma_200',
+        'macd',
+        'macd_signal',
+        'macd_hist',
+        'macd_hist_prev',
+        'obv',
+        'obv_ema',
+        'vroc',
+    ),
+    2: (
+        'close',
+        'volume',
+        'rsi',
+        'ema_12',
+        'sma_20',
+        'sma_50',
+        'sma_100',
+        'sma_200',
+        'macd',
+        'macd_signal',
+        'macd_hist',
+        'macd_hist_prev',
+        'obv',
+        'obv_ema',
+        'vroc',
+        'close_prev',
+        'rsi_prev',
+        'macd_prev',
+        'macd_signal_prev',
+        'volume_sma_20',
+    ),
+}
+SNAPSHOT_VERSION = max(SNAPSHOT_SCHEMAS)
+
+_HEADER = struct.Struct('<BBBI')
+_FIELD_INDEX: Dict[int, Dict[str, int]] = {
+    version: {name: i for i, name in enumerate(fields)}
+    for version, fields in SNAPSHOT_SCHEMAS.items()
+}
+_VALUES_STRUCTS: Dict[int, struct.Struct] = {}
+
+
+def _values_struct(count: int) -> struct.Struct:
+    """Кэш struct.Struct для N значений float64"""
+    packer = _VALUES_STRUCTS.get(count)
+    if packer is None:
+        packer = _VALUES_STRUCTS[count] = struct.Struct(f'<{count}d')
+    return packer
+
+
+def _is_number(value: Any) -> bool:
+    """Число, которое можно сохранить как float64 без потери смысла"""
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def encode_snapshot(data: Mapping[str, Any]) -> bytes:
+    """
+    Кодирование словаря индикаторов в бинарный снимок
+
+    Args:
+        data: Словарь индикаторов
+
+    Returns:
+        bytes: Бинарный снимок текущей версии
+    """
+    index = _FIELD_INDEX[SNAPSHOT_VERSION]
+    present = []
+    extras = {}
+
+    for key, value in data.items():
+        position = index.get(key)
+        if position is not None and _is_number(value):
+            present.append((position, float(value)))
+        else:
+            extras[key] = value
+
+    present.sort()
+    mask = 0
+    for position, _ in present:
+        mask |= 1 << position
+
+    flags = FLAG_EXTRAS if extras else 0
+    parts = [
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, mask),
+        _values_struct(len(present)).pack(*[value for _, value in present]),
+    ]
+    if extras:
+        parts.append(
+            json.dumps(extras, ensure_ascii=False, separators=(',', ':'), default=float).encode('utf-8')
+        )
+    return b''.join(parts)
+
+
+def decode_snapshot(raw: bytes) -> Dict[str, Any]:
+    """
+    Декодирование бинарного снимка в словарь
+
+    Args:
+        raw: Бинарный снимок
+
+    Returns:
+        Dict[str, Any]: Словарь индикаторов
+    """
+    magic, version, flags, mask = _HEADER.unpack_from(raw)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not an indicator snapshot")
+
+    fields = SNAPSHOT_SCHEMAS.get(version)
+    if fields is None:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+
+    names = [name for i, name in enumerate(fields) if mask >> i & 1]
+    packer = _values_struct(len(names))
+    values = packer.unpack_from(raw, _HEADER.size)
+    result: Dict[str, Any] = dict(zip(names, values))
+
+    if flags & FLAG_EXTRAS:
+        result.update(json.loads(raw[_HEADER.size + packer.size:].decode('utf-8')))
+    return result
+
+
+def is_snapshot(raw: Union[bytes, memoryview, None]) -> bool:
+    """
+    Проверка, что значение - бинарный снимок, а не JSON старого формата
+
+    Args:
+        raw: Значение колонки
+
+    Returns:
+        bool: True для бинарного снимка
+    """
+    return isinstance(raw, (bytes, bytearray, memoryview)) and len(raw) >= _HEADER.size \
+        and raw[0] == SNAPSHOT_MAGIC
+
+
+def snapshots_to_array(
+    snapshots: Iterable[Union[bytes, 'IndicatorSnapshot']],
+    fields: Optional[Sequence[str]] = None
+) -> np.ndarray:
+    """
+    Пакетное декодирование снимков в матрицу для статистики и бэктестов
+
+    Args:
+        snapshots: Бинарные снимки или IndicatorSnapshot
+        fields: Нужные поля (по умолчанию вся схема текущей версии)
+
+    Returns:
+        np.ndarray: Матрица float64 (строки x поля), отсутствующие значения - NaN
+    """
+    fields = tuple(fields or SNAPSHOT_SCHEMAS[SNAPSHOT_VERSION])
+    blobs = [item.raw if isinstance(item, IndicatorSnapshot) else item for item in snapshots]
+    result = np.full((len(blobs), len(fields)), np.nan)
+
+    # Строки с одинаковой маской имеют одинаковую раскладку и декодируются одним буфером
+    groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for row, raw in enumerate(blobs):
+        _, version, _, mask = _HEADER.unpack_from(raw)
+        groups[(version, mask)].append(row)
+
+    for (version, mask), rows in groups.items():
+        schema = SNAPSHOT_SCHEMAS[version]
+        names = [name for i, name in enumerate(schema) if mask >> i & 1]
+        size = _values_struct(len(names)).size
+        buffer = b''.join(blobs[row][_HEADER.size:_HEADER.size + size] for row in rows)
+        values = np.frombuffer(buffer, dtype='<f8').reshape(len(rows), len(names))
+        row_index = np.asarray(rows, dtype=np.intp)
+        for column, name in enumerate(fields):
+            if name in names:
+                result[row_index, column] = values[:, names.index(name)]
+    return result
+
+
+class IndicatorSnapshot(Mapping[str, Any]):
+    """
+    Словарь индикаторов поверх бинарного снимка.
+    Декодирование выполняется лениво при первом обращении.
+    """
+
+    __slots__ = ('raw', '_data')
+
+    def __init__(self, raw: bytes):
+        """
+        Инициализация снимка
+
+        Args:
+            raw: Бинарный снимок
+        """
+        self.raw = bytes(raw)
+        self._data: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'IndicatorSnapshot':
+        """
+        Создание снимка из словаря
+
+        Args:
+            data: Словарь индикаторов
+
+        Returns:
+            IndicatorSnapshot: Снимок
+        """
+        return cls(encode_snapshot(data))
+
+    @property
+    def version(self) -> int:
+        """Версия формата снимка"""
+        return self.raw[1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Копия снимка в виде обычного словаря
+
+        Returns:
+            Dict[str, Any]: Словарь индикаторов
+        """
+        return dict(self._decoded())
+
+    def _decoded(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = decode_snapshot(self.raw)
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._decoded()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndicatorSnapshot):
+            return self.raw == other.raw or self._decoded() == other._decoded()
+        if isinstance(other, Mapping):
+            return self._decoded() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<IndicatorSnapshot(v{self.version}, {self._decoded()})>"
+
+
+class IndicatorSnapshotType(TypeDecorator):
+    """
+    Тип колонки: принимает словарь, хранит бинарный снимок,
+    возвращает IndicatorSnapshot. Строки старого JSON-формата
+    (до миграции) читаются как обычный словарь.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Mapping[str, Any]], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, IndicatorSnapshot):
+            return value.raw
+        return encode_snapshot(value)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Mapping[str, Any]]:
+        if value is None:
+            return None
+        if is_snapshot(value):
+            return IndicatorSnapshot(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value).decode('utf-8')
+        return json.loads(value) if isinstance(value, str) else value
@@ -0,0 +1,313 @@
+"""
+Скользящая корреляция доходностей всех отслеживаемых символов.
+
+Матрица поддерживается инкрементально: для окна последних N баров
+хранятся попарные суммы (число наблюдений, sum x, sum x^2, sum xy), и
+каждый новый бар добавляет свой вклад и вычитает вклад вытесненного бара
+одной векторной операцией над матрицами n x n. Пропуски (символ не
+торговался в этот бар) исключаются попарно.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Метка "баров еще не было"
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+
+def _to_nanoseconds(index: pd.Index) -> np.ndarray:
+    """Метки времени индекса в нс с эпохи (UTC)"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+class RollingCorrelation:
+    """Инкрементальная матрица корреляций доходностей по окну баров"""
+
+    def __init__(self, window: int = 60, min_observations: int = 20):
+        """
+        Инициализация
+
+        Args:
+            window: Размер окна в барах
+            min_observations: Минимум совместных наблюдений для оценки пары
+        """
+        self.window = window
+        self.min_observations = min_observations
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        # Окно доходностей (window x n), NaN - нет данных
+        self._returns = np.full((window, 0), np.nan)
+        # Время бара каждой строки окна, нс
+        self._row_timestamps = np.full(window, NO_TIMESTAMP, dtype=np.int64)
+        self._position = 0
+        self._filled = 0
+        # Последняя цена и время последнего бара по каждому символу
+        self._last_close = np.full(0, np.nan)
+        self._symbol_timestamps = np.full(0, NO_TIMESTAMP, dtype=np.int64)
+        self._reset_sums()
+
+    def _reset_sums(self) -> None:
+        """Обнуление попарных сумм"""
+        n = len(self.symbols)
+        self._count = np.zeros((n, n))
+        self._sum_x = np.zeros((n, n))
+        self._sum_xx = np.zeros((n, n))
+        self._sum_xy = np.zeros((n, n))
+
+    def _accumulate(self, returns: np.ndarray, sign: float) -> None:
+        """Добавление (sign=1) или вычитание (sign=-1) вклада строк доходностей"""
+        if returns.ndim == 1:
+            columns = np.nonzero(~np.isnan(returns))[0]
+            if len(columns) < len(returns):
+                # Строка с пропусками (часть символов не сканировалась) меняет
+                # только блок присутствующих символов - без временных матриц n x n
+                values = returns[columns]
+                block = np.ix_(columns, columns)
+                self._count[block] += sign
+                self._sum_x[block] += sign * values[:, None]
+                self._sum_xx[block] += sign * (values * values)[:, None]
+                self._sum_xy[block] += sign * np.outer(values, values)
+                return
+
+        present = ~np.isnan(returns)
+        mask = present.astype(np.float64)
+        values = np.where(present, returns, 0.0)
+        # Для одной строки и для пачки строк (k x n) - одно матричное умножение
+        values = np.atleast_2d(values)
+        mask = np.atleast_2d(mask)
+        self._count += sign * (mask.T @ mask)
+        self._sum_x += sign * (values.T @ mask)
+        self._sum_xx += sign * ((values * values).T @ mask)
+        self._sum_xy += sign * (values.T @ values)
+
+    def add_symbols(self, symbols: List[str]) -> None:
+        """
+        Добавление новых символов (история для них начинается с пустого окна)
+
+        Args:
+            symbols: Символы
+        """
+        new = [symbol for symbol in symbols if symbol not in self._index]
+        if not new:
+            return
+        for symbol in new:
+            self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+        extra = len(new)
+        self._returns = np.hstack([self._returns, np.full((self.window, extra), np.nan)])
+        self._last_close = np.concatenate([self._last_close, np.full(extra, np.nan)])
+        self._symbol_timestamps = np.concatenate([
+            self._symbol_timestamps, np.full(extra, NO_TIMESTAMP, dtype=np.int64)
+        ])
+        for name in ('_count', '_sum_x', '_sum_xx', '_sum_xy'):
+            setattr(self, name, np.pad(getattr(self, name), ((0, extra), (0, extra))))
+
+    def retain(self, symbols: List[str]) -> int:
+        """
+        Удаление символов, которых нет в списке (отключенные и удаленные из
+        универсума), чтобы матрицы не росли вместе с историей универсума
+
+        Args:
+            symbols: Символы, которые остаются в матрице
+
+        Returns:
+            int: Количество удаленных символов
+        """
+        wanted = set(symbols)
+        keep = np.array([i for i, symbol in enumerate(self.symbols) if symbol in wanted], dtype=np.int64)
+        removed = len(self.symbols) - len(keep)
+        if not removed:
+            return 0
+
+        self.symbols = [self.symbols[i] for i in keep]
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._returns = self._returns[:, keep]
+        self._last_close = self._last_close[keep]
+        self._symbol_timestamps = self._symbol_timestamps[keep]
+        # Суммы оставшихся пар не зависят от удаленных символов: берем подматрицы
+        block = np.ix_(keep, keep)
+        for name in ('_count', '_sum_x', '_sum_xx', '_sum_xy'):
+            setattr(self, name, getattr(self, name)[block])
+        return removed
+
+    @property
+    def last_timestamp(self) -> int:
+        """Время последнего бара окна, нс (NO_TIMESTAMP для пустого окна)"""
+        if self._filled == 0:
+            return NO_TIMESTAMP
+        return int(self._row_timestamps[(self._position - 1) % self.window])
+
+    def push(self, returns: np.ndarray, timestamp: int = NO_TIMESTAMP) -> None:
+        """
+        Добавление строки доходностей в порядке self.symbols
+
+        Args:
+            returns: Доходности бара (NaN - нет данных)
+            timestamp: Время бара, нс
+        """
+        if self._filled == self.window:
+            self._accumulate(self._returns[self._position], -1.0)
+        self._returns[self._position] = returns
+        self._row_timestamps[self._position] = timestamp
+        self._accumulate(returns, 1.0)
+        self._position = (self._position + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+        # Полный пересчет раз за окно убирает накопленную ошибку округления
+        if self._position == 0:
+            self.recompute()
+
+    def recompute(self) -> None:
+        """Пересчет попарных сумм по окну"""
+        self._reset_sums()
+        rows = self._returns if self._filled == self.window else self._returns[:self._filled]
+        if len(rows):
+            self._accumulate(rows, 1.0)
+
+    def update(self, closes: Dict[str, pd.Series]) -> int:
+        """
+        Добавление баров, появившихся после предыдущего обновления символа
+
+        Символы могут обновляться в разное время (сканирование с разной
+        частотой): доходность за бар, который уже есть в окне, дописывается
+        в его строку - вклад строки пересчитывается без полного пересчета.
+
+        Args:
+            closes: Цены закрытия по символам (индекс - время бара)
+
+        Returns:
+            int: Количество новых строк окна
+        """
+        closes = {symbol: series for symbol, series in closes.items() if series is not None and len(series)}
+        if not closes:
+            return 0
+        self.add_symbols(sorted(closes))
+
+        # Время бара -> {колонка: доходность}
+        updates: Dict[int, Dict[int, float]] = {}
+        for symbol, series in closes.items():
+            column = self._index[symbol]
+            series = series.dropna().sort_index()
+            timestamps = _to_nanoseconds(series.index)
+            values = series.to_numpy(dtype=np.float64)
+
+            fresh = timestamps > self._symbol_timestamps[column]
+            timestamps, values = timestamps[fresh], values[fresh]
+            if self._symbol_timestamps[column] == NO_TIMESTAMP:
+                # Первое обновление символа: окно плюс бар для первой доходности
+                timestamps, values = timestamps[-(self.window + 1):], values[-(self.window + 1):]
+            if not len(values):
+                continue
+
+            previous = np.concatenate([[self._last_close[column]], values[:-1]])
+            returns = values / previous - 1.0
+            for timestamp, value in zip(timestamps, returns):
+                if np.isfinite(value):
+                    updates.setdefault(int(timestamp), {})[column] = value
+            self._last_close[column] = values[-1]
+            self._symbol_timestamps[column] = timestamps[-1]
+
+        added = 0
+        for timestamp in sorted(updates):
+            columns = np.fromiter(updates[timestamp].keys(), dtype=np.int64)
+            values = np.fromiter(updates[timestamp].values(), dtype=np.float64)
+            if timestamp > self.last_timestamp:
+                row = np.full(len(self.symbols), np.nan)
+                row[columns] = values
+                self.push(row, timestamp)
+                added += 1
+                continue
+
+            positions = np.nonzero(self._row_timestamps[:self._filled] == timestamp)[0]
+            if len(positions):
+                # Бар уже в окне: заменяем вклад строки
+                position = positions[0]
+                self._accumulate(self._returns[position], -1.0)
+                self._returns[position, columns] = values
+                self._accumulate(self._returns[position], 1.0)
+        return added
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Текущая матрица корреляций
+
+        Returns:
+            Tuple[List[str], np.ndarray]: Символы и матрица n x n
+                (NaN для пар с недостаточным числом наблюдений)
+        """
+        n = self._count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            covariance = n * self._sum_xy - self._sum_x * self._sum_x.T
+            variance = n * self._sum_xx - self._sum_x ** 2
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr[n < self.min_observations] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+        return list(self.symbols), corr
+
+    def pairs(self, min_abs: float = 0.0) -> List[Tuple[str, str, float, int]]:
+        """
+        Пары символов с |корреляцией| не ниже порога
+
+        Args:
+            min_abs: Порог модуля корреляции
+
+        Returns:
+            List[Tuple[str, str, float, int]]: (symbol, other_symbol, корреляция, наблюдений),
+                symbol < other_symbol
+        """
+        symbols, corr = self.matrix()
+        order = np.argsort(symbols)
+        corr = corr[np.ix_(order, order)]
+        count = self._count[np.ix_(order, order)]
+        names = [symbols[i] for i in order]
+
+        with np.errstate(invalid='ignore'):
+            upper = np.triu(np.abs(corr) >= min_abs, k=1)
+        rows, cols = np.nonzero(upper)
+        return [
+            (names[i], names[j], float(corr[i, j]), int(count[i, j]))
+            for i, j in zip(rows, cols)
+        ]
+
+
+def group_leaders(
+    confidences: np.ndarray,
+    directions: np.ndarray,
+    correlation: np.ndarray,
+    threshold: float
+) -> np.ndarray:
+    """
+    Схлопывание коррелированных сигналов в группы
+
+    Сигналы обходятся по убыванию уверенности: сигнал без группы становится
+    лидером, а остальные сигналы того же направления с корреляцией к нему
+    не ниже порога - его последователями.
+
+    Args:
+        confidences: Уверенность сигналов (k)
+        directions: Направление сигналов (k), например 'BUY'/'SELL'
+        correlation: Корреляции символов сигналов (k x k, NaN - неизвестно)
+        threshold: Порог корреляции
+
+    Returns:
+        np.ndarray: Индекс лидера для каждого сигнала (лидер указывает на себя)
+    """
+    k = len(confidences)
+    with np.errstate(invalid='ignore'):
+        linked = (correlation >= threshold) & (directions[:, None] == directions[None, :])
+    leaders = np.full(k, -1)
+    for i in np.argsort(-np.asarray(confidences), kind='stable'):
+        if leaders[i] != -1:
+            continue
+        followers = linked[i] & (leaders == -1)
+        leaders[followers] = i
+        leaders[i] = i
+    return leaders
@@ -0,0 +1,74 @@
+"""
+Расчет набора индикаторов для алгоритмов генерации сигналов.
+
+Ключи результата совпадают с полями схемы снимка
+(src.database.snapshot), поэтому снимок сохраняется в сигнал без
+преобразований.
+"""
+
+from typing import Dict, Optional
+
+import pandas as pd
+
+from src.indicators.macd import calculate_macd
+from src.indicators.moving_averages import calculate_ema, calculate_sma
+from src.indicators.obv import calculate_obv, calculate_obv_ema
+from src.indicators.rsi import calculate_rsi
+from src.indicators.vroc import calculate_vroc
+
+
+def calculate_indicator_frame(candles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Все индикаторы по каждой свече
+
+    Args:
+        candles: Свечи с колонками open/high/low/close/volume
+
+    Returns:
+        pd.DataFrame: Индикаторы, индекс совпадает со свечами
+    """
+    close = candles['close']
+    volume = candles['volume']
+    macd, macd_signal, macd_hist = calculate_macd(close)
+    obv = calculate_obv(close, volume)
+    rsi = calculate_rsi(close)
+
+    return pd.DataFrame({
+        'close': close,
+        'close_prev': close.shift(1),
+        'volume': volume,
+        'volume_sma_20': calculate_sma(volume, 20),
+        'rsi': rsi,
+        'rsi_prev': rsi.shift(1),
+        'ema_12': calculate_ema(close, 12),
+        'sma_20': calculate_sma(close, 20),
+        'sma_50': calculate_sma(close, 50),
+        'sma_100': calculate_sma(close, 100),
+        'sma_200': calculate_sma(close, 200),
+        'macd': macd,
+        'macd_prev': macd.shift(1),
+        'macd_signal': macd_signal,
+        'macd_signal_prev': macd_signal.shift(1),
+        'macd_hist': macd_hist,
+        'macd_hist_prev': macd_hist.shift(1),
+        'obv': obv,
+        'obv_ema': calculate_obv_ema(obv),
+        'vroc': calculate_vroc(volume),
+    }, index=candles.index)
+
+
+def calculate_features(candles: pd.DataFrame) -> Optional[Dict[str, float]]:
+    """
+    Значения индикаторов на последней свече
+
+    Args:
+        candles: Свечи с колонками open/high/low/close/volume
+
+    Returns:
+        Optional[Dict[str, float]]: Индикаторы (NaN при нехватке истории)
+            или None, если свечей меньше двух
+    """
+    if candles is None or len(candles) < 2:
+        return None
+    last = calculate_indicator_frame(candles).iloc[-1]
+    return {name: float(value) for name, value in last.items()}
@@ -0,0 +1,32 @@
+"""
+Индикатор MACD.
+"""
+
+from typing import Tuple
+
+import pandas as pd
+
+from src.indicators.moving_averages import calculate_ema
+
+
+def calculate_macd(
+    close: pd.Series,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    MACD, сигнальная линия и гистограмма
+
+    Args:
+        close: Цены закрытия
+        fast: Период быстрой EMA
+        slow: Период медленной EMA
+        signal: Период сигнальной линии
+
+    Returns:
+        Tuple[pd.Series, pd.Series, pd.Series]: (macd, signal, histogram)
+    """
+    macd = calculate_ema(close, fast) - calculate_ema(close, slow)
+    signal_line = macd.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return macd, signal_line, macd - signal_line
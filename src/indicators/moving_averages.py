@@ -0,0 +1,33 @@
+"""
+Скользящие средние.
+"""
+
+import pandas as pd
+
+
+def calculate_sma(series: pd.Series, period: int) -> pd.Series:
+    """
+    Простая скользящая средняя (SMA)
+
+    Args:
+        series: Ряд значений (обычно цена закрытия)
+        period: Период усреднения
+
+    Returns:
+        pd.Series: Значения SMA
+    """
+    return series.rolling(window=period, min_periods=period).mean()
+
+
+def calculate_ema(series: pd.Series, period: int) -> pd.Series:
+    """
+    Экспоненциальная скользящая средняя (EMA)
+
+    Args:
+        series: Ряд значений
+        period: Период усреднения
+
+    Returns:
+        pd.Series: Значения EMA
+    """
+    return series.ewm(span=period, adjust=False, min_periods=period).mean()
@@ -0,0 +1,37 @@
+"""
+Индикатор On-Balance Volume (OBV).
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.indicators.moving_averages import calculate_ema
+
+
+def calculate_obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+    """
+    On-Balance Volume
+
+    Args:
+        close: Цены закрытия
+        volume: Объемы
+
+    Returns:
+        pd.Series: Значения OBV
+    """
+    direction = np.sign(close.diff()).fillna(0)
+    return (direction * volume).cumsum()
+
+
+def calculate_obv_ema(obv: pd.Series, period: int = 20) -> pd.Series:
+    """
+    EMA от OBV для подтверждения тренда объема
+
+    Args:
+        obv: Значения OBV
+        period: Период EMA
+
+    Returns:
+        pd.Series: EMA OBV
+    """
+    return calculate_ema(obv, period)
@@ -0,0 +1,29 @@
+"""
+Индекс относительной силы (RSI).
+"""
+
+import pandas as pd
+
+
+def calculate_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """
+    RSI со сглаживанием Уайлдера
+
+    Args:
+        close: Цены закрытия
+        period: Период RSI
+
+    Returns:
+        pd.Series: Значения RSI (0-100)
+    """
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+
+    avg_gain = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+    rs = avg_gain / avg_loss
+    rsi = 100 - 100 / (1 + rs)
+    # Без падений за период RSI равен 100
+    return rsi.where(avg_loss != 0, 100.0)
@@ -0,0 +1,21 @@
+"""
+Индикатор Volume Rate of Change (VROC).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def calculate_vroc(volume: pd.Series, period: int = 14) -> pd.Series:
+    """
+    Скорость изменения объема в процентах
+
+    Args:
+        volume: Объемы
+        period: Период сравнения
+
+    Returns:
+        pd.Series: VROC в %
+    """
+    previous = volume.shift(period).replace(0, np.nan)
+    return (volume - previous) / previous * 100
@@ -0,0 +1,222 @@
+"""
+Цикл анализа: загрузка свечей, расчет индикаторов, запуск алгоритмов
+и сохранение сигналов через SignalRepository.
+"""
+
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.algorithms.registry import get_algorithm
+from src.data.fetcher import BASE_INTERVAL, get_candles
+from src.data.ohlcv_array import SharedOHLCVHandle, SharedOHLCVView
+from src.data.resampler import resample_closed, resampler
+from src.data.universe import get_asset_type
+from src.database.models import Signal
+from src.database.repository import signal_repository
+from src.indicators.features import calculate_features
+from src.scheduler.tiers import activity_metrics
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def analyze_symbol(symbol: str) -> Optional[Signal]:
+    """
+    Анализ одного символа
+
+    Args:
+        symbol: Символ актива
+
+    Returns:
+        Optional[Signal]: Созданный сигнал или None
+    """
+    algorithm = get_algorithm(get_asset_type(symbol))
+    candles = get_candles(symbol, algorithm.timeframe, algorithm.history_days)
+    return analyze_candles(symbol, candles)
+
+
+def analyze_candles(symbol: str, candles: Optional[pd.DataFrame]) -> Optional[Signal]:
+    """
+    Анализ символа по уже загруженным закрытым свечам
+
+    Args:
+        symbol: Символ актива
+        candles: Закрытые свечи на таймфрейме алгоритма
+
+    Returns:
+        Optional[Signal]: Созданный сигнал или None
+    """
+    algorithm = get_algorithm(get_asset_type(symbol))
+    features = calculate_features(candles)
+    if features is None:
+        logger.warning(f"Not enough data to analyze {symbol}")
+        return None
+
+    params = algorithm.generate_signal(symbol, features)
+    if params is None:
+        return None
+
+    if signal_repository.has_active_signal(symbol, params['signal_type']):
+        logger.info(f"Active {params['signal_type']} signal for {symbol} already exists, skipping")
+        return None
+
+    return signal_repository.create_signal(**params)
+
+
+def algorithm_candles(symbol: str, base: pd.DataFrame) -> pd.DataFrame:
+    """
+    Закрытые свечи на таймфрейме алгоритма из готового ряда базовых свечей
+
+    Args:
+        symbol: Символ актива
+        base: Закрытые свечи базового таймфрейма (опубликованные или записанные)
+
+    Returns:
+        pd.DataFrame: Свечи за history_days алгоритма
+    """
+    algorithm = get_algorithm(get_asset_type(symbol))
+    candles = resample_closed(base, algorithm.timeframe, BASE_INTERVAL)
+    if not candles.empty:
+        candles = candles[candles.index > candles.index[-1] - pd.Timedelta(days=algorithm.history_days)]
+    return candles
+
+
+def emit_signals(features: Dict[str, Dict[str, float]]) -> List[Signal]:
+    """
+    Пакетная оценка условий и сохранение сигналов
+
+    Символы группируются по алгоритму, условия всех символов группы
+    считаются одним пакетом, а прошедшие MIN_CONFIDENCE сигналы без
+    активного дубликата сохраняются одной транзакцией.
+
+    Args:
+        features: Индикаторы на последней свече по символам
+
+    Returns:
+        List[Signal]: Созданные сигналы
+    """
+    by_type: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for symbol, values in features.items():
+        by_type.setdefault(get_asset_type(symbol), {})[symbol] = values
+
+    candidates: List[Dict[str, Any]] = []
+    for asset_type, group in by_type.items():
+        frame = pd.DataFrame.from_dict(group, orient='index')
+        candidates.extend(get_algorithm(asset_type).generate_signals(frame))
+    if not candidates:
+        return []
+
+    active = signal_repository.get_active_signal_keys([params['symbol'] for params in candidates])
+    fresh = [params for params in candidates if (params['symbol'], params['signal_type']) not in active]
+    if len(fresh) < len(candidates):
+        logger.info(f"Skipped {len(candidates) - len(fresh)} signals: active signal of the same type exists")
+    return signal_repository.create_signals(fresh)
+
+
+def _shared_frame(view: SharedOHLCVView, symbol: str) -> Optional[pd.DataFrame]:
+    """Копия свечей символа из общей памяти (представление блока сюда не утекает)"""
+    shared = view.get(symbol)
+    return shared.to_frame() if shared is not None else None
+
+
+def recent_closes(symbol: str, base: Optional[pd.DataFrame] = None) -> Optional[pd.Series]:
+    """
+    Последние закрытые цены для матрицы корреляций (без запросов к источнику)
+
+    Args:
+        symbol: Символ актива
+        base: Базовые свечи символа (None - из ресемплера)
+
+    Returns:
+        Optional[pd.Series]: CORRELATION_WINDOW + 1 цен закрытия на CORRELATION_TIMEFRAME
+    """
+    if base is None:
+        candles = resampler.get(symbol, Config.CORRELATION_TIMEFRAME, closed_only=True)
+    else:
+        candles = resample_closed(base, Config.CORRELATION_TIMEFRAME, BASE_INTERVAL)
+    if candles is None or candles.empty:
+        return None
+    return candles['close'].iloc[-(Config.CORRELATION_WINDOW + 1):]
+
+
+def analyze_symbols(
+    symbols: List[str],
+    collect_closes: bool = False,
+    candles: Optional[SharedOHLCVHandle] = None
+) -> Dict[str, Any]:
+    """
+    Анализ набора символов с замером времени
+
+    Индикаторы считаются по каждому символу, а условия алгоритмов -
+    пакетом по всем символам (emit_signals).
+
+    Args:
+        symbols: Символы для анализа
+        collect_closes: Вернуть последние цены закрытия для матрицы корреляций
+        candles: Опубликованные базовые свечи (None - загрузка через fetcher)
+
+    Returns:
+        Dict[str, Any]: symbols, signals, errors, elapsed (с), metrics (метрики
+            активности по символам) и closes (символ -> pd.Series) при collect_closes
+    """
+    started = time.perf_counter()
+    signals = 0
+    errors = 0
+    metrics: Dict[str, Dict[str, Optional[float]]] = {}
+    closes: Dict[str, pd.Series] = {}
+    features: Dict[str, Dict[str, float]] = {}
+
+    # Блок общей памяти отключается и при исключении в цикле
+    with SharedOHLCVView(candles) if candles is not None else nullcontext() as view:
+        for symbol in symbols:
+            base = None
+            try:
+                if view is None:
+                    algorithm = get_algorithm(get_asset_type(symbol))
+                    symbol_candles = get_candles(symbol, algorithm.timeframe, algorithm.history_days)
+                else:
+                    # Свечи читаются из общей памяти; DataFrame живет только на время расчета символа
+                    base = _shared_frame(view, symbol)
+                    if base is None:
+                        logger.warning(f"No candles published for {symbol}")
+                    symbol_candles = algorithm_candles(symbol, base) if base is not None else None
+
+                symbol_features = calculate_features(symbol_candles)
+                if symbol_features is None:
+                    logger.warning(f"Not enough data to analyze {symbol}")
+                else:
+                    features[symbol] = symbol_features
+            except Exception as e:
+                errors += 1
+                logger.error(f"Error analyzing {symbol}: {e}", exc_info=True)
+
+            if view is None:
+                base = resampler.get(symbol, BASE_INTERVAL)
+            metrics[symbol] = activity_metrics(base)
+
+            if collect_closes and base is not None:
+                series = recent_closes(symbol, base if view is not None else None)
+                if series is not None:
+                    closes[symbol] = series
+
+    # Условия всех символов оцениваются пакетом, сигналы сохраняются одной транзакцией
+    try:
+        signals = len(emit_signals(features))
+    except Exception as e:
+        errors += len(features)
+        logger.error(f"Error emitting signals for {len(features)} symbols: {e}", exc_info=True)
+
+    report: Dict[str, Any] = {
+        'symbols': len(symbols),
+        'signals': signals,
+        'errors': errors,
+        'elapsed': time.perf_counter() - started,
+        'metrics': metrics,
+    }
+    if collect_closes:
+        report['closes'] = closes
+    return report
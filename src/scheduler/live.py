@@ -0,0 +1,180 @@
+"""
+Потоковый анализ (режим live).
+
+Свечи поступают из источника (src.data.live) в кольцевые буферы, а
+анализ запускается только для символа, бар которого закрылся на
+таймфрейме его алгоритма, - без ожидания ANALYSIS_INTERVAL_HOURS.
+"""
+
+import asyncio
+import math
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.algorithms.registry import get_algorithm
+from src.data.live import BarCloseHandler, CandleSource, CcxtCandleSource, LiveIngestor, ReplayCandleSource
+from src.data.resampler import TIMEFRAMES, bucket_start, resample_ohlcv
+from src.data.universe import get_asset_type
+from src.scheduler.analysis import analyze_candles
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def create_source(replay: Optional[str] = None, speed: float = 0.0) -> CandleSource:
+    """
+    Источник свечей по настройкам
+
+    Args:
+        replay: Путь к CSV для воспроизведения (None - биржа LIVE_EXCHANGE)
+        speed: Ускорение воспроизведения (0 - без пауз)
+
+    Returns:
+        CandleSource: Источник
+    """
+    if replay:
+        return ReplayCandleSource(replay, speed=speed, timeframe=Config.LIVE_TIMEFRAME)
+    return CcxtCandleSource(
+        exchange_id=Config.LIVE_EXCHANGE,
+        timeframe=Config.LIVE_TIMEFRAME,
+        poll_seconds=Config.LIVE_POLL_SECONDS,
+        use_websocket=Config.LIVE_USE_WEBSOCKET,
+        api_key=Config.BINANCE_API_KEY,
+        api_secret=Config.BINANCE_API_SECRET
+    )
+
+
+def candles_for_algorithm(symbol: str, candles: pd.DataFrame, base_timeframe: str) -> Optional[pd.DataFrame]:
+    """
+    Закрытые свечи на таймфрейме алгоритма символа
+
+    Args:
+        symbol: Символ актива
+        candles: Закрытые свечи базового таймфрейма
+        base_timeframe: Таймфрейм источника
+
+    Returns:
+        Optional[pd.DataFrame]: Свечи или None, если бар алгоритма еще не закрыт
+    """
+    timeframe = get_algorithm(get_asset_type(symbol)).timeframe
+    if timeframe == base_timeframe:
+        return candles
+
+    # Закрытие базового бара совпадает с границей бара алгоритма
+    bar_end = candles.index[-1] + TIMEFRAMES[base_timeframe]
+    if bucket_start(pd.DatetimeIndex([bar_end]), timeframe)[0] != bar_end:
+        return None
+    return resample_ohlcv(candles, timeframe)
+
+
+def required_candles(symbols: List[str], base_timeframe: str) -> int:
+    """
+    Глубина буфера, достаточная для алгоритмов символов
+
+    Args:
+        symbols: Символы
+        base_timeframe: Таймфрейм источника
+
+    Returns:
+        int: Максимум history_days алгоритмов в свечах base_timeframe
+    """
+    algorithms = {get_algorithm(get_asset_type(symbol)) for symbol in symbols}
+    return max(
+        (math.ceil(pd.Timedelta(days=algorithm.history_days) / TIMEFRAMES[base_timeframe]) for algorithm in algorithms),
+        default=0
+    )
+
+
+def create_bar_close_handler(base_timeframe: str, executor: ThreadPoolExecutor) -> BarCloseHandler:
+    """
+    Обработчик закрытия бара: анализ символа в пуле потоков
+
+    Args:
+        base_timeframe: Таймфрейм источника
+        executor: Пул для блокирующих расчетов и записи в БД
+
+    Returns:
+        BarCloseHandler: Обработчик для LiveIngestor
+    """
+    async def on_bar_close(symbol: str, candles: pd.DataFrame) -> None:
+        candles = candles_for_algorithm(symbol, candles, base_timeframe)
+        if candles is None:
+            return
+        loop = asyncio.get_running_loop()
+        created = await loop.run_in_executor(executor, analyze_candles, symbol, candles)
+        if created is not None:
+            logger.info(f"Live {created.signal_type} signal for {symbol} at {candles.index[-1]}")
+
+    return on_bar_close
+
+
+async def run_ingestor(
+    source: CandleSource,
+    symbols: List[str],
+    capacity: int = 0,
+    threads: int = 4,
+    coalesce: bool = True
+) -> Dict[str, Any]:
+    """
+    Прием потока и анализ по закрытию баров до окончания потока
+
+    Args:
+        source: Источник свечей
+        symbols: Символы
+        capacity: Размер буфера (0 - LIVE_BUFFER_CANDLES, но не меньше
+            истории алгоритмов символов, см. required_candles)
+        threads: Потоков для анализа
+        coalesce: Схлопывать закрытия баров, пришедшие во время анализа символа
+
+    Returns:
+        Dict[str, Any]: Статистика LiveIngestor
+    """
+    if not capacity:
+        # Иначе дневной SMA200 на часовых свечах не наберет истории и символ не дает сигналов
+        required = required_candles(symbols, source.timeframe)
+        capacity = max(Config.LIVE_BUFFER_CANDLES, required)
+        if capacity > Config.LIVE_BUFFER_CANDLES:
+            logger.info(f"Live buffer enlarged to {capacity} {source.timeframe} candles for algorithm history")
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='live-analysis') as executor:
+        ingestor = LiveIngestor(
+            source,
+            create_bar_close_handler(source.timeframe, executor),
+            capacity=capacity,
+            max_concurrent=threads,
+            coalesce=coalesce
+        )
+        await ingestor.run(symbols)
+    return ingestor.stats
+
+
+def run_live(symbols: Optional[List[str]] = None, replay: Optional[str] = None, speed: float = 0.0) -> None:
+    """
+    Запуск режима live
+
+    Args:
+        symbols: Символы (по умолчанию LIVE_SYMBOLS или CRYPTO_SYMBOLS)
+        replay: Путь к CSV для воспроизведения вместо биржи
+        speed: Ускорение воспроизведения
+    """
+    symbols = symbols or Config.LIVE_SYMBOLS or Config.CRYPTO_SYMBOLS
+
+    async def main() -> None:
+        # При воспроизведении без пауз анализируется каждый бар
+        coalesce = not (replay and speed <= 0)
+        task = asyncio.create_task(run_ingestor(create_source(replay, speed), symbols, coalesce=coalesce))
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, task.cancel)
+        try:
+            stats = await task
+            logger.info(f"Live stream finished: {stats}")
+        except asyncio.CancelledError:
+            logger.info("Live mode shutting down...")
+
+    logger.info(f"Live analysis for {len(symbols)} symbols ({'replay ' + replay if replay else Config.LIVE_EXCHANGE})")
+    asyncio.run(main())
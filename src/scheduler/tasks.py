@@ -0,0 +1,48 @@
+"""
+Фоновые задачи по расписанию.
+"""
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from src.database.repository import signal_repository
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def archive_old_signals() -> int:
+    """
+    Перенос закрытых сигналов старше SIGNAL_RETENTION_DAYS в архив
+
+    Returns:
+        int: Количество перенесенных сигналов
+    """
+    logger.info("Running signal retention job...")
+    try:
+        return signal_repository.archive_closed_signals(Config.SIGNAL_RETENTION_DAYS)
+    except Exception as e:
+        logger.error(f"Signal retention job failed: {e}", exc_info=True)
+        return 0
+
+
+def create_scheduler() -> BackgroundScheduler:
+    """
+    Создание планировщика с зарегистрированными задачами
+
+    Returns:
+        BackgroundScheduler: Планировщик (не запущен)
+    """
+    scheduler = BackgroundScheduler(timezone=Config.TIMEZONE)
+
+    # Архивация раз в сутки в часы минимальной нагрузки
+    scheduler.add_job(
+        archive_old_signals,
+        'cron',
+        hour=3,
+        minute=30,
+        id='archive_old_signals',
+        coalesce=True,
+        max_instances=1
+    )
+
+    return scheduler
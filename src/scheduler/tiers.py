@@ -0,0 +1,207 @@
+"""
+Адаптивная частота сканирования универсума.
+
+Символы ранжируются по активности (волатильность и относительный объем
+последних свечей) и распределяются по уровням с разными интервалами
+сканирования: активные символы анализируются часто, спокойные - редко.
+Распределение подбирается так, чтобы ожидаемое число сканирований в час
+(загрузки свечей и расчеты) не превышало SCAN_BUDGET_PER_HOUR.
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.database.models import UniverseSymbol
+from src.database.repository import universe_repository
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Свечей для оценки текущей активности (сутки часовых свечей)
+ACTIVITY_LOOKBACK = 24
+
+
+def activity_metrics(candles: Optional[pd.DataFrame], lookback: int = ACTIVITY_LOOKBACK) -> Dict[str, Optional[float]]:
+    """
+    Метрики активности символа
+
+    Args:
+        candles: Свечи с колонками close/volume
+        lookback: Количество последних свечей
+
+    Returns:
+        Dict[str, Optional[float]]: volatility (СКО лог-доходностей последних свечей)
+            и volume_ratio (средний объем последних свечей к среднему по истории)
+    """
+    if candles is None or len(candles) < 3:
+        return {'volatility': None, 'volume_ratio': None}
+
+    close = candles['close'].to_numpy(dtype=np.float64)[-(lookback + 1):]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(close))
+    returns = returns[np.isfinite(returns)]
+    volatility = float(returns.std()) if len(returns) > 1 else None
+
+    volume = candles['volume'].to_numpy(dtype=np.float64)
+    average = volume.mean()
+    volume_ratio = float(volume[-lookback:].mean() / average) if average > 0 else None
+
+    return {'volatility': volatility, 'volume_ratio': volume_ratio}
+
+
+def activity_scores(volatility: np.ndarray, volume_ratio: np.ndarray) -> np.ndarray:
+    """
+    Оценка активности символов
+
+    Args:
+        volatility: Волатильность (NaN - не измерялась)
+        volume_ratio: Относительный объем (NaN - не измерялся)
+
+    Returns:
+        np.ndarray: Среднее процентильных рангов метрик (0-1);
+            символы без метрик получают inf и сканируются первыми
+    """
+    ranks = np.vstack([
+        pd.Series(volatility, dtype=np.float64).rank(pct=True).to_numpy(),
+        pd.Series(volume_ratio, dtype=np.float64).rank(pct=True).to_numpy(),
+    ])
+    measured = (~np.isnan(ranks)).sum(axis=0)
+    return np.where(measured > 0, np.nansum(ranks, axis=0) / np.maximum(measured, 1), np.inf)
+
+
+def assign_tiers(scores: np.ndarray, intervals: Sequence[float], budget_per_hour: float) -> Tuple[np.ndarray, float]:
+    """
+    Распределение символов по уровням в пределах бюджета
+
+    Символы обходятся по убыванию активности; каждому достается самый
+    частый уровень, при котором для всех оставшихся символов еще хватает
+    бюджета на самый редкий уровень. Небольшой универсум целиком попадает
+    в уровень 0.
+
+    Args:
+        scores: Оценки активности
+        intervals: Интервалы уровней в минутах по возрастанию
+        budget_per_hour: Бюджет сканирований в час
+
+    Returns:
+        Tuple[np.ndarray, float]: Уровень каждого символа и ожидаемое число сканирований в час
+    """
+    rates = 60.0 / np.asarray(intervals, dtype=np.float64)
+    coldest = rates[-1]
+    tiers = np.empty(len(scores), dtype=np.int64)
+    load = 0.0
+
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    for position, index in enumerate(order):
+        reserve = (len(order) - position - 1) * coldest
+        for tier, rate in enumerate(rates):
+            if load + rate + reserve <= budget_per_hour or tier == len(rates) - 1:
+                tiers[index] = tier
+                load += rate
+                break
+    return tiers, load
+
+
+class TieredScanScheduler:
+    """Выбор символов для очередного цикла анализа"""
+
+    def __init__(
+        self,
+        intervals: Optional[Sequence[float]] = None,
+        budget_per_hour: float = 0,
+        cycle_minutes: float = 0
+    ):
+        """
+        Инициализация планировщика
+
+        Args:
+            intervals: Интервалы уровней в минутах (по умолчанию SCAN_TIER_MINUTES)
+            budget_per_hour: Бюджет сканирований в час (0 - SCAN_BUDGET_PER_HOUR)
+            cycle_minutes: Период цикла анализа (0 - SCAN_CYCLE_MINUTES)
+        """
+        self.intervals = sorted(intervals or Config.SCAN_TIER_MINUTES)
+        self.budget_per_hour = budget_per_hour or Config.SCAN_BUDGET_PER_HOUR
+        self.cycle_minutes = cycle_minutes or Config.SCAN_CYCLE_MINUTES
+        # Растяжение интервалов, если даже самый редкий уровень не укладывается в бюджет
+        self.stretch = 1.0
+        # Включенные символы универсума на момент последнего plan()
+        self.universe: List[str] = []
+
+    def retier(self, symbols: List[UniverseSymbol]) -> np.ndarray:
+        """
+        Пересчет уровней по последним метрикам и сохранение изменений
+
+        Args:
+            symbols: Символы универсума
+
+        Returns:
+            np.ndarray: Уровни символов
+        """
+        volatility = np.array([np.nan if s.volatility is None else s.volatility for s in symbols])
+        volume_ratio = np.array([np.nan if s.volume_ratio is None else s.volume_ratio for s in symbols])
+        tiers, load = assign_tiers(activity_scores(volatility, volume_ratio), self.intervals, self.budget_per_hour)
+        self.stretch = max(1.0, load / self.budget_per_hour)
+
+        changed = {s.symbol: int(tier) for s, tier in zip(symbols, tiers) if s.tier != tier}
+        universe_repository.update_tiers(changed)
+        if changed:
+            counts = np.bincount(tiers, minlength=len(self.intervals))
+            logger.info(
+                f"Scan tiers updated ({len(changed)} changed): "
+                + ", ".join(f"{int(m)}m x{c}" for m, c in zip(self.intervals, counts))
+                + f", expected {load:.0f} scans/hour"
+            )
+        return tiers
+
+    def plan(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Символы для очередного цикла
+
+        Символ готов к сканированию, когда с прошлого сканирования прошел
+        интервал его уровня (с допуском в полцикла). Из готовых выбираются
+        наиболее просроченные в пределах бюджета цикла.
+
+        Args:
+            now: Время начала цикла (UTC)
+
+        Returns:
+            List[str]: Символы
+        """
+        now = now or datetime.utcnow()
+        symbols = universe_repository.get_symbols()
+        self.universe = [s.symbol for s in symbols]
+        if not symbols:
+            return []
+
+        tiers = self.retier(symbols)
+        intervals = np.asarray(self.intervals, dtype=np.float64)[tiers] * self.stretch
+        elapsed = np.array([
+            np.inf if s.last_scanned_at is None else (now - s.last_scanned_at).total_seconds() / 60
+            for s in symbols
+        ])
+        due = elapsed >= intervals - self.cycle_minutes / 2
+        overdue = np.where(due, elapsed / intervals, -np.inf)
+
+        capacity = math.ceil(self.budget_per_hour * self.cycle_minutes / 60)
+        order = np.argsort(-overdue, kind='stable')[:min(capacity, int(due.sum()))]
+        selected = [symbols[i].symbol for i in order]
+        logger.info(f"Scan plan: {len(selected)} of {int(due.sum())} due symbols ({len(symbols)} in universe)")
+        return selected
+
+    def record(self, reports: List[Dict[str, Any]], scanned_at: datetime) -> None:
+        """
+        Сохранение результатов цикла
+
+        Args:
+            reports: Отчеты шардов с metrics
+            scanned_at: Время начала цикла
+        """
+        metrics: Dict[str, Dict[str, Optional[float]]] = {}
+        for report in reports:
+            metrics.update(report.get('metrics', {}))
+        universe_repository.record_scans(metrics, scanned_at)
@@ -0,0 +1,339 @@
+"""
+Отдельный процесс анализа (режим worker).
+
+Символы закреплены за шардами (ShardAssignment), каждый шард - за своим процессом, поэтому
+кэш свечей процесса (src.data.resampler) хранит только его символы. Результаты
+попадают в бот только через SignalRepository (БД), поэтому процесс бота
+не тратит время на загрузку данных и расчет индикаторов.
+"""
+
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional
+
+from src.data.ohlcv_array import SharedOHLCVBlock, SharedOHLCVHandle, load_candles_csv
+from src.data.universe import sync_universe
+from src.database.repository import correlation_repository
+from src.indicators.correlation import RollingCorrelation
+from src.scheduler.tiers import TieredScanScheduler
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Пары слабее этого порога не сохраняются: порог группировки можно
+# менять без пересчета, а таблица остается небольшой
+STORED_CORRELATION_MIN = 0.5
+
+
+def stored_correlation_min() -> float:
+    """
+    Минимальная |корреляция| сохраняемых пар
+
+    Returns:
+        float: STORED_CORRELATION_MIN или CORRELATION_THRESHOLD, если он ниже
+            (иначе пары, нужные группировке, не попадали бы в таблицу)
+    """
+    return min(STORED_CORRELATION_MIN, Config.CORRELATION_THRESHOLD)
+
+
+class ShardAssignment:
+    """
+    Закрепление символов за шардами
+
+    Символ закрепляется при первом появлении за шардом с наименьшим числом
+    символов и остается в нем, пока отслеживается: при адаптивной частоте
+    каждый цикл анализирует свой набор символов, а свечи символа уже лежат
+    в кэше процесса его шарда. Отдельные циклы могут быть неравномерными,
+    но весь универсум делится почти поровну (13 символов на 4 процесса -
+    4, 3, 3, 3).
+    """
+
+    def __init__(self, shards: int):
+        """
+        Инициализация
+
+        Args:
+            shards: Количество шардов
+        """
+        self.shards = max(1, shards)
+        self._shard_of: Dict[str, int] = {}
+        self._load = [0] * self.shards
+
+    def assign(self, symbols: List[str], keep: Optional[List[str]] = None) -> Dict[int, List[str]]:
+        """
+        Разбиение символов цикла на шарды
+
+        Args:
+            symbols: Символы цикла
+            keep: Отслеживаемые символы; остальные открепляются, освобождая
+                место в шардах (None - ничего не открепляется)
+
+        Returns:
+            Dict[int, List[str]]: Непустые шарды по номерам
+        """
+        if keep is not None:
+            wanted = set(keep) | set(symbols)
+            for symbol in [symbol for symbol in self._shard_of if symbol not in wanted]:
+                self._load[self._shard_of.pop(symbol)] -= 1
+
+        buckets: Dict[int, List[str]] = {}
+        for symbol in symbols:
+            shard = self._shard_of.get(symbol)
+            if shard is None:
+                shard = min(range(self.shards), key=self._load.__getitem__)
+                self._shard_of[symbol] = shard
+                self._load[shard] += 1
+            buckets.setdefault(shard, []).append(symbol)
+        return buckets
+
+    def owned(self) -> Dict[int, List[str]]:
+        """
+        Все закрепленные символы по шардам
+
+        Returns:
+            Dict[int, List[str]]: Символы каждого шарда (пустой список для пустого шарда)
+        """
+        owned: Dict[int, List[str]] = {shard: [] for shard in range(self.shards)}
+        for symbol, shard in self._shard_of.items():
+            owned[shard].append(symbol)
+        return owned
+
+
+def _init_process() -> None:
+    """Инициализация дочернего процесса: остановкой управляет родитель"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _run_shard(
+    shard_id: int,
+    symbols: List[str],
+    candles: Optional[SharedOHLCVHandle] = None,
+    owned: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Анализ шарда в дочернем процессе
+
+    Args:
+        shard_id: Номер шарда
+        symbols: Символы шарда
+        candles: Дескриптор опубликованных свечей (None - загрузка через fetcher)
+        owned: Все символы, закрепленные за шардом; свечи остальных
+            символов удаляются из кэша процесса
+
+    Returns:
+        Dict[str, Any]: Отчет шарда (см. analyze_symbols) с shard и pid
+    """
+    from src.data.resampler import resampler
+    from src.scheduler.analysis import analyze_symbols
+
+    if owned is not None:
+        keep = set(owned)
+        for symbol in resampler.symbols():
+            if symbol not in keep:
+                resampler.clear(symbol)
+
+    report = analyze_symbols(symbols, collect_closes=Config.SIGNAL_GROUPING_ENABLED, candles=candles)
+    report['shard'] = shard_id
+    report['pid'] = os.getpid()
+    return report
+
+
+class AnalysisWorkerPool:
+    """
+    Пул процессов анализа
+
+    Каждый шард выполняется в своем однопроцессном executor. Общий пул
+    отдавал бы шард любому свободному процессу, и со временем каждый
+    процесс загружал бы полную историю и держал в кэше почти все символы.
+    """
+
+    def __init__(self, processes: int = 0):
+        """
+        Инициализация пула
+
+        Args:
+            processes: Количество процессов (и шардов; 0 - по числу ядер)
+        """
+        self.processes = processes or os.cpu_count() or 1
+        # Матрица корреляций всех символов: шарды видят только свою часть
+        self.correlation = RollingCorrelation(Config.CORRELATION_WINDOW, Config.CORRELATION_MIN_OBSERVATIONS)
+        self._executors = [self._start_executor() for _ in range(self.processes)]
+        self.assignment = ShardAssignment(self.processes)
+        logger.info(f"Analysis worker pool started: {self.processes} processes")
+
+    def run_cycle(
+        self,
+        symbols: List[str],
+        candles: Optional[SharedOHLCVHandle] = None,
+        tracked: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Один цикл анализа всех символов
+
+        Args:
+            symbols: Символы для анализа
+            candles: Свечи, опубликованные в общей памяти (процессы читают
+                их без копирования вместо загрузки из источника)
+            tracked: Символы, которые остаются в матрице корреляций и в кэше
+                свечей процессов (по умолчанию - symbols)
+
+        Returns:
+            List[Dict[str, Any]]: Отчеты шардов
+        """
+        started = time.perf_counter()
+        shards = self.assignment.assign(symbols, keep=tracked if tracked is not None else symbols)
+        # Процесс забывает свечи символов, ушедших из шарда (записанные свечи не кэшируются)
+        owned = self.assignment.owned() if candles is None else None
+        futures = {
+            self._executors[shard_id].submit(
+                _run_shard, shard_id, shard, candles, owned.get(shard_id, []) if owned is not None else None
+            ): shard_id
+            for shard_id, shard in shards.items()
+        }
+
+        reports = []
+        for future in as_completed(futures):
+            shard_id = futures[future]
+            try:
+                report = future.result()
+            except BrokenProcessPool as e:
+                # Процесс шарда умер: новый процесс заново загрузит историю своих символов
+                logger.error(f"Shard {shard_id} process died: {e}")
+                self._executors[shard_id].shutdown(wait=False, cancel_futures=True)
+                self._executors[shard_id] = self._start_executor()
+                continue
+            except Exception as e:
+                logger.error(f"Shard {shard_id} failed: {e}", exc_info=True)
+                continue
+            reports.append(report)
+            logger.info(
+                f"Shard {report['shard']} (pid {report['pid']}): {report['symbols']} symbols, "
+                f"{report['signals']} signals, {report['errors']} errors in {report['elapsed']:.2f}s"
+            )
+
+        if Config.SIGNAL_GROUPING_ENABLED:
+            self.update_correlations(reports, tracked if tracked is not None else symbols)
+
+        wall = time.perf_counter() - started
+        busy = sum(report['elapsed'] for report in reports)
+        logger.info(
+            f"Analysis cycle finished: {len(symbols)} symbols, "
+            f"{sum(report['signals'] for report in reports)} signals in {wall:.2f}s "
+            f"(parallel efficiency {busy / wall if wall > 0 else 0:.1f}x)"
+        )
+        return sorted(reports, key=lambda report: report['shard'])
+
+    @staticmethod
+    def _start_executor() -> ProcessPoolExecutor:
+        """Процесс шарда (spawn: собственное подключение к БД)"""
+        return ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn'), initializer=_init_process)
+
+    def update_correlations(self, reports: List[Dict[str, Any]], tracked: List[str]) -> None:
+        """
+        Обновление матрицы корреляций ценами из отчетов шардов и сохранение в БД
+
+        Матрица занимает O(n^2) памяти, поэтому в ней остаются только
+        символы, которые могут дать сигнал (tracked); отключенные и
+        удаленные из универсума символы из нее выбрасываются.
+
+        Args:
+            reports: Отчеты шардов с closes
+            tracked: Символы, которые остаются в матрице
+        """
+        wanted = set(tracked)
+        closes: Dict[str, Any] = {}
+        for report in reports:
+            closes.update((symbol, series) for symbol, series in report.get('closes', {}).items() if symbol in wanted)
+
+        try:
+            removed = self.correlation.retain(tracked)
+            if removed:
+                logger.info(f"Correlation matrix: dropped {removed} symbols no longer tracked")
+            added = self.correlation.update(closes)
+            pairs = self.correlation.pairs(min_abs=stored_correlation_min())
+            correlation_repository.replace_correlations(pairs)
+            logger.info(f"Correlation matrix: {len(self.correlation.symbols)} symbols, {added} new bars")
+        except Exception as e:
+            logger.error(f"Error updating correlations: {e}", exc_info=True)
+
+    def shutdown(self) -> None:
+        """Остановка пула"""
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        logger.info("Analysis worker pool stopped")
+
+
+def run_recorded(path: str, processes: int = 0, float32: bool = False) -> List[Dict[str, Any]]:
+    """
+    Один цикл анализа по записанным свечам (CSV формата ReplayCandleSource)
+
+    Свечи загружаются один раз в родительском процессе и публикуются в
+    общую память; процессы пула получают только дескриптор блока.
+
+    Args:
+        path: Путь к CSV
+        processes: Количество процессов (0 - ANALYSIS_WORKERS или число ядер)
+        float32: Хранить значения в float32
+
+    Returns:
+        List[Dict[str, Any]]: Отчеты шардов
+    """
+    arrays = load_candles_csv(path, float32=float32)
+    pool = AnalysisWorkerPool(processes or Config.ANALYSIS_WORKERS)
+    try:
+        with SharedOHLCVBlock(arrays, float32=float32) as block:
+            del arrays
+            return pool.run_cycle(list(block.handle.index), candles=block.handle)
+    finally:
+        pool.shutdown()
+
+
+def run_worker(processes: int = 0, once: bool = False, symbols: Optional[List[str]] = None) -> None:
+    """
+    Запуск режима worker: цикл анализа каждые SCAN_CYCLE_MINUTES
+
+    Args:
+        processes: Количество процессов (0 - ANALYSIS_WORKERS или число ядер)
+        once: Выполнить один цикл и завершиться
+        symbols: Анализировать эти символы каждый цикл (по умолчанию - универсум
+            с адаптивной частотой, см. src.scheduler.tiers)
+    """
+    stop = threading.Event()
+
+    def shutdown_handler(sig, frame):
+        logger.info("Worker shutting down...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, shutdown_handler)
+    signal.signal(signal.SIGTERM, shutdown_handler)
+
+    scheduler = None
+    if symbols is None:
+        sync_universe()
+        scheduler = TieredScanScheduler()
+
+    pool = AnalysisWorkerPool(processes or Config.ANALYSIS_WORKERS)
+    interval = Config.SCAN_CYCLE_MINUTES * 60
+
+    try:
+        while not stop.is_set():
+            cycle_started = time.monotonic()
+            if scheduler is None:
+                pool.run_cycle(symbols)
+            else:
+                scanned_at = datetime.utcnow()
+                batch = scheduler.plan(scanned_at)
+                if batch:
+                    scheduler.record(pool.run_cycle(batch, tracked=scheduler.universe), scanned_at)
+            if once:
+                break
+            stop.wait(max(0.0, interval - (time.monotonic() - cycle_started)))
+    finally:
+        pool.shutdown()
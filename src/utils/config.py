@@ -17,6 +17,11 @@ class Config:
     # Telegram
     TELEGRAM_BOT_TOKEN: str = os.getenv('TELEGRAM_BOT_TOKEN', '')
 
+    # ID администраторов бота (через запятую)
+    ADMIN_IDS: List[int] = [
+        int(admin_id) for admin_id in os.getenv('ADMIN_IDS', '').split(',') if admin_id.strip()
+    ]
+
     # Database
     DATABASE_URL: str = os.getenv('DATABASE_URL', 'sqlite:///./bot_database.db')
 
@@ -26,10 +31,53 @@ class Config:
 
     # Settings
     ANALYSIS_INTERVAL_HOURS: int = int(os.getenv('ANALYSIS_INTERVAL_HOURS', '1'))
+    # Количество процессов анализа в режиме worker (0 - по числу ядер)
+    ANALYSIS_WORKERS: int = int(os.getenv('ANALYSIS_WORKERS', '0'))
+    # Универсум символов: CSV/JSON с метаданными (пусто - списки *_SYMBOLS ниже)
+    UNIVERSE_FILE: str = os.getenv('UNIVERSE_FILE', '')
+    # Адаптивное сканирование: период цикла, интервалы уровней (мин) и бюджет
+    SCAN_CYCLE_MINUTES: int = int(os.getenv('SCAN_CYCLE_MINUTES', str(ANALYSIS_INTERVAL_HOURS * 60)))
+    SCAN_TIER_MINUTES: List[int] = [
+        int(minutes) for minutes in os.getenv('SCAN_TIER_MINUTES', '60,240,1440').split(',') if minutes.strip()
+    ]
+    # Максимум сканирований символов (загрузка свечей + расчет) в час
+    SCAN_BUDGET_PER_HOUR: int = int(os.getenv('SCAN_BUDGET_PER_HOUR', '500'))
     MIN_CONFIDENCE: int = int(os.getenv('MIN_CONFIDENCE', '60'))
     TIMEZONE: str = os.getenv('TIMEZONE', 'UTC')
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
 
+    # Потоковый анализ (main.py live): свечи с биржи через ccxt
+    LIVE_EXCHANGE: str = os.getenv('LIVE_EXCHANGE', 'binance')
+    LIVE_TIMEFRAME: str = os.getenv('LIVE_TIMEFRAME', '1h')
+    LIVE_POLL_SECONDS: float = float(os.getenv('LIVE_POLL_SECONDS', '30'))
+    LIVE_USE_WEBSOCKET: bool = os.getenv('LIVE_USE_WEBSOCKET', 'false').lower() == 'true'
+    # Свечей в кольцевом буфере каждого символа
+    LIVE_BUFFER_CANDLES: int = int(os.getenv('LIVE_BUFFER_CANDLES', '2000'))
+    # Символы потокового анализа (по умолчанию - CRYPTO_SYMBOLS)
+    LIVE_SYMBOLS: List[str] = [
+        symbol for symbol in os.getenv('LIVE_SYMBOLS', '').split(',') if symbol.strip()
+    ]
+
+    # Группировка коррелированных сигналов в одно сообщение
+    SIGNAL_GROUPING_ENABLED: bool = os.getenv('SIGNAL_GROUPING_ENABLED', 'true').lower() == 'true'
+    # Порог корреляции доходностей для объединения сигналов
+    CORRELATION_THRESHOLD: float = float(os.getenv('CORRELATION_THRESHOLD', '0.85'))
+    # Окно корреляции в барах CORRELATION_TIMEFRAME
+    CORRELATION_WINDOW: int = int(os.getenv('CORRELATION_WINDOW', '60'))
+    CORRELATION_TIMEFRAME: str = os.getenv('CORRELATION_TIMEFRAME', '1d')
+    CORRELATION_MIN_OBSERVATIONS: int = int(os.getenv('CORRELATION_MIN_OBSERVATIONS', '20'))
+
+    # Рассылка сигналов (outbox)
+    BROADCAST_INTERVAL_SECONDS: int = int(os.getenv('BROADCAST_INTERVAL_SECONDS', '60'))
+    DELIVERY_LEASE_SECONDS: int = int(os.getenv('DELIVERY_LEASE_SECONDS', '60'))
+    DELIVERY_BATCH_SIZE: int = int(os.getenv('DELIVERY_BATCH_SIZE', '50'))
+    DELIVERY_MAX_ATTEMPTS: int = int(os.getenv('DELIVERY_MAX_ATTEMPTS', '5'))
+    # Сообщений в секунду на экземпляр бота (0 - без ограничения)
+    DELIVERY_RATE_PER_SECOND: float = float(os.getenv('DELIVERY_RATE_PER_SECOND', '25'))
+
+    # Сигналы, закрытые раньше этого срока, переносятся в архив
+    SIGNAL_RETENTION_DAYS: int = int(os.getenv('SIGNAL_RETENTION_DAYS', '90'))
+
     # Assets to track
     CRYPTO_SYMBOLS: List[str] = os.getenv(
         'CRYPTO_SYMBOLS',
@@ -72,6 +120,23 @@ class Config:
         """
         return cls.CRYPTO_SYMBOLS + cls.STOCK_SYMBOLS + cls.ETF_SYMBOLS
 
+    @classmethod
+    def get_asset_type(cls, symbol: str) -> str:
+        """
+        Определить тип актива по символу
+
+        Args:
+            symbol: Символ актива
+
+        Returns:
+            str: 'crypto', 'stock' или 'etf'
+        """
+        if symbol in cls.CRYPTO_SYMBOLS:
+            return 'crypto'
+        if symbol in cls.ETF_SYMBOLS:
+            return 'etf'
+        return 'stock'
+
 
 # Валидация конфигурации при импорте
 Config.validate()
@@ -0,0 +1,114 @@
+"""
+Скользящая матрица корреляций: инкрементальные суммы против пересчета pandas.
+
+Эталон - DataFrame.corr(min_periods=...) по доходностям последних window
+баров (доходность считается от предыдущей известной цены символа).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.indicators.correlation import RollingCorrelation, group_leaders
+
+WINDOW = 30
+MIN_OBSERVATIONS = 10
+SYMBOLS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+
+
+def _closes(bars: int, seed: int = 7) -> Dict[str, pd.Series]:
+    """Часовые цены закрытия с общими факторами и пропусками баров"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=bars, freq='h', tz='UTC')
+    market = rng.normal(0, 0.01, bars)
+    closes = {}
+    for i, symbol in enumerate(SYMBOLS):
+        returns = market * (i % 3) + rng.normal(0, 0.01, bars)
+        series = pd.Series(100 * np.exp(np.cumsum(returns)), index=index)
+        # Пропуски: символ не торговался в отдельные бары
+        series[rng.random(bars) < 0.1] = np.nan
+        closes[symbol] = series
+    return closes
+
+
+def _expected(closes: Dict[str, pd.Series], symbols: List[str], timestamps: pd.DatetimeIndex) -> np.ndarray:
+    """Матрица корреляций pandas по доходностям на заданных барах"""
+    returns = pd.DataFrame({symbol: closes[symbol].dropna().pct_change() for symbol in symbols})
+    window = returns.reindex(timestamps)
+    corr = window.corr(min_periods=MIN_OBSERVATIONS).to_numpy(copy=True)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def _assert_matches(rolling: RollingCorrelation, closes: Dict[str, pd.Series], end: pd.Timestamp) -> None:
+    symbols, actual = rolling.matrix()
+    timestamps = pd.date_range(end=end, periods=WINDOW, freq='h', tz='UTC')
+    expected = _expected(closes, symbols, timestamps)
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, atol=1e-9, equal_nan=True)
+
+
+def test_matches_pandas_after_window_wraps():
+    closes = _closes(100)
+    rolling = RollingCorrelation(WINDOW, MIN_OBSERVATIONS)
+
+    # По несколько баров за обновление: окно прокручивается несколько раз
+    for end in range(12, 101, 7):
+        rolling.update({symbol: series.iloc[:end] for symbol, series in closes.items()})
+        index = closes[SYMBOLS[0]].index
+        _assert_matches(rolling, closes, index[end - 1])
+
+
+def test_matches_pandas_with_staggered_updates():
+    closes = _closes(120, seed=11)
+    index = closes[SYMBOLS[0]].index
+    rolling = RollingCorrelation(WINDOW, MIN_OBSERVATIONS)
+
+    # Символы сканируются с разной частотой: часть баров дописывается
+    # в строки окна, созданные другими символами
+    frequency = {'AAA': 1, 'BBB': 2, 'CCC': 3, 'DDD': 5, 'EEE': 8}
+    for end in range(40, 121):
+        due = {
+            symbol: series.iloc[:end]
+            for symbol, series in closes.items()
+            if end % frequency[symbol] == 0 or end == 120
+        }
+        rolling.update(due)
+
+    _assert_matches(rolling, closes, index[-1])
+
+
+def test_retain_keeps_remaining_pairs():
+    closes = _closes(80, seed=3)
+    index = closes[SYMBOLS[0]].index
+    rolling = RollingCorrelation(WINDOW, MIN_OBSERVATIONS)
+    rolling.update({symbol: series.iloc[:60] for symbol, series in closes.items()})
+
+    assert rolling.retain(['EEE', 'BBB', 'CCC']) == 2
+    assert rolling.symbols == ['BBB', 'CCC', 'EEE']
+    assert rolling.retain(['BBB', 'CCC', 'EEE']) == 0
+    _assert_matches(rolling, closes, index[59])
+
+    # Дальнейшие обновления после удаления символов
+    remaining = {symbol: closes[symbol] for symbol in rolling.symbols}
+    rolling.update(remaining)
+    _assert_matches(rolling, remaining, index[-1])
+
+
+def test_group_leaders_by_confidence_without_chaining():
+    confidences = np.array([90, 80, 70, 60, 85])
+    directions = np.array(['BUY', 'BUY', 'SELL', 'BUY', 'SELL'])
+    correlation = np.array([
+        [1.00, 0.90, 0.95, 0.50, np.nan],
+        [0.90, 1.00, 0.20, 0.95, 0.10],
+        [0.95, 0.20, 1.00, 0.30, 0.88],
+        [0.50, 0.95, 0.30, 1.00, 0.10],
+        [np.nan, 0.10, 0.88, 0.10, 1.00],
+    ])
+
+    leaders = group_leaders(confidences, directions, correlation, threshold=0.85)
+
+    # 1 следует за 0; 3 не присоединяется к последователю 1 (без цепочек);
+    # SELL-сигналы группируются отдельно, лидер - более уверенный 4
+    assert leaders.tolist() == [0, 0, 4, 3, 4]
@@ -0,0 +1,194 @@
+"""
+Outbox рассылки: несколько процессов-отправителей на одном файле SQLite.
+
+Каждое сообщение должно быть доставлено ровно один раз, в том числе
+когда один из отправителей забрал пачку в аренду и упал или получил
+flood control от Telegram.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import Counter
+from typing import List, Tuple
+
+USERS = 40
+SIGNALS = 3
+LEASE_SECONDS = 2
+
+
+def _configure(db_path: str) -> None:
+    """Окружение дочернего процесса (до импорта src)"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{db_path}"
+    os.environ['TELEGRAM_BOT_TOKEN'] = '123456:TEST'
+    os.environ['LOG_LEVEL'] = 'WARNING'
+
+
+class RecordingBot:
+    """Заглушка Bot: запоминает отправленные сообщения"""
+
+    def __init__(self):
+        self.sent: List[Tuple[int, str]] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        # Небольшая задержка, чтобы отправители чередовались
+        await asyncio.sleep(0.001)
+        self.sent.append((chat_id, text.splitlines()[0]))
+
+
+class FloodBot(RecordingBot):
+    """Заглушка Bot: один раз отвечает RetryAfter на flood_at-е сообщение"""
+
+    def __init__(self, flood_at: int, retry_after: int):
+        super().__init__()
+        self.flood_at = flood_at
+        self.retry_after = retry_after
+        self.calls = 0
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        from telegram.error import RetryAfter
+
+        self.calls += 1
+        if self.calls == self.flood_at:
+            raise RetryAfter(self.retry_after)
+        await super().send_message(chat_id, text)
+
+
+def _seed(db_path: str, result_path: str) -> None:
+    """Подписчики, сигналы и постановка в outbox (дважды - без дублей)"""
+    _configure(db_path)
+    from src.bot.broadcast import enqueue_new_signals
+    from src.database.repository import init_database, signal_repository, user_repository
+
+    init_database()
+    for i in range(USERS):
+        telegram_id = 30_000_000 + i
+        user_repository.create_user(telegram_id, f"user{i}", f"User{i}")
+        user_repository.update_subscription_status(telegram_id, True)
+    for i in range(SIGNALS):
+        signal_repository.create_signal(
+            symbol=f"SYM{i}", asset_type='crypto', signal_type='BUY', price=100.0,
+            confidence=80, indicators_data={'rsi': 30.0}, stop_loss=96.0,
+            take_profit_1=107.0, take_profit_2=112.0, max_hold_days=7
+        )
+
+    queued = [enqueue_new_signals(), enqueue_new_signals()]
+    with open(result_path, 'w') as f:
+        json.dump(queued, f)
+
+
+def _crash(db_path: str) -> None:
+    """Отправитель, который забирает пачку и падает без подтверждения"""
+    _configure(db_path)
+    from src.database.repository import delivery_repository
+
+    delivery_repository.claim_batch('crasher', 30, LEASE_SECONDS)
+    os._exit(1)
+
+
+def _send(db_path: str, owner: str, result_path: str) -> None:
+    """Отправитель: разбирает очередь, пока в ней есть задания"""
+    _configure(db_path)
+    from src.bot.broadcast import drain_outbox
+    from src.database.repository import delivery_repository
+
+    bot = RecordingBot()
+
+    async def run() -> None:
+        while delivery_repository.get_pending_count() > 0:
+            await drain_outbox(bot, owner=owner, batch_size=10, lease_seconds=LEASE_SECONDS)
+            await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    with open(result_path, 'w') as f:
+        json.dump(bot.sent, f)
+
+
+def _flood(db_path: str, result_path: str) -> None:
+    """Рассылка одного сигнала, во время которой Telegram отвечает RetryAfter"""
+    _configure(db_path)
+    from src.bot.broadcast import drain_outbox, enqueue_new_signals
+    from src.database.models import SignalDelivery
+    from src.database.repository import delivery_repository, init_database, signal_repository, user_repository
+
+    init_database()
+    for i in range(12):
+        telegram_id = 40_000_000 + i
+        user_repository.create_user(telegram_id, f"user{i}", f"User{i}")
+        user_repository.update_subscription_status(telegram_id, True)
+    signal_repository.create_signal(
+        symbol='FLOOD', asset_type='crypto', signal_type='BUY', price=100.0,
+        confidence=80, indicators_data={'rsi': 30.0}, stop_loss=96.0,
+        take_profit_1=107.0, take_profit_2=112.0, max_hold_days=7
+    )
+    enqueue_new_signals()
+
+    bot = FloodBot(flood_at=5, retry_after=1)
+    started = time.monotonic()
+    sent = asyncio.run(drain_outbox(bot, owner='flood', batch_size=50, lease_seconds=30))
+    elapsed = time.monotonic() - started
+
+    session = delivery_repository.db.get_session()
+    try:
+        attempts = [delivery.attempts for delivery in session.query(SignalDelivery).all()]
+    finally:
+        session.close()
+    with open(result_path, 'w') as f:
+        json.dump({'sent': sent, 'messages': bot.sent, 'attempts': attempts, 'elapsed': elapsed}, f)
+
+
+def _run(context, target, *args) -> int:
+    """Запуск функции в отдельном процессе и ожидание завершения"""
+    process = context.Process(target=target, args=args)
+    process.start()
+    process.join(timeout=120)
+    return process.exitcode
+
+
+def test_each_message_delivered_once_after_sender_crash(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    db_path = str(tmp_path / 'outbox.db')
+
+    seed_path = str(tmp_path / 'seed.json')
+    assert _run(context, _seed, db_path, seed_path) == 0
+    with open(seed_path) as f:
+        assert json.load(f) == [USERS * SIGNALS, 0]
+
+    assert _run(context, _crash, db_path) == 1
+
+    result_paths = [str(tmp_path / f"sender{i}.json") for i in range(3)]
+    senders = [
+        context.Process(target=_send, args=(db_path, f"sender{i}", path))
+        for i, path in enumerate(result_paths)
+    ]
+    for process in senders:
+        process.start()
+    for process in senders:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    sent: List[Tuple[int, str]] = []
+    for path in result_paths:
+        with open(path) as f:
+            sent.extend(tuple(item) for item in json.load(f))
+
+    duplicates = [item for item, count in Counter(sent).items() if count > 1]
+    assert duplicates == []
+    assert len(sent) == USERS * SIGNALS
+
+
+def test_flood_control_postpones_without_spending_attempts(tmp_path):
+    context = multiprocessing.get_context('spawn')
+    result_path = str(tmp_path / 'flood.json')
+    assert _run(context, _flood, str(tmp_path / 'flood.db'), result_path) == 0
+
+    with open(result_path) as f:
+        result = json.load(f)
+    assert result['sent'] == 12
+    assert len({chat_id for chat_id, _ in result['messages']}) == 12
+    # Отложенные задания не потратили попытку на RetryAfter
+    assert result['attempts'] == [1] * 12
+    # Рассылка выдержала паузу retry_after
+    assert result['elapsed'] >= 1
@@ -0,0 +1,128 @@
+"""
+Бинарный снимок индикаторов: кодирование, версии схемы, старый JSON
+и миграция indicators_data на SQLite.
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+
+# Config проверяет токен при импорте src
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:TEST')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from src.database.migrations import migrate_indicators_to_snapshots  # noqa: E402
+from src.database.models import Base  # noqa: E402
+from src.database.snapshot import (  # noqa: E402
+    _HEADER, SNAPSHOT_MAGIC, SNAPSHOT_SCHEMAS, SNAPSHOT_VERSION, IndicatorSnapshot, IndicatorSnapshotType,
+    decode_snapshot, encode_snapshot, is_snapshot, snapshots_to_array
+)
+
+
+def _encode_v1(data):
+    """Снимок версии 1, как его записывали до появления версии 2"""
+    fields = SNAPSHOT_SCHEMAS[1]
+    names = [name for name in fields if name in data]
+    mask = sum(1 << fields.index(name) for name in names)
+    values = np.array([data[name] for name in names], dtype='<f8').tobytes()
+    return _HEADER.pack(SNAPSHOT_MAGIC, 1, 0, mask) + values
+
+
+def test_round_trip_current_version():
+    data = {'close': 101.5, 'rsi': 28.25, 'macd_hist': -0.5, 'rsi_prev': 31.0, 'volume_sma_20': 12345}
+
+    raw = encode_snapshot(data)
+
+    assert is_snapshot(raw)
+    assert raw[1] == SNAPSHOT_VERSION
+    assert decode_snapshot(raw) == {key: float(value) for key, value in data.items()}
+    # Имена не хранятся: 7 байт заголовка и 8 байт на значение
+    assert len(raw) == _HEADER.size + 8 * len(data)
+
+
+def test_extras_nan_and_missing_fields():
+    data = {'close': 10.0, 'rsi': float('nan'), 'sma_200': None, 'trend': 'up', 'flag': True}
+
+    decoded = decode_snapshot(encode_snapshot(data))
+
+    assert decoded['close'] == 10.0
+    # NaN остается числом схемы, None и нечисловые значения - в хвосте JSON
+    assert math.isnan(decoded['rsi'])
+    assert decoded['sma_200'] is None
+    assert decoded['trend'] == 'up'
+    assert decoded['flag'] is True
+    assert 'macd' not in decoded
+
+
+def test_decode_version_1():
+    data = {'close': 50.0, 'volume': 1000.0, 'vroc': -3.5}
+
+    raw = _encode_v1(data)
+
+    assert decode_snapshot(raw) == data
+    matrix = snapshots_to_array([raw, encode_snapshot({'close': 51.0, 'rsi_prev': 40.0})], ['close', 'vroc', 'rsi_prev'])
+    np.testing.assert_array_equal(matrix, [[50.0, -3.5, np.nan], [51.0, np.nan, 40.0]])
+
+
+def test_decode_rejects_unknown_version_and_magic():
+    unknown = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION + 1, 0, 0)
+    with pytest.raises(ValueError, match='Unsupported snapshot version'):
+        decode_snapshot(unknown)
+    with pytest.raises(ValueError, match='Not an indicator snapshot'):
+        decode_snapshot(_HEADER.pack(0x7B, 1, 0, 0))
+
+
+def test_column_type_reads_snapshots_and_legacy_json():
+    metadata = MetaData()
+    table = Table('snapshots', metadata, Column('id', Integer, primary_key=True), Column('data', IndicatorSnapshotType))
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    legacy = {'rsi': 25.0, 'note': 'json'}
+
+    with engine.begin() as connection:
+        connection.execute(insert(table), [{'id': 1, 'data': {'close': 2.0, 'rsi': 30.0}}])
+        # Строки старого формата: JSON текстом и байтами
+        connection.exec_driver_sql("INSERT INTO snapshots (id, data) VALUES (2, ?)", (json.dumps(legacy),))
+        connection.exec_driver_sql("INSERT INTO snapshots (id, data) VALUES (3, ?)", (json.dumps(legacy).encode(),))
+        rows = dict(connection.execute(select(table.c.id, table.c.data)).all())
+
+    assert isinstance(rows[1], IndicatorSnapshot)
+    assert rows[1] == {'close': 2.0, 'rsi': 30.0}
+    assert rows[2] == legacy
+    assert rows[3] == legacy
+
+
+def test_migrate_indicators_to_snapshots(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    legacy = [{'close': 100.0 + i, 'rsi': 30.0 + i, 'reason': f"row {i}"} for i in range(5)]
+    columns = (
+        "symbol, asset_type, signal_type, price, confidence, indicators_data, "
+        "stop_loss, take_profit_1, max_hold_days, created_at, is_active, sent_to_users"
+    )
+
+    with engine.begin() as connection:
+        for i, data in enumerate(legacy):
+            connection.exec_driver_sql(
+                f"INSERT INTO signals ({columns}) VALUES ('SYM', 'crypto', 'BUY', 1, 80, ?, 1, 2, 7, '2024-01-01', 0, 1)",
+                (json.dumps(data),)
+            )
+        # Уже переведенная строка не меняется
+        connection.exec_driver_sql(
+            f"INSERT INTO signals ({columns}) VALUES ('NEW', 'crypto', 'BUY', 1, 80, ?, 1, 2, 7, '2024-01-02', 1, 0)",
+            (encode_snapshot({'close': 7.0}),)
+        )
+
+    migrate_indicators_to_snapshots(engine, batch_size=2)
+    migrate_indicators_to_snapshots(engine, batch_size=2)
+
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT typeof(indicators_data), indicators_data FROM signals ORDER BY id"
+        ).all()
+    assert [kind for kind, _ in rows] == ['blob'] * 6
+    assert [decode_snapshot(raw) for _, raw in rows] == legacy + [{'close': 7.0}]